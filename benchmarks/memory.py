@@ -0,0 +1,160 @@
+"""
+Memory benchmark for the core token, entity and relation objects.
+
+Loads and tokenizes a corpus, then reports the bytes used per token, entity and
+relation object. The same objects are also rebuilt with `__dict__`-based classes
+laid out like the pre-`__slots__` versions, so one run reports both numbers.
+
+Usage:
+    python -m benchmarks.memory tests/input/brat/joined --loader brat
+"""
+
+from __future__ import annotations
+from parselt import Document
+from parselt.loaders import BratLoader, JSONLoader
+from parselt.tokenizers import WordTokenizer
+import argparse
+import gc
+import json
+import tracemalloc
+from typing import Callable, Iterable
+
+
+class DictToken:
+    """
+    A `Token` with a per-instance `__dict__`, as before `__slots__` was added.
+    """
+
+    def __init__(self, text: str, start: int, end: int, next_char: str | None=None):
+        self.text = text
+        self.start = start
+        self.end = end
+        self.next_char = next_char if next_char is not None else " "
+        self.label = None
+
+
+class DictEntity(DictToken):
+    """
+    An `Entity` with a per-instance `__dict__`, as before `__slots__` was added.
+    """
+
+    def __init__(self, text: str, start: int, end: int, label: str, entity_id: int) -> None:
+        super().__init__(text, start, end)
+        self.label = label
+        self.entity_id = entity_id
+
+
+class DictRelation:
+    """
+    A `Relation` with a per-instance `__dict__`, as before `__slots__` was added.
+    """
+
+    def __init__(self, id: int, label: str, arg_1, arg_2) -> None:
+        self.id = id
+        self.label = label
+        self.arg_1 = arg_1
+        self.arg_2 = arg_2
+
+
+def measure(build: Callable[[], list]) -> tuple[int, int]:
+    """
+    Measure the memory retained by the objects a function builds.
+
+    Args:
+        build (Callable[[], list]): Builds and returns the objects to measure.
+
+    Returns:
+        tuple[int, int]: The number of objects built and the bytes they retain.
+    """
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objects = build()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    retained = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return len(objects), retained
+
+
+def per_object(count: int, size: int) -> float:
+    return size / count if count else 0.0
+
+
+def run(documents: Iterable[Document]) -> dict:
+    """
+    Run the benchmark on loaded, tokenized documents.
+
+    Token, entity and relation objects are rebuilt from the loaded ones, sharing their
+    strings, so the numbers are the per-object overhead of each class layout.
+
+    Args:
+        documents (Iterable[Document]): The tokenized documents.
+
+    Returns:
+        dict: Bytes per object for the slotted and the `__dict__`-based classes.
+    """
+
+    documents = list(documents)
+    tokens = [token for document in documents for token in document.tokens]
+    entities = [interval.data for document in documents for interval in document.entities]
+    relations = [relation for document in documents for relation in document.relations]
+
+    token_type = type(tokens[0]) if tokens else None
+    entity_type = type(entities[0]) if entities else None
+    relation_type = type(relations[0]) if relations else None
+
+    builders = {
+        "slots": (
+            lambda: [token_type(t.text, t.start, t.end, t.next_char) for t in tokens],
+            lambda: [entity_type(e.text, e.start, e.end, e.label, e.entity_id) for e in entities],
+            lambda: [relation_type(r.id, r.label, r.arg_1, r.arg_2) for r in relations],
+        ),
+        "dict": (
+            lambda: [DictToken(t.text, t.start, t.end, t.next_char) for t in tokens],
+            lambda: [DictEntity(e.text, e.start, e.end, e.label, e.entity_id) for e in entities],
+            lambda: [DictRelation(r.id, r.label, r.arg_1, r.arg_2) for r in relations],
+        ),
+    }
+
+    results = {"documents": len(documents), "tokens": len(tokens),
+               "entities": len(entities), "relations": len(relations)}
+    for layout, (build_tokens, build_entities, build_relations) in builders.items():
+        results[layout] = {
+            "bytes_per_token": per_object(*measure(build_tokens)),
+            "bytes_per_entity": per_object(*measure(build_entities)),
+            "bytes_per_relation": per_object(*measure(build_relations)),
+        }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="Directory containing the corpus.")
+    parser.add_argument("--loader", choices=["brat", "json"], default="brat")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON.")
+    args = parser.parse_args()
+
+    loader = BratLoader() if args.loader == "brat" else JSONLoader()
+    tokenizer = WordTokenizer()
+    documents = []
+    for document in loader.load_directory(args.path):
+        document.tokenize(tokenizer)
+        documents.append(document)
+
+    results = run(documents)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{results['documents']} documents, {results['tokens']} tokens, "
+          f"{results['entities']} entities, {results['relations']} relations")
+    print(f"{'layout':<8}{'token':>10}{'entity':>10}{'relation':>10}  (bytes per object)")
+    for layout in ("dict", "slots"):
+        row = results[layout]
+        print(f"{layout:<8}{row['bytes_per_token']:>10.1f}{row['bytes_per_entity']:>10.1f}{row['bytes_per_relation']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+Benchmark suite for loading, tokenization and labeling.
+
+Generates synthetic BRAT and JSON corpora, times `BratLoader`, `JSONLoader`,
+`WordTokenizer` and `Document.tokenize` (with and without BIO labeling), records the
+peak traced memory of each benchmark, and writes the results as JSON. Passing a
+baseline results file compares every benchmark against it and exits with status 1
+if any got slower by more than the threshold.
+
+Usage:
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --output current.json --baseline results.json --threshold 0.15
+"""
+
+from __future__ import annotations
+from benchmarks.synthetic import CorpusConfig, generate_corpus
+from parselt.loaders import BratLoader, JSONLoader
+from parselt.tokenizers import WordTokenizer
+from dataclasses import asdict
+from typing import Callable
+import argparse
+import gc
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+
+def time_call(fn: Callable[[], int], repeat: int) -> dict:
+    """
+    Time a benchmark, then run it once more under tracemalloc to record its peak memory.
+
+    Args:
+        fn (Callable[[], int]): Runs the benchmark once and returns the number of items processed.
+        repeat (int): The number of timed runs; the fastest is reported.
+
+    Returns:
+        dict: The best time in seconds, the items processed and the peak traced memory in bytes.
+    """
+
+    timings = []
+    items = 0
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        items = fn()
+        timings.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    best = min(timings)
+    return {
+        "seconds": best,
+        "items": items,
+        "items_per_second": items / best if best else None,
+        "peak_bytes": peak,
+    }
+
+
+def run_benchmarks(config: CorpusConfig, repeat: int = 3) -> dict:
+    """
+    Generate the corpora and run every benchmark.
+
+    Args:
+        config (CorpusConfig): The shape of the synthetic corpora.
+        repeat (int): The number of timed runs per benchmark.
+
+    Returns:
+        dict: The results, keyed by benchmark name, and the run metadata.
+    """
+
+    with tempfile.TemporaryDirectory() as directory:
+        brat_dir = f"{directory}/brat"
+        json_dir = f"{directory}/json"
+        generate_corpus(brat_dir, "brat", config)
+        generate_corpus(json_dir, "json", config)
+
+        brat_loader = BratLoader()
+        json_loader = JSONLoader()
+        documents = list(brat_loader.load_directory(brat_dir))
+        tokenizer = WordTokenizer()
+
+        def tokenize(use_bio_labeling: bool) -> int:
+            for document in documents:
+                document.tokenize(tokenizer, use_bio_labeling=use_bio_labeling)
+            return sum(len(document.tokens) for document in documents)
+
+        benchmarks = {
+            "brat_loader.load_directory": lambda: sum(1 for _ in brat_loader.load_directory(brat_dir)),
+            "json_loader.load_directory": lambda: sum(1 for _ in json_loader.load_directory(json_dir)),
+            "word_tokenizer": lambda: sum(len(tokenizer(document.text)) for document in documents),
+            "document.tokenize": lambda: tokenize(use_bio_labeling=False),
+            "document.tokenize[bio]": lambda: tokenize(use_bio_labeling=True),
+        }
+        results = {name: time_call(fn, repeat) for name, fn in benchmarks.items()}
+
+    return {
+        "meta": {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "repeat": repeat,
+            "corpus": asdict(config),
+        },
+        "results": results,
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    Compare results against a baseline.
+
+    Args:
+        results (dict): The current results.
+        baseline (dict): The baseline results.
+        threshold (float): The allowed relative slowdown, e.g. 0.1 for 10%.
+
+    Returns:
+        list[str]: A description of every regression.
+    """
+
+    regressions = []
+    for name, result in results["results"].items():
+        reference = baseline["results"].get(name)
+        if reference is None or not reference["seconds"]:
+            continue
+        change = result["seconds"] / reference["seconds"] - 1
+        status = "REGRESSION" if change > threshold else "ok"
+        print(f"{name:<32}{reference['seconds']:>10.4f}s{result['seconds']:>10.4f}s{change:>+9.1%}  {status}")
+        if change > threshold:
+            regressions.append(f"{name} is {change:.1%} slower than the baseline")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default="bench_output.json", help="Where to write the results.")
+    parser.add_argument("--baseline", help="A previous results file to compare against.")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Allowed relative slowdown.")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--documents", type=int, default=200)
+    parser.add_argument("--tokens", type=int, default=1000, help="Words per document.")
+    parser.add_argument("--entity-density", type=float, default=0.1)
+    parser.add_argument("--relation-density", type=float, default=0.5)
+    parser.add_argument("--overlap-rate", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    config = CorpusConfig(documents=args.documents, tokens_per_document=args.tokens,
+                          entity_density=args.entity_density, relation_density=args.relation_density,
+                          overlap_rate=args.overlap_rate, seed=args.seed)
+    results = run_benchmarks(config, repeat=args.repeat)
+    with open(args.output, "w", encoding="utf-8") as output_file:
+        json.dump(results, output_file, indent=2)
+
+    if args.baseline is None:
+        for name, result in results["results"].items():
+            print(f"{name:<32}{result['seconds']:>10.4f}s{result['peak_bytes'] / 2 ** 20:>10.1f} MiB")
+        return
+
+    with open(args.baseline, "r", encoding="utf-8") as baseline_file:
+        baseline = json.load(baseline_file)
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print("\n".join(regressions), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
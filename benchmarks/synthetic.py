@@ -0,0 +1,172 @@
+"""
+Synthetic BRAT and JSON corpus generator for benchmarks.
+
+Usage:
+    python -m benchmarks.synthetic /tmp/corpus --format brat --documents 1000 --tokens 2000
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass
+import argparse
+import json
+import os
+import random
+
+WORDS = [
+    "the", "patient", "was", "given", "aspirin", "after", "surgery", "in", "Boston", "and",
+    "reported", "mild", "pain", "on", "Monday", "Dr", "Smith", "prescribed", "ibuprofen", "for",
+    "three", "days", "while", "monitoring", "blood", "pressure", "at", "General", "Hospital", "nurse",
+]
+LABELS = ["Person", "Drug", "Location", "Date", "Condition"]
+RELATION_LABELS = ["Treats", "LocatedIn", "Prescribes"]
+PUNCTUATION = [".", ",", ";"]
+
+
+@dataclass
+class CorpusConfig:
+    """
+    The shape of a synthetic corpus.
+
+    Attributes:
+        documents (int): The number of documents.
+        tokens_per_document (int): The number of words in every document.
+        entity_density (float): The fraction of words that start an entity.
+        relation_density (float): The number of relations per entity.
+        overlap_rate (float): The fraction of entities that get a second, overlapping entity.
+        max_entity_tokens (int): The maximum number of words in an entity.
+        seed (int): The random seed.
+    """
+
+    documents: int = 100
+    tokens_per_document: int = 500
+    entity_density: float = 0.1
+    relation_density: float = 0.5
+    overlap_rate: float = 0.0
+    max_entity_tokens: int = 3
+    seed: int = 0
+
+
+def generate_document(rng: random.Random, config: CorpusConfig) -> tuple[str, list[tuple], list[tuple]]:
+    """
+    Generate the text, entities and relations of one document.
+
+    Returns:
+        tuple[str, list[tuple], list[tuple]]: The text, the entities as (id, label, start, end, text)
+            and the relations as (id, label, arg_1, arg_2).
+    """
+
+    pieces = []
+    spans = []
+    position = 0
+    for i in range(config.tokens_per_document):
+        word = rng.choice(WORDS)
+        if i:
+            separator = rng.choice(PUNCTUATION) + " " if rng.random() < 0.08 else " "
+            pieces.append(separator)
+            position += len(separator)
+        pieces.append(word)
+        spans.append((position, position + len(word)))
+        position += len(word)
+    text = "".join(pieces)
+
+    entities = []
+    word = 0
+    while word < len(spans):
+        if rng.random() < config.entity_density:
+            length = rng.randint(1, config.max_entity_tokens)
+            last = min(word + length, len(spans)) - 1
+            start, end = spans[word][0], spans[last][1]
+            entities.append((len(entities) + 1, rng.choice(LABELS), start, end, text[start:end]))
+            if rng.random() < config.overlap_rate:
+                # A nested entity over the first word, or an extended one over the next words
+                if last > word:
+                    start, end = spans[word]
+                else:
+                    end = spans[min(last + 2, len(spans) - 1)][1]
+                entities.append((len(entities) + 1, rng.choice(LABELS), start, end, text[start:end]))
+            word = last + 1
+        else:
+            word += 1
+
+    relations = []
+    if len(entities) > 1:
+        for i in range(int(len(entities) * config.relation_density)):
+            arg_1, arg_2 = rng.sample(entities, 2)
+            relations.append((i + 1, rng.choice(RELATION_LABELS), arg_1[0], arg_2[0]))
+
+    return text, entities, relations
+
+
+def generate_corpus(output_dir: str, format: str = "brat", config: CorpusConfig | None = None) -> list[str]:
+    """
+    Write a synthetic corpus to a directory.
+
+    BRAT corpora get a ".ann" and ".txt" file per document, JSON corpora a ".json" file
+    per document following the default `JSONAnnotationSchema`.
+
+    Args:
+        output_dir (str): The directory to write to, created if needed.
+        format (str): "brat" or "json".
+        config (CorpusConfig | None): The shape of the corpus.
+
+    Returns:
+        list[str]: The paths of the annotation files.
+    """
+
+    if format not in ("brat", "json"):
+        raise ValueError(f"Unknown format {format!r}, expected 'brat' or 'json'.")
+    config = config if config is not None else CorpusConfig()
+    rng = random.Random(config.seed)
+    os.makedirs(output_dir, exist_ok=True)
+
+    paths = []
+    for i in range(config.documents):
+        text, entities, relations = generate_document(rng, config)
+        name = f"doc{i:06d}"
+
+        if format == "brat":
+            path = os.path.join(output_dir, f"{name}.ann")
+            with open(os.path.join(output_dir, f"{name}.txt"), "w", encoding="utf-8") as text_file:
+                text_file.write(text)
+            with open(path, "w", encoding="utf-8") as ann_file:
+                for entity_id, label, start, end, entity_text in entities:
+                    ann_file.write(f"T{entity_id}\t{label} {start} {end}\t{entity_text}\n")
+                for relation_id, label, arg_1, arg_2 in relations:
+                    ann_file.write(f"R{relation_id}\t{label} Arg1:T{arg_1} Arg2:T{arg_2}\n")
+        else:
+            path = os.path.join(output_dir, f"{name}.json")
+            with open(path, "w", encoding="utf-8") as json_file:
+                json.dump({
+                    "document": f"{name}.json",
+                    "text": text,
+                    "entities": [{"id": entity_id, "label": label, "text": entity_text, "start": start, "end": end}
+                                 for entity_id, label, start, end, entity_text in entities],
+                    "relations": [{"id": relation_id, "type": label, "arg1": arg_1, "arg2": arg_2}
+                                  for relation_id, label, arg_1, arg_2 in relations],
+                }, json_file)
+        paths.append(path)
+
+    return paths
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("output_dir")
+    parser.add_argument("--format", choices=["brat", "json"], default="brat")
+    parser.add_argument("--documents", type=int, default=100)
+    parser.add_argument("--tokens", type=int, default=500, help="Words per document.")
+    parser.add_argument("--entity-density", type=float, default=0.1)
+    parser.add_argument("--relation-density", type=float, default=0.5)
+    parser.add_argument("--overlap-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    config = CorpusConfig(documents=args.documents, tokens_per_document=args.tokens,
+                          entity_density=args.entity_density, relation_density=args.relation_density,
+                          overlap_rate=args.overlap_rate, seed=args.seed)
+    paths = generate_corpus(args.output_dir, args.format, config)
+    print(f"Wrote {len(paths)} documents to {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
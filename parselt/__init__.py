@@ -1,16 +1,25 @@
 from parselt.core.document import Document
+from parselt.core.corpus import Corpus
+from parselt.core.lazy_document import LazyDocument
 from parselt.core.relation import Relation
 from parselt.core.entity import Entity
-from parselt.core.token import Token
+from parselt.core.token import OffsetToken, Token
+from parselt.core.token_array import TokenArray
+from parselt.core.interval_index import IntervalIndex
 from parselt.loaders.base_loader import BaseLoader
 import parselt.loaders as loaders
 
 __all__ = [
     "Document",
+    "Corpus",
+    "LazyDocument",
     "Relation",
     "BaseLoader",
     "Entity",
     "Token",
+    "OffsetToken",
+    "TokenArray",
+    "IntervalIndex",
     "loaders",
 ]
 
@@ -0,0 +1,10 @@
+from __future__ import annotations
+from .base_chunker import BaseChunker, Chunk
+from .sentence_chunker import SentenceChunker
+from .window_chunker import WindowChunker
+
+__all__ = [
+    "BaseChunker",
+    "Chunk",
+    "SentenceChunker",
+    "WindowChunker"]
@@ -0,0 +1,170 @@
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from parselt.core.entity import Entity
+from parselt.core.interval_index import IntervalIndex
+from parselt.core.token import Token
+from parselt.core.token_array import TokenArray
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Generator, Iterable
+import numpy as np
+
+if TYPE_CHECKING:
+    from parselt.core.document import Document
+
+
+@dataclass
+class Chunk:
+    """
+    A contiguous run of the tokens of a document.
+
+    A chunk refers to its document instead of copying it, and its tokens, text and
+    entities are sliced on access. Offsets are document offsets unless stated
+    otherwise; `local_offsets` and `to_local` give offsets relative to the chunk text.
+
+    Attributes:
+        document (Document): The document the chunk belongs to.
+        index (int): The position of the chunk among the chunks of the document.
+        token_start (int): The index of the first token of the chunk.
+        token_end (int): The index after the last token of the chunk.
+        start (int): The document offset of the start of the first token.
+        end (int): The document offset of the end of the last token.
+    """
+
+    document: Document
+    index: int
+    token_start: int
+    token_end: int
+    start: int
+    end: int
+
+    @property
+    def text(self) -> str:
+        return self.document.text[self.start:self.end]
+
+    @property
+    def tokens(self) -> list[Token]:
+        return self.document.tokens[self.token_start:self.token_end]
+
+    @property
+    def entities(self) -> list[Entity]:
+        """
+        Returns the entities of the document inside the chunk, ordered by offset.
+        """
+
+        intervals = self.document.entities
+        if hasattr(intervals, "envelop"):
+            intervals = intervals.envelop(self.start, self.end)
+        entities = [interval.data for interval in intervals
+                    if interval.begin >= self.start and interval.end <= self.end]
+        return sorted(entities, key=lambda entity: (entity.start, entity.end))
+
+    def local_offsets(self) -> np.ndarray:
+        """
+        Returns the start and end offset of every token relative to the chunk text, of shape (tokens, 2).
+        """
+
+        starts, ends = token_offsets(self.document.tokens)
+        offsets = np.stack((starts[self.token_start:self.token_end], ends[self.token_start:self.token_end]), axis=1)
+        return offsets - self.start
+
+    def to_local(self, offset: int) -> int:
+        """
+        Convert a document offset to an offset in the chunk text.
+        """
+
+        return offset - self.start
+
+    def to_document(self, offset: int) -> int:
+        """
+        Convert an offset in the chunk text to a document offset.
+        """
+
+        return offset + self.start
+
+    def __len__(self) -> int:
+        return self.token_end - self.token_start
+
+    def __repr__(self) -> str:
+        return f"Chunk({self.document.id!r}, {self.index}, tokens={self.token_start}:{self.token_end}, chars={self.start}:{self.end})"
+
+
+class BaseChunker(ABC):
+    """
+    An abstract base class for chunkers, which cut tokenized documents into chunks without splitting any entity.
+    """
+
+    @abstractmethod
+    def chunk(self, document: Document) -> Generator[Chunk, None, None]:
+        """
+        Lazily cut a tokenized document into chunks.
+
+        Args:
+            document (Document): The tokenized document.
+
+        Yields:
+            Chunk: The chunks, in document order.
+        """
+
+        pass
+
+    def chunk_documents(self, documents: Iterable[Document]) -> Generator[Chunk, None, None]:
+        """
+        Lazily cut many tokenized documents into chunks.
+
+        Args:
+            documents (Iterable[Document]): The tokenized documents.
+
+        Yields:
+            Chunk: The chunks of every document, in order.
+        """
+
+        for document in documents:
+            yield from self.chunk(document)
+
+    @staticmethod
+    def cut_points(document: Document) -> np.ndarray:
+        """
+        Returns where the tokens of a document can be cut without splitting an entity.
+
+        Args:
+            document (Document): The tokenized document.
+
+        Returns:
+            np.ndarray: A boolean array of length `len(tokens) + 1`, True at index i if a chunk
+                can start at token i. The start and end of the document are always allowed.
+        """
+
+        starts, ends = token_offsets(document.tokens)
+        allowed = np.ones(len(starts) + 1, dtype=bool)
+        if len(starts) < 2:
+            return allowed
+
+        # A cut before token i splits an entity if the entity starts before token i and
+        # ends after token i - 1. Those cuts form a range of token indexes per entity.
+        intervals = document.entities
+        if isinstance(intervals, IntervalIndex):
+            entity_starts, entity_ends = intervals.begins, intervals.ends
+        else:
+            intervals = list(intervals)
+            entity_starts = np.fromiter((interval.begin for interval in intervals), dtype=np.int64, count=len(intervals))
+            entity_ends = np.fromiter((interval.end for interval in intervals), dtype=np.int64, count=len(intervals))
+        first = np.maximum(np.searchsorted(starts, entity_starts, side="right"), 1)
+        last = np.minimum(np.searchsorted(ends, entity_ends, side="left"), len(starts) - 1)
+        valid = first <= last
+        blocked = np.zeros(len(starts) + 1, dtype=np.int64)
+        np.add.at(blocked, first[valid], 1)
+        np.add.at(blocked, last[valid] + 1, -1)
+        allowed[np.cumsum(blocked) > 0] = False
+        return allowed
+
+
+def token_offsets(tokens: list[Token] | TokenArray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the start and end offset arrays of a list of tokens or a TokenArray.
+    """
+
+    if isinstance(tokens, TokenArray):
+        return tokens.starts, tokens.ends
+    starts = np.fromiter((token.start for token in tokens), dtype=np.int64, count=len(tokens))
+    ends = np.fromiter((token.end for token in tokens), dtype=np.int64, count=len(tokens))
+    return starts, ends
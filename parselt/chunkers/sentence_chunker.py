@@ -0,0 +1,81 @@
+from __future__ import annotations
+from parselt.chunkers.base_chunker import BaseChunker, Chunk, token_offsets
+from parselt.chunkers.window_chunker import windows
+from typing import TYPE_CHECKING, Generator, Iterable
+import numpy as np
+import re
+
+if TYPE_CHECKING:
+    from parselt.core.document import Document
+
+
+class SentenceChunker(BaseChunker):
+    """
+    Cuts documents at sentence boundaries.
+
+    A sentence ends after terminal punctuation followed by whitespace, or at a blank line,
+    unless the last token before it is an abbreviation such as "Dr". Sentence boundaries
+    inside an entity are ignored, so an entity is never split across sentences.
+
+    Args:
+        max_tokens (int | None): Sentences longer than this are split further into windows
+            of at most this many tokens, see `WindowChunker`.
+        pattern (str | re.Pattern): The regex matching the end of a sentence.
+        abbreviations (Iterable[str]): Tokens after which terminal punctuation does not end a
+            sentence, compared case-insensitively.
+    """
+
+    pattern: re.Pattern = re.compile(r"[.!?…]+[\"'”’)\]]*(?=\s|$)|\n[ \t]*\n")
+    abbreviations: frozenset[str] = frozenset({"dr", "mr", "mrs", "ms", "prof", "st", "jr", "sr",
+                                               "vs", "etc", "e.g", "i.e", "no", "fig"})
+
+    def __init__(self, max_tokens: int | None = None,
+                 pattern: str | re.Pattern | None = None,
+                 abbreviations: Iterable[str] | None = None) -> None:
+        if max_tokens is not None and max_tokens < 1:
+            raise ValueError("max_tokens must be at least 1.")
+        self.max_tokens = max_tokens
+        if pattern is not None:
+            self.pattern = re.compile(pattern)
+        if abbreviations is not None:
+            self.abbreviations = frozenset(abbreviation.lower() for abbreviation in abbreviations)
+
+    def sentence_starts(self, document: Document) -> np.ndarray:
+        """
+        Returns the indexes of the tokens that start a sentence, excluding the first token.
+
+        Args:
+            document (Document): The tokenized document.
+
+        Returns:
+            np.ndarray: The sorted token indexes.
+        """
+
+        starts, ends = token_offsets(document.tokens)
+        text = document.text
+        match_ends = np.fromiter((match.end() for match in self.pattern.finditer(text)), dtype=np.int64)
+        # The first token after the end of every match
+        indexes = np.unique(np.searchsorted(starts, match_ends, side="left"))
+        indexes = indexes[(indexes > 0) & (indexes < len(starts))]
+        abbreviations = self.abbreviations
+        keep = [text[starts[i - 1]:ends[i - 1]].lower() not in abbreviations for i in indexes.tolist()]
+        return indexes[np.array(keep, dtype=bool)] if len(indexes) else indexes
+
+    def chunk(self, document: Document) -> Generator[Chunk, None, None]:
+        allowed = self.cut_points(document)
+        starts, ends = token_offsets(document.tokens)
+        sentence_starts = self.sentence_starts(document)
+        boundaries = [0, *sentence_starts[allowed[sentence_starts]].tolist(), len(starts)]
+        cuts = np.flatnonzero(allowed) if self.max_tokens is not None else None
+
+        index = 0
+        for sentence_start, sentence_end in zip(boundaries, boundaries[1:]):
+            if sentence_start == sentence_end:
+                continue
+            if self.max_tokens is None or sentence_end - sentence_start <= self.max_tokens:
+                pieces = [(sentence_start, sentence_end)]
+            else:
+                pieces = windows(cuts, sentence_start, sentence_end, self.max_tokens, self.max_tokens)
+            for token_start, token_end in pieces:
+                yield Chunk(document, index, token_start, token_end, int(starts[token_start]), int(ends[token_end - 1]))
+                index += 1
@@ -0,0 +1,68 @@
+from __future__ import annotations
+from parselt.chunkers.base_chunker import BaseChunker, Chunk, token_offsets
+from typing import TYPE_CHECKING, Generator
+import numpy as np
+
+if TYPE_CHECKING:
+    from parselt.core.document import Document
+
+
+class WindowChunker(BaseChunker):
+    """
+    Cuts documents into sliding windows of at most `size` tokens, `stride` tokens apart.
+
+    Window boundaries are moved back to the nearest cut that does not split an entity,
+    so windows can be shorter than `size`. An entity longer than `size` tokens gets a
+    window of its own that is longer than `size`.
+
+    Args:
+        size (int): The maximum number of tokens per window.
+        stride (int | None): The number of tokens between the starts of consecutive windows.
+            Defaults to `size`, which gives non-overlapping windows.
+    """
+
+    def __init__(self, size: int, stride: int | None = None) -> None:
+        stride = stride if stride is not None else size
+        if size < 1 or stride < 1:
+            raise ValueError("size and stride must be at least 1.")
+        if stride > size:
+            raise ValueError("stride cannot be larger than size, or tokens would be skipped.")
+        self.size = size
+        self.stride = stride
+
+    def chunk(self, document: Document) -> Generator[Chunk, None, None]:
+        cuts = np.flatnonzero(self.cut_points(document))
+        starts, ends = token_offsets(document.tokens)
+        for index, (token_start, token_end) in enumerate(windows(cuts, 0, len(starts), self.size, self.stride)):
+            yield Chunk(document, index, token_start, token_end, int(starts[token_start]), int(ends[token_end - 1]))
+
+
+def windows(cuts: np.ndarray, start: int, end: int, size: int,
+            stride: int) -> Generator[tuple[int, int], None, None]:
+    """
+    Lazily split the tokens from `start` to `end` into windows that start and end at allowed cuts.
+
+    Args:
+        cuts (np.ndarray): The sorted token indexes where a window may start or end. Must include `start` and `end`.
+        start (int): The index of the first token.
+        end (int): The index after the last token.
+        size (int): The maximum number of tokens per window, exceeded only by entities longer than it.
+        stride (int): The number of tokens between the starts of consecutive windows, at most `size`.
+
+    Yields:
+        tuple[int, int]: The token index range of every window.
+    """
+
+    while start < end:
+        # The furthest cut within reach, or the next cut if an entity is longer than a window
+        window_end = int(cuts[np.searchsorted(cuts, min(start + size, end), side="right") - 1])
+        if window_end <= start:
+            window_end = int(cuts[np.searchsorted(cuts, start, side="right")])
+        yield start, window_end
+        if window_end >= end:
+            return
+
+        next_start = int(cuts[np.searchsorted(cuts, start + stride, side="right") - 1])
+        if next_start <= start:
+            next_start = int(cuts[np.searchsorted(cuts, start, side="right")])
+        start = next_start
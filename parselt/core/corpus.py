@@ -0,0 +1,266 @@
+from __future__ import annotations
+from parselt.core.document import Document
+from collections import Counter
+from typing import TYPE_CHECKING, Any, Iterable, Iterator
+import os
+
+if TYPE_CHECKING:
+    from parselt.loaders.base_loader import BaseLoader
+
+
+class LabelIndex:
+    """
+    An interned label vocabulary with an inverted index from labels to documents.
+
+    Every label gets an integer ID the first time it is seen. IDs are never reused, so
+    they stay valid while documents are added and removed.
+
+    Attributes:
+        labels (list[str]): The labels, indexed by label ID.
+        counts (list[int]): The number of annotations with each label, indexed by label ID.
+    """
+
+    def __init__(self) -> None:
+        self.labels: list[str] = []
+        self.counts: list[int] = []
+        self._ids: dict[str, int] = {}
+        self._documents: list[dict[Any, int]] = []
+
+    def intern(self, label: str) -> str:
+        """
+        Returns the canonical copy of a label, adding it to the vocabulary if needed.
+        """
+
+        label_id = self._ids.get(label)
+        if label_id is None:
+            label_id = self._ids[label] = len(self.labels)
+            self.labels.append(label)
+            self.counts.append(0)
+            self._documents.append({})
+        return self.labels[label_id]
+
+    def id_of(self, label: str) -> int | None:
+        """
+        Returns the ID of a label, or None if it was never seen.
+        """
+
+        return self._ids.get(label)
+
+    def add(self, document_id: Any, label_counts: Counter) -> None:
+        """
+        Index the labels of a document.
+
+        Args:
+            document_id (Any): The ID of the document.
+            label_counts (Counter): The number of annotations of the document with each label.
+        """
+
+        for label, count in label_counts.items():
+            label_id = self._ids[label]
+            self.counts[label_id] += count
+            self._documents[label_id][document_id] = count
+
+    def remove(self, document_id: Any, label_counts: Counter) -> None:
+        """
+        Remove the labels of a document from the index, see `add`.
+        """
+
+        for label, count in label_counts.items():
+            label_id = self._ids[label]
+            self.counts[label_id] -= count
+            del self._documents[label_id][document_id]
+
+    def present(self) -> set[str]:
+        """
+        Returns the labels of at least one annotation in the corpus.
+        """
+
+        return {label for label, count in zip(self.labels, self.counts) if count}
+
+    def count(self, label: str) -> int:
+        """
+        Returns the number of annotations with a label.
+        """
+
+        label_id = self._ids.get(label)
+        return self.counts[label_id] if label_id is not None else 0
+
+    def documents(self, label: str) -> dict[Any, int]:
+        """
+        Returns the IDs of the documents with a label, mapped to the number of annotations with it.
+        """
+
+        label_id = self._ids.get(label)
+        return self._documents[label_id] if label_id is not None else {}
+
+
+class Corpus:
+    """
+    A collection of documents keyed by ID, with corpus-wide label vocabularies and indexes.
+
+    Entity and relation labels are interned when a document is added, so every
+    annotation with the same label shares one string, and an inverted index from every
+    label to the documents containing it is kept up to date as documents are added and
+    removed. Corpus-wide label sets, counts and lookups therefore cost O(labels) or
+    O(result) rather than a pass over the corpus.
+
+    Annotations changed in place after a document was added are not reindexed until
+    `reindex` is called.
+
+    Args:
+        documents (Iterable[Document]): The initial documents. Their IDs must be unique.
+    """
+
+    def __init__(self, documents: Iterable[Document] = ()) -> None:
+        self.entity_index: LabelIndex = LabelIndex()
+        self.relation_index: LabelIndex = LabelIndex()
+        self._documents: dict[Any, Document] = {}
+        self._label_counts: dict[Any, tuple[Counter, Counter]] = {}
+        for document in documents:
+            self.add(document)
+
+    @classmethod
+    def from_loader(cls, loader: BaseLoader, path: str, **kwargs) -> Corpus:
+        """
+        Build a corpus from a directory, or a single file, of documents.
+
+        Args:
+            loader (BaseLoader): The loader reading the documents.
+            path (str): The path to the directory or file.
+            **kwargs: Passed on to `BaseLoader.load_directory` when loading a directory.
+
+        Returns:
+            Corpus: The corpus.
+        """
+
+        if os.path.isdir(path):
+            return cls(loader.load_directory(path, **kwargs))
+        return cls(loader.iter_file(path))
+
+    def add(self, document: Document, replace: bool = False) -> None:
+        """
+        Add a document.
+
+        Args:
+            document (Document): The document to add.
+            replace (bool): Whether to replace a document with the same ID.
+
+        Raises:
+            ValueError: If the corpus already has a document with the ID and `replace` is False.
+        """
+
+        if document.id in self._documents:
+            if not replace:
+                raise ValueError(f"The corpus already has a document with ID {document.id!r}.")
+            self.remove(document.id)
+
+        entity_counts = Counter()
+        for interval in document.entities:
+            entity = interval.data
+            entity.label = self.entity_index.intern(entity.label)
+            entity_counts[entity.label] += 1
+        relation_counts = Counter()
+        for relation in document.relations:
+            relation.label = self.relation_index.intern(relation.label)
+            relation_counts[relation.label] += 1
+
+        self.entity_index.add(document.id, entity_counts)
+        self.relation_index.add(document.id, relation_counts)
+        self._documents[document.id] = document
+        self._label_counts[document.id] = (entity_counts, relation_counts)
+
+    def remove(self, document_id: Any) -> Document:
+        """
+        Remove a document.
+
+        Args:
+            document_id (Any): The ID of the document to remove.
+
+        Returns:
+            Document: The removed document.
+
+        Raises:
+            KeyError: If there is no document with the ID.
+        """
+
+        document = self._documents.pop(document_id)
+        entity_counts, relation_counts = self._label_counts.pop(document_id)
+        self.entity_index.remove(document_id, entity_counts)
+        self.relation_index.remove(document_id, relation_counts)
+        return document
+
+    def reindex(self, document_id: Any) -> None:
+        """
+        Update the indexes after the annotations of a document were changed in place.
+
+        Args:
+            document_id (Any): The ID of the changed document.
+        """
+
+        self.add(self._documents[document_id], replace=True)
+
+    def entity_labels(self) -> set[str]:
+        """
+        Returns the set of entity labels in the corpus.
+        """
+
+        return self.entity_index.present()
+
+    def relation_labels(self) -> set[str]:
+        """
+        Returns the set of relation labels in the corpus.
+        """
+
+        return self.relation_index.present()
+
+    def entity_label_counts(self) -> dict[str, int]:
+        """
+        Returns the number of entities with each label.
+        """
+
+        index = self.entity_index
+        return {label: count for label, count in zip(index.labels, index.counts) if count}
+
+    def relation_label_counts(self) -> dict[str, int]:
+        """
+        Returns the number of relations with each label.
+        """
+
+        index = self.relation_index
+        return {label: count for label, count in zip(index.labels, index.counts) if count}
+
+    def documents_with_entity_label(self, label: str) -> list[Document]:
+        """
+        Returns the documents with at least one entity with a label.
+        """
+
+        return [self._documents[document_id] for document_id in self.entity_index.documents(label)]
+
+    def documents_with_relation_label(self, label: str) -> list[Document]:
+        """
+        Returns the documents with at least one relation with a label.
+        """
+
+        return [self._documents[document_id] for document_id in self.relation_index.documents(label)]
+
+    def get(self, document_id: Any) -> Document | None:
+        """
+        Returns the document with the specified ID, or None if not found.
+        """
+
+        return self._documents.get(document_id)
+
+    def __getitem__(self, document_id: Any) -> Document:
+        return self._documents[document_id]
+
+    def __contains__(self, document_id: Any) -> bool:
+        return document_id in self._documents
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def __iter__(self) -> Iterator[Document]:
+        return iter(self._documents.values())
+
+    def __repr__(self) -> str:
+        return f"Corpus({len(self)} documents)"
@@ -2,8 +2,15 @@ from __future__ import annotations
 from parselt.core.token import Token
 from parselt.core.relation import Relation
 from parselt.core.entity import Entity
+from parselt.core.labeling import assign_labels, label_tokens
+from parselt.core.relation_graph import RelationGraph, candidate_pairs
+from parselt.core.token_array import TokenArray
 from parselt.tokenizers.base_tokenizer import BaseTokenizer
-from intervaltree import IntervalTree
+from parselt.utils.instrumentation import stage
+from parselt.core.interval_index import IntervalIndex
+from intervaltree import Interval
+from bisect import bisect_left, bisect_right
+from typing import Iterable
 
 class Document:
     """
@@ -15,16 +22,31 @@ class Document:
         text (str): The text of the document.
         entities (list): A list of named entities in the document.
         relations (list): A list of relations in the document.
-        tokens (list): A list of tokens in the document, as processed by a Tokenizer.    
+        tokens (list | TokenArray): The tokens in the document, as processed by a Tokenizer. Either a
+            list of tokens or, for columnar tokenization, a TokenArray.
+        entity_index (dict): A mapping of entity IDs to the entities in the document.
     """
     
-    def __init__(self, id: int, path: str, text: str, entities: IntervalTree, relations: list, tokens: list | None=None) -> None:
+    def __init__(self, id: int, path: str, text: str, entities: IntervalIndex | Iterable[Interval], relations: list, tokens: list | TokenArray | None=None,
+                 entity_index: dict[int, Entity] | None=None) -> None:
         self.id: int = id
         self.path: str = path
         self.text: str = text
         self.relations: list[Relation] = relations
-        self.entities: IntervalTree = entities
-        self.tokens: list[Token] = tokens if tokens is not None else []
+        self.entities: IntervalIndex = entities if isinstance(entities, IntervalIndex) else IntervalIndex(entities)
+        self.tokens: list[Token] | TokenArray = tokens if tokens is not None else []
+        self.entity_index: dict[int, Entity] = entity_index if entity_index is not None else \
+            {interval.data.entity_id: interval.data for interval in self.entities}
+        self._init_caches()
+        
+    def _init_caches(self) -> None:
+        """
+        Initialize the structures derived from the annotations and tokens, which are built on first use.
+        Subclasses that do not call `Document.__init__` must call this.
+        """
+        
+        self._relation_graph: tuple[RelationGraph, list[Relation]] | None = None
+        self._token_offsets: tuple[list[Token] | TokenArray, list[int], list[int]] | None = None
         
     @property
     def is_tokenized(self) -> bool:
@@ -40,31 +62,168 @@ class Document:
     def tokenize(self, 
                  tokenizer: BaseTokenizer, 
                  default_label: str = "O",
-                 use_bio_labeling: bool = False) -> None:
+                 use_bio_labeling: bool = False,
+                 overlap_policy: str = "first",
+                 columnar: bool = False) -> None:
         """
         Tokenizes the document using the provided tokenizer.
         
+        Tokens are labeled with the entity they overlap in a single sweep over the
+        tokens and entities, see `parselt.core.labeling`.
+        
         Args:
             tokenizer (Tokenizer): The tokenizer to use for tokenization.
+            default_label (str): The label of tokens outside of any entity.
+            use_bio_labeling (bool): Whether to prefix labels with "B-" or "I-".
+            overlap_policy (str): Which entity labels a token that overlaps several: "first",
+                "longest" or "innermost".
+            columnar (bool): Whether to store the tokens as a TokenArray instead of a list of tokens.
+        """
+        
+        tokens = tokenizer.tokenize_array(self.text) if columnar else tokenizer(self.text)
+        self.set_tokens(tokens,
+                        default_label=default_label,
+                        use_bio_labeling=use_bio_labeling,
+                        overlap_policy=overlap_policy)
+        
+    def set_tokens(self,
+                   tokens: list[Token] | TokenArray,
+                   default_label: str = "O",
+                   use_bio_labeling: bool = False,
+                   overlap_policy: str = "first") -> None:
+        """
+        Labels already tokenized text from the document's entities and stores the tokens.
+        
+        Args:
+            tokens (list[Token] | TokenArray): The tokens of the document's text.
+            default_label (str): The label of tokens outside of any entity.
+            use_bio_labeling (bool): Whether to prefix labels with "B-" or "I-".
+            overlap_policy (str): Which entity labels a token that overlaps several: "first",
+                "longest" or "innermost".
         """
         
-        tokens = tokenizer(self.text)
-        for token in tokens:
-            token.label = default_label
-            entity_match = self.entities.overlap(token.start, token.end)
-            if entity_match:
-                entity: Entity = entity_match.pop().data
-                token.label = entity.label
-                if use_bio_labeling:
-                    if token.start == entity.start:
-                        token.label = "B-" + entity.label
-                    else:
-                        token.label = "I-" + entity.label
+        entities = (interval.data for interval in self.entities)
+        with stage("label"):
+            if isinstance(tokens, TokenArray):
+                tokens.set_labels(assign_labels(tokens.starts.tolist(), tokens.ends.tolist(), entities,
+                                                default_label=default_label,
+                                                use_bio_labeling=use_bio_labeling,
+                                                overlap_policy=overlap_policy))
             else:
-                token.label = default_label
-                
+                label_tokens(tokens, entities,
+                             default_label=default_label,
+                             use_bio_labeling=use_bio_labeling,
+                             overlap_policy=overlap_policy)
         self.tokens = tokens
+        self._token_offsets = None
+        
+    def _offsets(self) -> tuple[list[int], list[int]]:
+        """
+        Returns the sorted start and end offsets of the tokens, built once per token list.
+        """
+        
+        cached = self._token_offsets
+        tokens = self.tokens
+        if cached is None or cached[0] is not tokens or len(cached[1]) != len(tokens):
+            if isinstance(tokens, TokenArray):
+                starts, ends = tokens.starts.tolist(), tokens.ends.tolist()
+            else:
+                starts = [token.start for token in tokens]
+                ends = [token.end for token in tokens]
+            cached = self._token_offsets = (tokens, starts, ends)
+        return cached[1], cached[2]
+    
+    def token_index_at(self, offset: int) -> int | None:
+        """
+        Returns the index of the token containing a character offset, in O(log n).
+        
+        Args:
+            offset (int): The character offset.
+            
+        Returns:
+            int | None: The index of the token, or None if the offset is not inside a token.
+        """
+        
+        starts, ends = self._offsets()
+        index = bisect_right(starts, offset) - 1
+        if index >= 0 and offset < ends[index]:
+            return index
+        return None
+    
+    def token_span(self, start: int, end: int, contained: bool = False) -> tuple[int, int]:
+        """
+        Returns the index range of the tokens in a character span, in O(log n).
+        
+        Args:
+            start (int): The start offset of the span.
+            end (int): The end offset of the span.
+            contained (bool): Whether to only include tokens entirely inside the span, instead of
+                every token overlapping it.
+                
+        Returns:
+            tuple[int, int]: The index of the first token and the index after the last token.
+        """
+        
+        starts, ends = self._offsets()
+        if contained:
+            first = bisect_left(starts, start)
+            last = bisect_right(ends, end)
+        else:
+            first = bisect_right(ends, start)
+            last = bisect_left(starts, end)
+        return first, max(first, last)
+    
+    def tokens_in_span(self, start: int, end: int, contained: bool = False) -> list[Token]:
+        """
+        Returns the tokens in a character span, in O(log n + k) for k tokens.
+        
+        Args:
+            start (int): The start offset of the span.
+            end (int): The end offset of the span.
+            contained (bool): Whether to only include tokens entirely inside the span, instead of
+                every token overlapping it.
+                
+        Returns:
+            list[Token]: The tokens, in order.
+        """
+        
+        first, last = self.token_span(start, end, contained)
+        return self.tokens[first:last]
+    
+    def entities_in_span(self, start: int, end: int, contained: bool = False) -> list[Entity]:
+        """
+        Returns the entities in a character span, in O(log n + k) for k entities.
+        
+        Args:
+            start (int): The start offset of the span.
+            end (int): The end offset of the span.
+            contained (bool): Whether to only include entities entirely inside the span, instead of
+                every entity overlapping it.
+                
+        Returns:
+            list[Entity]: The entities, ordered by offset.
+        """
+        
+        intervals = self.entities.envelop(start, end) if contained else self.entities.overlap(start, end)
+        return [interval.data for interval in sorted(intervals, key=lambda interval: (interval.begin, interval.end))]
+    
+    def entities_in_token_span(self, first: int, last: int, contained: bool = True) -> list[Entity]:
+        """
+        Returns the entities in a range of tokens, such as a token window.
+        
+        Args:
+            first (int): The index of the first token.
+            last (int): The index after the last token.
+            contained (bool): Whether to only include entities entirely inside the tokens.
+            
+        Returns:
+            list[Entity]: The entities, ordered by offset.
+        """
         
+        if first >= last:
+            return []
+        starts, ends = self._offsets()
+        return self.entities_in_span(starts[first], ends[last - 1], contained)
         
     def get_entity_by_id(self, entity_id: int) -> Entity | None:
         """
@@ -77,18 +236,67 @@ class Document:
             Entity | None: The entity with the specified ID, or None if not found.
         """
         
-        for entity in self.entities:
-            if entity.data.entity_id == entity_id:
-                return entity
-        return None
+        return self.entity_index.get(entity_id)
         
 
+    @property
+    def relation_graph(self) -> RelationGraph:
+        """
+        Returns an index of the relations by entity and label, built on first access.
+        
+        The index is rebuilt when the relation list is replaced or its length changes.
+        """
+        
+        graph, relations = self._relation_graph or (None, None)
+        if relations is not self.relations or len(graph) != len(relations):
+            graph = RelationGraph(self.relations)
+            self._relation_graph = (graph, self.relations)
+        return graph
+    
+    def candidate_pairs(self,
+                        max_char_distance: int | None = None,
+                        max_token_distance: int | None = None,
+                        label_pairs: Iterable[tuple[str, str]] | None = None,
+                        directed: bool = True) -> list[tuple[Entity, Entity]]:
+        """
+        Returns the candidate relation argument pairs of the document's entities, pruned by distance and label.
+        
+        See `parselt.core.relation_graph.candidate_pairs`, which returns index arrays instead of entities.
+        
+        Args:
+            max_char_distance (int | None): The maximum number of characters between the entities of a pair.
+            max_token_distance (int | None): The maximum number of tokens between the entities of a pair.
+                Requires the document to be tokenized.
+            label_pairs (Iterable[tuple[str, str]] | None): The allowed (first argument label, second
+                argument label) pairs. None allows every pair.
+            directed (bool): Whether to return both orders of every pair.
+        
+        Returns:
+            list[tuple[Entity, Entity]]: The (first argument, second argument) pairs.
+        """
+        
+        entities = [interval.data for interval in self.entities]
+        token_starts = token_ends = None
+        if max_token_distance is not None:
+            if not self.is_tokenized:
+                raise ValueError("max_token_distance requires the document to be tokenized.")
+            if isinstance(self.tokens, TokenArray):
+                token_starts, token_ends = self.tokens.starts, self.tokens.ends
+            else:
+                token_starts = [token.start for token in self.tokens]
+                token_ends = [token.end for token in self.tokens]
+        pairs = candidate_pairs(entities, max_char_distance=max_char_distance,
+                                max_token_distance=max_token_distance,
+                                token_starts=token_starts, token_ends=token_ends,
+                                label_pairs=label_pairs, directed=directed)
+        return [(entities[first], entities[second]) for first, second in pairs.tolist()]
+        
     def entity_labels(self) -> set[str]:
         """
         Returns a set of unique entity labels in the document.
         """
         
-        return {entity.label for entity in self.entities}
+        return {interval.data.label for interval in self.entities}
     
     def relation_labels(self) -> set[str]:
         """
@@ -1,6 +1,8 @@
 from parselt.core.token import Token
 
 class Entity(Token):
+    __slots__ = ("entity_id",)
+    
     def __init__(self, text: str, start: int, end: int, label: str, entity_id: int) -> None:
         """
         Initializes an Entity object.
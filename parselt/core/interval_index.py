@@ -0,0 +1,216 @@
+from __future__ import annotations
+from bisect import bisect_left, bisect_right
+from typing import Any, Iterable, Iterator, Sequence
+from intervaltree import Interval
+import numpy as np
+
+
+class IntervalIndex:
+    """
+    A read-only index of intervals, such as the entities of a document, built once from sorted arrays.
+
+    Intervals are sorted by (begin, end) into NumPy arrays, along with the running maximum
+    of their ends. The intervals overlapping a range then start at or after the first
+    index whose running maximum end passes the range start, and before the first index
+    whose begin reaches the range end, so every query is two binary searches and a scan
+    of that range. Building the index is a sort, instead of the node allocations of an
+    `IntervalTree`.
+
+    The surface follows `IntervalTree` (iteration, `len`, `in`, `overlap`, `envelop`,
+    `at`), except that queries return lists ordered by (begin, end) rather than sets. A
+    very long interval early in the order widens the scanned range of later queries, so
+    the index suits annotations, which are mostly short, rather than arbitrary intervals.
+
+    Args:
+        intervals (Iterable[Interval]): The intervals to index. Their begins must be below their ends.
+    """
+
+    __slots__ = ("intervals", "begins", "ends", "max_ends", "_lists")
+
+    def __init__(self, intervals: Iterable[Interval] = ()) -> None:
+        intervals = list(intervals)
+        count = len(intervals)
+        begins = np.fromiter((interval.begin for interval in intervals), dtype=np.int64, count=count)
+        ends = np.fromiter((interval.end for interval in intervals), dtype=np.int64, count=count)
+        if count and not (begins < ends).all():
+            null = intervals[int(np.argmin(begins < ends))]
+            raise ValueError(f"Null interval {null} is not allowed in an IntervalIndex.")
+
+        if count > 1 and ((begins[1:] < begins[:-1]) | ((begins[1:] == begins[:-1]) & (ends[1:] < ends[:-1]))).any():
+            order = np.lexsort((ends, begins))
+            intervals = [intervals[i] for i in order.tolist()]
+            begins, ends = begins[order], ends[order]
+
+        self.intervals: list[Interval] = intervals
+        self.begins: np.ndarray = begins
+        self.ends: np.ndarray = ends
+        self.max_ends: np.ndarray = np.maximum.accumulate(ends) if count else ends
+        self._lists: tuple[list[int], list[int], list[int]] | None = None
+
+    def _as_lists(self) -> tuple[list[int], list[int], list[int]]:
+        """
+        Returns the begins, ends and running maximum ends as lists, which bisect faster than
+        arrays for a single query.
+        """
+
+        if self._lists is None:
+            self._lists = (self.begins.tolist(), self.ends.tolist(), self.max_ends.tolist())
+        return self._lists
+
+    def overlap(self, begin: int | Interval, end: int | None = None) -> list[Interval]:
+        """
+        Returns the intervals overlapping a range.
+
+        Args:
+            begin (int | Interval): The start of the range, or an interval to use as the range.
+            end (int | None): The end of the range, exclusive.
+
+        Returns:
+            list[Interval]: The intervals with begin < end and end > begin, ordered by (begin, end).
+        """
+
+        if end is None:
+            begin, end = begin.begin, begin.end
+        begins, ends, max_ends = self._as_lists()
+        first = bisect_right(max_ends, begin)
+        last = bisect_left(begins, end)
+        intervals = self.intervals
+        return [intervals[i] for i in range(first, last) if ends[i] > begin]
+
+    def envelop(self, begin: int | Interval, end: int | None = None) -> list[Interval]:
+        """
+        Returns the intervals entirely inside a range.
+
+        Args:
+            begin (int | Interval): The start of the range, or an interval to use as the range.
+            end (int | None): The end of the range, exclusive.
+
+        Returns:
+            list[Interval]: The intervals with begin >= begin and end <= end, ordered by (begin, end).
+        """
+
+        if end is None:
+            begin, end = begin.begin, begin.end
+        begins, ends, _ = self._as_lists()
+        first = bisect_left(begins, begin)
+        last = bisect_left(begins, end)
+        intervals = self.intervals
+        return [intervals[i] for i in range(first, last) if ends[i] <= end]
+
+    def at(self, point: int) -> list[Interval]:
+        """
+        Returns the intervals containing a point.
+
+        Args:
+            point (int): The point.
+
+        Returns:
+            list[Interval]: The intervals with begin <= point < end, ordered by (begin, end).
+        """
+
+        begins, ends, max_ends = self._as_lists()
+        first = bisect_right(max_ends, point)
+        last = bisect_right(begins, point)
+        intervals = self.intervals
+        return [intervals[i] for i in range(first, last) if ends[i] > point]
+
+    def overlaps(self, begin: int | Interval, end: int | None = None) -> bool:
+        """
+        Checks if any interval overlaps a range, see `overlap`.
+        """
+
+        if end is None:
+            begin, end = begin.begin, begin.end
+        begins, ends, max_ends = self._as_lists()
+        first = bisect_right(max_ends, begin)
+        last = bisect_left(begins, end)
+        return any(ends[i] > begin for i in range(first, last))
+
+    def overlap_batch(self, begins: Sequence[int] | np.ndarray,
+                      ends: Sequence[int] | np.ndarray,
+                      contained: bool = False) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Find the intervals overlapping, or inside, many ranges at once, such as token spans.
+
+        All ranges are searched and filtered with array operations, without a Python loop
+        per range.
+
+        Args:
+            begins (Sequence[int] | np.ndarray): The starts of the ranges.
+            ends (Sequence[int] | np.ndarray): The ends of the ranges, exclusive.
+            contained (bool): Whether to only match intervals entirely inside a range, instead of
+                every interval overlapping it.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The matching (range index, interval index) pairs, as two
+                arrays ordered by range and then interval. Interval indexes are positions in
+                iteration order, see `__getitem__`.
+        """
+
+        query_begins = np.asarray(begins, dtype=np.int64)
+        query_ends = np.asarray(ends, dtype=np.int64)
+        if contained:
+            first = np.searchsorted(self.begins, query_begins, side="left")
+        else:
+            first = np.searchsorted(self.max_ends, query_begins, side="right")
+        last = np.searchsorted(self.begins, query_ends, side="left")
+
+        counts = np.maximum(last - first, 0)
+        total = int(counts.sum())
+        queries = np.repeat(np.arange(len(counts), dtype=np.int64), counts)
+        offsets = np.cumsum(counts) - counts
+        candidates = np.arange(total, dtype=np.int64) - np.repeat(offsets - first, counts)
+
+        if contained:
+            keep = self.ends[candidates] <= query_ends[queries]
+        else:
+            keep = self.ends[candidates] > query_begins[queries]
+        return queries[keep], candidates[keep]
+
+    def begin(self) -> int:
+        """
+        Returns the lowest begin of the intervals, or 0 if there are none.
+        """
+
+        return int(self.begins[0]) if len(self.begins) else 0
+
+    def end(self) -> int:
+        """
+        Returns the highest end of the intervals, or 0 if there are none.
+        """
+
+        return int(self.max_ends[-1]) if len(self.max_ends) else 0
+
+    def items(self) -> list[Interval]:
+        """
+        Returns the intervals, ordered by (begin, end).
+        """
+
+        return list(self.intervals)
+
+    def is_empty(self) -> bool:
+        return not self.intervals
+
+    def __getitem__(self, index: int) -> Interval:
+        return self.intervals[index]
+
+    def __iter__(self) -> Iterator[Interval]:
+        return iter(self.intervals)
+
+    def __len__(self) -> int:
+        return len(self.intervals)
+
+    def __contains__(self, interval: Any) -> bool:
+        if not isinstance(interval, Interval):
+            return False
+        return interval in self.envelop(interval.begin, interval.end)
+
+    def __getstate__(self) -> tuple[list[Interval], np.ndarray, np.ndarray, np.ndarray]:
+        return self.intervals, self.begins, self.ends, self.max_ends
+
+    def __setstate__(self, state: tuple[list[Interval], np.ndarray, np.ndarray, np.ndarray]) -> None:
+        self.intervals, self.begins, self.ends, self.max_ends = state
+        self._lists = None
+
+    def __repr__(self) -> str:
+        return f"IntervalIndex({self.intervals!r})"
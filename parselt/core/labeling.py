@@ -0,0 +1,133 @@
+from __future__ import annotations
+from parselt.core.entity import Entity
+from parselt.core.token import Token
+from typing import Callable, Iterable, Sequence
+
+# How a token is labeled when it overlaps more than one entity:
+#   "first":     the entity that starts first (ties go to the longer entity).
+#   "longest":   the longest entity (ties go to the one that starts first).
+#   "innermost": the shortest entity (ties go to the one that starts first).
+OVERLAP_POLICIES: dict[str, Callable[[Entity], tuple]] = {
+    "first": lambda entity: (entity.start, -entity.end),
+    "longest": lambda entity: (entity.start - entity.end, entity.start),
+    "innermost": lambda entity: (entity.end - entity.start, entity.start),
+}
+
+
+def match_entities(starts: Sequence[int],
+                   ends: Sequence[int],
+                   entities: Iterable[Entity],
+                   overlap_policy: str = "first") -> list[Entity | None]:
+    """
+    Match every token span to the entity it belongs to in a single sweep.
+
+    Tokens and entities are both walked in offset order, keeping only the entities
+    that are still open at the current token, so the cost is linear in the number
+    of tokens and entities rather than one interval query per token.
+
+    Args:
+        starts (Sequence[int]): The start offsets of the tokens.
+        ends (Sequence[int]): The end offsets of the tokens.
+        entities (Iterable[Entity]): The entities to match against.
+        overlap_policy (str): Which entity wins when a token overlaps several, see `OVERLAP_POLICIES`.
+
+    Returns:
+        list[Entity | None]: The matched entity for every token, or None if it overlaps no entity.
+    """
+
+    if overlap_policy not in OVERLAP_POLICIES:
+        raise ValueError(f"Unknown overlap policy {overlap_policy!r}, expected one of {list(OVERLAP_POLICIES)}.")
+    policy_key = OVERLAP_POLICIES[overlap_policy]
+
+    count = len(starts)
+    order: Iterable[int] = range(count)
+    if any(starts[i] > starts[i + 1] for i in range(count - 1)):
+        order = sorted(order, key=starts.__getitem__)
+
+    # Ties on the span are broken by label and ID so the result never depends on input order
+    sorted_entities = sorted(entities, key=lambda entity: (entity.start, entity.end, entity.label, str(entity.entity_id)))
+    entity_count = len(sorted_entities)
+    next_entity = 0
+    active: list[Entity] = []
+
+    matches: list[Entity | None] = [None] * count
+    for i in order:
+        start = starts[i]
+        end = ends[i]
+
+        while next_entity < entity_count and sorted_entities[next_entity].start < end:
+            active.append(sorted_entities[next_entity])
+            next_entity += 1
+        if not active:
+            continue
+
+        # Token starts never decrease, so an entity that ended before this token is done for good
+        active = [entity for entity in active if entity.end > start]
+        if len(active) == 1:
+            if active[0].start < end:
+                matches[i] = active[0]
+            continue
+
+        candidates = [entity for entity in active if entity.start < end]
+        if candidates:
+            matches[i] = min(candidates, key=policy_key)
+
+    return matches
+
+
+def assign_labels(starts: Sequence[int],
+                  ends: Sequence[int],
+                  entities: Iterable[Entity],
+                  default_label: str = "O",
+                  use_bio_labeling: bool = False,
+                  overlap_policy: str = "first") -> list[str]:
+    """
+    Compute the label of every token span from the entities it overlaps.
+
+    Args:
+        starts (Sequence[int]): The start offsets of the tokens.
+        ends (Sequence[int]): The end offsets of the tokens.
+        entities (Iterable[Entity]): The entities to label from.
+        default_label (str): The label of tokens outside of any entity.
+        use_bio_labeling (bool): Whether to prefix labels with "B-" or "I-".
+        overlap_policy (str): Which entity wins when a token overlaps several, see `OVERLAP_POLICIES`.
+
+    Returns:
+        list[str]: The label of every token.
+    """
+
+    matches = match_entities(starts, ends, entities, overlap_policy)
+    labels = []
+    for start, entity in zip(starts, matches):
+        if entity is None:
+            labels.append(default_label)
+        elif not use_bio_labeling:
+            labels.append(entity.label)
+        elif start == entity.start:
+            labels.append("B-" + entity.label)
+        else:
+            labels.append("I-" + entity.label)
+    return labels
+
+
+def label_tokens(tokens: list[Token],
+                 entities: Iterable[Entity],
+                 default_label: str = "O",
+                 use_bio_labeling: bool = False,
+                 overlap_policy: str = "first") -> None:
+    """
+    Label tokens in place from the entities they overlap.
+
+    Args:
+        tokens (list[Token]): The tokens to label.
+        entities (Iterable[Entity]): The entities to label from.
+        default_label (str): The label of tokens outside of any entity.
+        use_bio_labeling (bool): Whether to prefix labels with "B-" or "I-".
+        overlap_policy (str): Which entity wins when a token overlaps several, see `OVERLAP_POLICIES`.
+    """
+
+    starts = [token.start for token in tokens]
+    ends = [token.end for token in tokens]
+    labels = assign_labels(starts, ends, entities, default_label, use_bio_labeling, overlap_policy)
+    for token, label in zip(tokens, labels):
+        token.label = label
@@ -0,0 +1,94 @@
+from __future__ import annotations
+from parselt.core.document import Document
+from parselt.core.entity import Entity
+from parselt.core.relation import Relation
+from parselt.core.token import Token
+from parselt.core.token_array import TokenArray
+from parselt.core.interval_index import IntervalIndex
+from typing import Callable
+
+
+class LazyDocument(Document):
+    """
+    A handle to a document whose text and annotations are loaded on first access.
+
+    The ID and path are available immediately. The text is loaded the first time
+    `text` is read, and the entities, relations and entity index are loaded together
+    the first time any of them is read. Otherwise it behaves like a `Document`.
+
+    Args:
+        id (int): The unique ID of the document.
+        path (str): The path to the document.
+        load_text (Callable[[], str]): Loads the text of the document.
+        load_annotations (Callable[[], tuple[IntervalIndex, list[Relation], dict[int, Entity]]]): Loads
+            the entities, relations and entity index of the document.
+    """
+
+    def __init__(self, id: int, path: str,
+                 load_text: Callable[[], str],
+                 load_annotations: Callable[[], tuple[IntervalIndex, list[Relation], dict[int, Entity]]]) -> None:
+        self.id: int = id
+        self.path: str = path
+        self.tokens: list[Token] | TokenArray = []
+        self._load_text = load_text
+        self._load_annotations = load_annotations
+        self._text: str | None = None
+        self._annotations: tuple[IntervalIndex, list[Relation], dict[int, Entity]] | None = None
+        # `Document.__init__` is not called, since setting the text and annotations through
+        # the properties would load them
+        self._init_caches()
+
+    @property
+    def is_text_loaded(self) -> bool:
+        return self._text is not None
+
+    @property
+    def are_annotations_loaded(self) -> bool:
+        return self._annotations is not None
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = self._load_text()
+        return self._text
+
+    @text.setter
+    def text(self, text: str) -> None:
+        self._text = text
+
+    def _annotation(self, position: int):
+        if self._annotations is None:
+            self._annotations = self._load_annotations()
+        return self._annotations[position]
+
+    def _set_annotation(self, position: int, value) -> None:
+        annotations = list(self._annotations if self._annotations is not None else self._load_annotations())
+        annotations[position] = value
+        self._annotations = tuple(annotations)
+
+    @property
+    def entities(self) -> IntervalIndex:
+        return self._annotation(0)
+
+    @entities.setter
+    def entities(self, entities: IntervalIndex) -> None:
+        self._set_annotation(0, entities)
+
+    @property
+    def relations(self) -> list[Relation]:
+        return self._annotation(1)
+
+    @relations.setter
+    def relations(self, relations: list[Relation]) -> None:
+        self._set_annotation(1, relations)
+
+    @property
+    def entity_index(self) -> dict[int, Entity]:
+        return self._annotation(2)
+
+    @entity_index.setter
+    def entity_index(self, entity_index: dict[int, Entity]) -> None:
+        self._set_annotation(2, entity_index)
+
+    def __repr__(self) -> str:
+        return f"LazyDocument({self.id!r}, {self.path!r})"
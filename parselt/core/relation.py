@@ -3,7 +3,7 @@ from dataclasses import dataclass
 from parselt.core.entity import Entity
 
 
-@dataclass
+@dataclass(slots=True)
 class Relation:
     """
     Represents a relation between two entities in a document.
@@ -28,6 +28,14 @@ class Relation:
         if not isinstance(self.arg_1, Entity) or not isinstance(self.arg_2, Entity):
             raise ValueError("Arguments must be entities.")
     
+    def __getstate__(self) -> tuple[None, dict]:
+        """
+        Returns the fields of the relation. `dataclass(slots=True)` only defines this for frozen
+        classes, and pickling with protocols 0 or 1 needs it.
+        """
+        
+        return object.__getstate__(self)
+    
     def __str__(self):
         return f'R{self.id}\t{self.label} Arg1:T{self.arg_1.entity_id} Arg2:T{self.arg_2.entity_id}'
 
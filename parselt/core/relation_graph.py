@@ -0,0 +1,278 @@
+from __future__ import annotations
+from parselt.core.entity import Entity
+from parselt.core.relation import Relation
+from collections import deque
+from typing import Any, Generator, Iterable, Sequence
+import numpy as np
+
+
+class RelationGraph:
+    """
+    An index of the relations of a document as a directed graph between entities.
+
+    Relations are indexed by the IDs of their arguments and by label, so the relations of
+    an entity, the relations between two entities or the relations with a label are
+    dictionary lookups instead of scans of the relation list.
+
+    Args:
+        relations (Iterable[Relation]): The relations to index.
+    """
+
+    def __init__(self, relations: Iterable[Relation]) -> None:
+        self.relations: list[Relation] = list(relations)
+        self._outgoing: dict[Any, list[Relation]] = {}
+        self._incoming: dict[Any, list[Relation]] = {}
+        self._by_label: dict[str, list[Relation]] = {}
+        self._by_pair: dict[tuple[Any, Any], list[Relation]] = {}
+        for relation in self.relations:
+            source = relation.arg_1.entity_id
+            target = relation.arg_2.entity_id
+            self._outgoing.setdefault(source, []).append(relation)
+            self._incoming.setdefault(target, []).append(relation)
+            self._by_label.setdefault(relation.label, []).append(relation)
+            self._by_pair.setdefault((source, target), []).append(relation)
+
+    def outgoing(self, entity_id: Any, label: str | None = None) -> list[Relation]:
+        """
+        Returns the relations whose first argument is the entity, optionally only those with a label.
+        """
+
+        return _with_label(self._outgoing.get(entity_id, []), label)
+
+    def incoming(self, entity_id: Any, label: str | None = None) -> list[Relation]:
+        """
+        Returns the relations whose second argument is the entity, optionally only those with a label.
+        """
+
+        return _with_label(self._incoming.get(entity_id, []), label)
+
+    def relations_of(self, entity_id: Any, label: str | None = None) -> list[Relation]:
+        """
+        Returns the relations with the entity as either argument, optionally only those with a label.
+        """
+
+        outgoing = self.outgoing(entity_id, label)
+        return outgoing + [relation for relation in self.incoming(entity_id, label) if relation not in outgoing]
+
+    def neighbors(self, entity_id: Any, label: str | None = None, direction: str = "out") -> list[Entity]:
+        """
+        Returns the entities related to an entity.
+
+        Args:
+            entity_id (Any): The ID of the entity.
+            label (str | None): Only follow relations with this label.
+            direction (str): "out" for the second arguments of outgoing relations, "in" for the
+                first arguments of incoming relations, or "both".
+
+        Returns:
+            list[Entity]: The related entities, without duplicates.
+        """
+
+        if direction not in ("out", "in", "both"):
+            raise ValueError(f"Unknown direction {direction!r}, expected 'out', 'in' or 'both'.")
+        neighbors = {}
+        if direction in ("out", "both"):
+            for relation in self.outgoing(entity_id, label):
+                neighbors.setdefault(relation.arg_2.entity_id, relation.arg_2)
+        if direction in ("in", "both"):
+            for relation in self.incoming(entity_id, label):
+                neighbors.setdefault(relation.arg_1.entity_id, relation.arg_1)
+        return list(neighbors.values())
+
+    def with_label(self, label: str) -> list[Relation]:
+        """
+        Returns the relations with a label.
+        """
+
+        return list(self._by_label.get(label, []))
+
+    def between(self, source_id: Any, target_id: Any, label: str | None = None) -> list[Relation]:
+        """
+        Returns the relations from one entity to another, optionally only those with a label.
+        """
+
+        return _with_label(self._by_pair.get((source_id, target_id), []), label)
+
+    def labels(self) -> set[str]:
+        """
+        Returns the set of relation labels.
+        """
+
+        return set(self._by_label)
+
+    def paths(self, source_id: Any, target_id: Any,
+              max_hops: int = 3,
+              labels: Iterable[str] | None = None,
+              directed: bool = True) -> Generator[list[Relation], None, None]:
+        """
+        Lazily find the relation paths between two entities, shortest first.
+
+        Paths never visit an entity twice.
+
+        Args:
+            source_id (Any): The ID of the entity the paths start at.
+            target_id (Any): The ID of the entity the paths end at.
+            max_hops (int): The maximum number of relations in a path.
+            labels (Iterable[str] | None): Only follow relations with these labels.
+            directed (bool): Whether relations can only be followed from their first to their second argument.
+
+        Yields:
+            list[Relation]: The relations along every path, in order.
+        """
+
+        labels = set(labels) if labels is not None else None
+        queue = deque([(source_id, [], {source_id})])
+        while queue:
+            entity_id, path, visited = queue.popleft()
+            if len(path) >= max_hops:
+                continue
+            for relation, next_id in self._steps(entity_id, directed):
+                if next_id in visited or (labels is not None and relation.label not in labels):
+                    continue
+                next_path = path + [relation]
+                if next_id == target_id:
+                    yield next_path
+                else:
+                    queue.append((next_id, next_path, visited | {next_id}))
+
+    def reachable(self, source_id: Any,
+                  max_hops: int | None = None,
+                  labels: Iterable[str] | None = None,
+                  directed: bool = True) -> dict[Any, int]:
+        """
+        Returns the entities reachable from an entity, mapped to the least number of relations to reach them.
+
+        Args:
+            source_id (Any): The ID of the entity to start at.
+            max_hops (int | None): The maximum number of relations to follow. None for no limit.
+            labels (Iterable[str] | None): Only follow relations with these labels.
+            directed (bool): Whether relations can only be followed from their first to their second argument.
+
+        Returns:
+            dict[Any, int]: The IDs of the reachable entities, excluding the source, and their distances.
+        """
+
+        labels = set(labels) if labels is not None else None
+        distances = {source_id: 0}
+        queue = deque([source_id])
+        while queue:
+            entity_id = queue.popleft()
+            hops = distances[entity_id]
+            if max_hops is not None and hops >= max_hops:
+                continue
+            for relation, next_id in self._steps(entity_id, directed):
+                if next_id in distances or (labels is not None and relation.label not in labels):
+                    continue
+                distances[next_id] = hops + 1
+                queue.append(next_id)
+        del distances[source_id]
+        return distances
+
+    def _steps(self, entity_id: Any, directed: bool) -> Generator[tuple[Relation, Any], None, None]:
+        """
+        Yields the relations that can be followed from an entity and the entity they lead to.
+        """
+
+        for relation in self._outgoing.get(entity_id, ()):
+            yield relation, relation.arg_2.entity_id
+        if not directed:
+            for relation in self._incoming.get(entity_id, ()):
+                yield relation, relation.arg_1.entity_id
+
+    def __len__(self) -> int:
+        return len(self.relations)
+
+    def __contains__(self, pair: tuple[Any, Any]) -> bool:
+        return pair in self._by_pair
+
+
+def _with_label(relations: list[Relation], label: str | None) -> list[Relation]:
+    if label is None:
+        return list(relations)
+    return [relation for relation in relations if relation.label == label]
+
+
+def candidate_pairs(entities: Sequence[Entity],
+                    max_char_distance: int | None = None,
+                    max_token_distance: int | None = None,
+                    token_starts: Sequence[int] | np.ndarray | None = None,
+                    token_ends: Sequence[int] | np.ndarray | None = None,
+                    label_pairs: Iterable[tuple[str, str]] | None = None,
+                    directed: bool = True) -> np.ndarray:
+    """
+    Generate candidate relation argument pairs of entities, pruned by distance and label.
+
+    Entities are sorted by start offset, so the entities within a distance of an entity
+    form a contiguous range found with a binary search. All pairs are generated and
+    filtered with array operations, without a Python loop per pair.
+
+    The character distance of two entities is the number of characters between them, 0
+    if they overlap. The token distance is the number of tokens between them.
+
+    Args:
+        entities (Sequence[Entity]): The entities.
+        max_char_distance (int | None): The maximum character distance of a pair.
+        max_token_distance (int | None): The maximum token distance of a pair. Requires the token offsets.
+        token_starts (Sequence[int] | np.ndarray | None): The sorted start offsets of the tokens.
+        token_ends (Sequence[int] | np.ndarray | None): The sorted end offsets of the tokens.
+        label_pairs (Iterable[tuple[str, str]] | None): The allowed (first argument label, second
+            argument label) pairs. None allows every pair.
+        directed (bool): Whether to generate both orders of every pair, as (first argument, second
+            argument). Otherwise every pair is generated once, with the entity that starts first
+            first, if either order is allowed.
+
+    Returns:
+        np.ndarray: The pairs as indexes into `entities`, of shape (pairs, 2).
+    """
+
+    count = len(entities)
+    if count < 2:
+        return np.empty((0, 2), dtype=np.int64)
+
+    starts = np.fromiter((entity.start for entity in entities), dtype=np.int64, count=count)
+    ends = np.fromiter((entity.end for entity in entities), dtype=np.int64, count=count)
+    order = np.lexsort((ends, starts))
+    starts, ends = starts[order], ends[order]
+
+    # Pairs (i, j) with i < j in start order, j below upper[i]
+    upper = np.full(count, count, dtype=np.int64)
+    if max_char_distance is not None:
+        upper = np.minimum(upper, np.searchsorted(starts, ends + max_char_distance, side="right"))
+    if max_token_distance is not None:
+        if token_starts is None or token_ends is None:
+            raise ValueError("max_token_distance requires token_starts and token_ends.")
+        token_starts = np.asarray(token_starts, dtype=np.int64)
+        token_ends = np.asarray(token_ends, dtype=np.int64)
+        # The first token each entity overlaps and the token after the last one
+        first_tokens = np.searchsorted(token_ends, starts, side="right")
+        last_tokens = np.searchsorted(token_starts, ends, side="left")
+        upper = np.minimum(upper, np.searchsorted(first_tokens, last_tokens + max_token_distance, side="right"))
+
+    lower = np.arange(1, count + 1, dtype=np.int64)
+    counts = np.maximum(upper - lower, 0)
+    total = int(counts.sum())
+    first = np.repeat(np.arange(count, dtype=np.int64), counts)
+    offsets = np.cumsum(counts) - counts
+    second = np.arange(total, dtype=np.int64) - np.repeat(offsets, counts) + np.repeat(lower, counts)
+
+    if label_pairs is None:
+        if directed:
+            first, second = np.concatenate((first, second)), np.concatenate((second, first))
+    else:
+        labels = [entity.label for entity in entities]
+        vocabulary = {label: i for i, label in enumerate(dict.fromkeys(labels))}
+        label_ids = np.fromiter((vocabulary[label] for label in labels), dtype=np.int64, count=count)[order]
+        allowed = np.zeros((len(vocabulary), len(vocabulary)), dtype=bool)
+        for first_label, second_label in label_pairs:
+            if first_label in vocabulary and second_label in vocabulary:
+                allowed[vocabulary[first_label], vocabulary[second_label]] = True
+        forward = allowed[label_ids[first], label_ids[second]]
+        backward = allowed[label_ids[second], label_ids[first]]
+        if directed:
+            first, second = np.concatenate((first[forward], second[backward])), \
+                np.concatenate((second[forward], first[backward]))
+        else:
+            keep = forward | backward
+            first, second = first[keep], second[keep]
+
+    return np.stack((order[first], order[second]), axis=1)
@@ -10,6 +10,8 @@ class Token:
         label (str | None): The label of the token, if any.
     """
     
+    __slots__ = ("text", "start", "end", "next_char", "label")
+    
     def __init__(self, text: str, start: int, end: int, 
                     next_char: str | None=None):
         
@@ -40,5 +42,102 @@ class Token:
         return (self.text, self.start, self.end) == \
                (other.text, other.start, other.end)
         
+    def __getstate__(self) -> tuple[None, dict]:
+        """
+        Returns the slot values of the token, so tokens and entities pickle with every protocol.
+        """
+        
+        return object.__getstate__(self)
+    
     def __str__(self) -> str:
-        return f'{self.text} ({self.start}, {self.end})'
\ No newline at end of file
+        return f'{self.text} ({self.start}, {self.end})'
+
+
+# The slots of Token, used by OffsetToken to store values assigned over its computed text and next_char
+_TEXT_SLOT = Token.text
+_NEXT_CHAR_SLOT = Token.next_char
+
+
+class OffsetToken(Token):
+    """
+    A token that stores only its offsets and a reference to the source text.
+    
+    The text and next character of the token are sliced from the source text on access
+    instead of being copied when the token is created, so tokenizing allocates no
+    strings and tokenized documents hold no copy of their text. Equality and hashing
+    are the same as for `Token`. Assigning `text` or `next_char` stores the value,
+    assigning None slices it from the source again.
+    
+    Args:
+        source (str): The text the offsets refer to.
+        start (int): The start index of the token in the source text.
+        end (int): The end index of the token in the source text.
+        next_start (int | None): The end of the next character slice, usually the start of the next
+            token. Defaults to `end + 1`.
+    """
+    
+    __slots__ = ("source", "next_start")
+    
+    def __init__(self, source: str, start: int, end: int, next_start: int | None=None):
+        self.source: str = source
+        self.start: int = start
+        self.end: int = end
+        self.next_start: int = next_start if next_start is not None else end + 1
+        self.label: str | None = None
+        _TEXT_SLOT.__set__(self, None)
+        _NEXT_CHAR_SLOT.__set__(self, None)
+        
+    @classmethod
+    def from_offsets(cls, source: str, starts: list[int], ends: list[int]) -> "list[OffsetToken]":
+        """
+        Create the tokens of a text from their offsets.
+        
+        Every token's next character slice ends at the start of the next token, sharing its
+        int instead of allocating one, and the last token's after one character.
+        
+        Args:
+            source (str): The text the offsets refer to.
+            starts (list[int]): The start offsets of the tokens, in order.
+            ends (list[int]): The end offsets of the tokens.
+            
+        Returns:
+            list[OffsetToken]: The tokens.
+        """
+        
+        if not starts:
+            return []
+        next_starts = starts[1:]
+        next_starts.append(ends[-1] + 1)
+        return [cls(source, start, end, next_start) for start, end, next_start in zip(starts, ends, next_starts)]
+    
+    @property
+    def text(self) -> str:
+        text = _TEXT_SLOT.__get__(self)
+        return text if text is not None else self.source[self.start:self.end]
+    
+    @text.setter
+    def text(self, text: str | None) -> None:
+        _TEXT_SLOT.__set__(self, text)
+        
+    @property
+    def next_char(self) -> str:
+        next_char = _NEXT_CHAR_SLOT.__get__(self)
+        return next_char if next_char is not None else self.source[self.end:self.next_start]
+    
+    @next_char.setter
+    def next_char(self, next_char: str | None) -> None:
+        _NEXT_CHAR_SLOT.__set__(self, next_char)
+        
+    def __reduce__(self) -> tuple:
+        # Pickle the offsets and the shared source text, not sliced copies of it
+        return (_rebuild_offset_token, (self.source, self.start, self.end, self.next_start, self.label,
+                                        _TEXT_SLOT.__get__(self), _NEXT_CHAR_SLOT.__get__(self)))
+
+
+def _rebuild_offset_token(source: str, start: int, end: int, next_start: int, label: str | None,
+                          text: str | None, next_char: str | None) -> OffsetToken:
+    token = OffsetToken(source, start, end, next_start)
+    token.label = label
+    token.text = text
+    token.next_char = next_char
+    return token
@@ -0,0 +1,138 @@
+from __future__ import annotations
+from parselt.core.token import Token
+from typing import Iterable, Iterator, Sequence
+import numpy as np
+
+
+class TokenArray:
+    """
+    A columnar store of the tokens of a document.
+
+    Tokens are kept as start/end offset arrays and an array of interned label IDs, and
+    their text is sliced from the source text on access. Indexing and iterating return
+    `Token` views, so a `TokenArray` can be used wherever a list of tokens is expected,
+    while batch consumers can work on the arrays directly. Views are fresh objects:
+    changing a view does not change the array, use `set_labels` instead.
+
+    Attributes:
+        text (str): The text the offsets refer to.
+        starts (np.ndarray): The start offset of every token.
+        ends (np.ndarray): The end offset of every token.
+        label_ids (np.ndarray): The label ID of every token, -1 for unlabeled tokens.
+        labels (list[str]): The label vocabulary, indexed by label ID.
+    """
+
+    def __init__(self, text: str, starts: Sequence[int], ends: Sequence[int],
+                 label_ids: Sequence[int] | None=None, labels: list[str] | None=None) -> None:
+        self.text: str = text
+        self.starts: np.ndarray = np.asarray(starts, dtype=np.int64)
+        self.ends: np.ndarray = np.asarray(ends, dtype=np.int64)
+        if self.starts.shape != self.ends.shape:
+            raise ValueError("starts and ends must have the same length.")
+
+        self.labels: list[str] = list(labels) if labels is not None else []
+        self._label_lookup: dict[str, int] = {label: i for i, label in enumerate(self.labels)}
+        self.label_ids: np.ndarray = np.asarray(label_ids, dtype=np.int32) if label_ids is not None \
+            else np.full(len(self.starts), -1, dtype=np.int32)
+
+    @classmethod
+    def from_tokens(cls, tokens: Iterable[Token], text: str) -> TokenArray:
+        """
+        Build a token array from token objects.
+
+        Args:
+            tokens (Iterable[Token]): The tokens to store.
+            text (str): The text the token offsets refer to.
+
+        Returns:
+            TokenArray: The token array.
+        """
+
+        tokens = list(tokens)
+        array = cls(text, [token.start for token in tokens], [token.end for token in tokens])
+        if any(token.label is not None for token in tokens):
+            array.set_labels([token.label for token in tokens])
+        return array
+
+    def intern_label(self, label: str) -> int:
+        """
+        Returns the ID of a label, adding it to the vocabulary if needed.
+        """
+
+        label_id = self._label_lookup.get(label)
+        if label_id is None:
+            label_id = len(self.labels)
+            self.labels.append(label)
+            self._label_lookup[label] = label_id
+        return label_id
+
+    def set_labels(self, labels: Sequence[str | None]) -> None:
+        """
+        Set the label of every token.
+
+        Args:
+            labels (Sequence[str | None]): One label per token, None for unlabeled tokens.
+        """
+
+        if len(labels) != len(self):
+            raise ValueError(f"Expected {len(self)} labels, got {len(labels)}.")
+
+        intern = self.intern_label
+        self.label_ids = np.fromiter((-1 if label is None else intern(label) for label in labels),
+                                     dtype=np.int32, count=len(labels))
+
+    def label_of(self, index: int) -> str | None:
+        """
+        Returns the label of the token at the specified index.
+        """
+
+        label_id = self.label_ids[index]
+        return self.labels[label_id] if label_id >= 0 else None
+
+    def token_text(self, index: int) -> str:
+        """
+        Returns the text of the token at the specified index.
+        """
+
+        return self.text[self.starts[index]:self.ends[index]]
+
+    def to_tokens(self) -> list[Token]:
+        """
+        Materialize the array as a list of token objects.
+        """
+
+        return list(self)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __iter__(self) -> Iterator[Token]:
+        text = self.text
+        starts = self.starts.tolist()
+        ends = self.ends.tolist()
+        labels = [self.labels[i] if i >= 0 else None for i in self.label_ids.tolist()]
+        for i, (start, end) in enumerate(zip(starts, ends)):
+            next_char = text[end:starts[i + 1]] if i + 1 < len(starts) else text[end:end + 1]
+            token = Token(text=text[start:end], start=start, end=end, next_char=next_char)
+            token.label = labels[i]
+            yield token
+
+    def __getitem__(self, index: int | slice) -> Token | list[Token]:
+        """
+        Returns a view of the token at the specified index, or a list of views for a slice.
+        """
+
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("TokenArray index out of range")
+
+        start = int(self.starts[index])
+        end = int(self.ends[index])
+        next_end = int(self.starts[index + 1]) if index + 1 < len(self) else end + 1
+        token = Token(text=self.text[start:end], start=start, end=end, next_char=self.text[end:next_end])
+        token.label = self.label_of(index)
+        return token
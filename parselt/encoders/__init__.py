@@ -0,0 +1,10 @@
+from __future__ import annotations
+from .vocabulary import Vocabulary
+from .label_table import LabelTable
+from .document_encoder import DocumentEncoder, EncodedBatch
+
+__all__ = [
+    "Vocabulary",
+    "LabelTable",
+    "DocumentEncoder",
+    "EncodedBatch"]
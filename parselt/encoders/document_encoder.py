@@ -0,0 +1,186 @@
+from __future__ import annotations
+from parselt.core.token_array import TokenArray
+from parselt.encoders.label_table import LabelTable
+from parselt.encoders.vocabulary import Vocabulary, token_texts
+from dataclasses import dataclass
+from itertools import islice
+from typing import TYPE_CHECKING, Any, Generator, Iterable
+import numpy as np
+
+if TYPE_CHECKING:
+    from parselt.core.document import Document
+
+
+@dataclass
+class EncodedBatch:
+    """
+    A batch of encoded documents, padded to the length of the longest one.
+
+    Attributes:
+        document_ids (list[Any]): The ID of every document.
+        input_ids (np.ndarray): The token IDs, of shape (documents, length).
+        label_ids (np.ndarray | None): The label IDs, of shape (documents, length), or None without a label table.
+        attention_mask (np.ndarray): 1 for tokens and 0 for padding, of shape (documents, length).
+        offsets (np.ndarray): The start and end offset of every token in its document's text,
+            of shape (documents, length, 2). Padding has offsets (0, 0).
+        lengths (np.ndarray): The number of tokens of every document, after truncation.
+    """
+
+    document_ids: list[Any]
+    input_ids: np.ndarray
+    label_ids: np.ndarray | None
+    attention_mask: np.ndarray
+    offsets: np.ndarray
+    lengths: np.ndarray
+
+    @property
+    def padding_ratio(self) -> float:
+        """
+        Returns the fraction of the batch that is padding.
+        """
+
+        return 1 - self.attention_mask.mean() if self.attention_mask.size else 0.0
+
+    def __len__(self) -> int:
+        return len(self.document_ids)
+
+
+class DocumentEncoder:
+    """
+    Encodes tokenized documents into padded NumPy arrays of token IDs, label IDs, attention masks and offsets.
+
+    Every document is encoded into flat arrays with bulk lookups, and a batch is padded
+    with a single masked assignment per array, so no Python loop runs per token.
+
+    Args:
+        vocabulary (Vocabulary): The vocabulary mapping token texts to IDs.
+        label_table (LabelTable | None): The table mapping token labels to IDs, if labels are encoded.
+        max_length (int | None): The maximum number of tokens per document. Longer documents are truncated.
+        label_pad_id (int): The label ID of padding.
+        pad_to_multiple_of (int | None): Round the padded length up to a multiple of this.
+    """
+
+    def __init__(self, vocabulary: Vocabulary,
+                 label_table: LabelTable | None = None,
+                 max_length: int | None = None,
+                 label_pad_id: int = -100,
+                 pad_to_multiple_of: int | None = None) -> None:
+        if max_length is not None and max_length < 1:
+            raise ValueError("max_length must be at least 1.")
+        self.vocabulary = vocabulary
+        self.label_table = label_table
+        self.max_length = max_length
+        self.label_pad_id = label_pad_id
+        self.pad_to_multiple_of = pad_to_multiple_of
+
+    def encode_document(self, document: Document) -> tuple[np.ndarray, np.ndarray | None, np.ndarray]:
+        """
+        Encode the tokens of a document into unpadded arrays.
+
+        Args:
+            document (Document): The tokenized document.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray | None, np.ndarray]: The token IDs, the label IDs (None
+                without a label table) and the offsets, of shape (tokens, 2).
+        """
+
+        tokens = document.tokens
+        if self.max_length is not None and len(tokens) > self.max_length:
+            tokens = self._truncate(tokens, self.max_length)
+
+        input_ids = self.vocabulary.encode(token_texts(tokens))
+        label_ids = self.label_table.encode_tokens(tokens) if self.label_table is not None else None
+        if isinstance(tokens, TokenArray):
+            offsets = np.stack((tokens.starts, tokens.ends), axis=1)
+        else:
+            offsets = np.array([(token.start, token.end) for token in tokens], dtype=np.int64).reshape(-1, 2)
+        return input_ids, label_ids, offsets
+
+    @staticmethod
+    def _truncate(tokens, length: int):
+        if isinstance(tokens, TokenArray):
+            return TokenArray(tokens.text, tokens.starts[:length], tokens.ends[:length],
+                              tokens.label_ids[:length], tokens.labels)
+        return tokens[:length]
+
+    def encode(self, documents: Iterable[Document]) -> EncodedBatch:
+        """
+        Encode documents into one padded batch.
+
+        Args:
+            documents (Iterable[Document]): The tokenized documents.
+
+        Returns:
+            EncodedBatch: The batch.
+        """
+
+        documents = list(documents)
+        return self._pad([document.id for document in documents],
+                         [self.encode_document(document) for document in documents])
+
+    def batches(self, documents: Iterable[Document],
+                batch_size: int,
+                bucket_size: int | None = None,
+                shuffle: bool = False,
+                seed: int | None = None) -> Generator[EncodedBatch, None, None]:
+        """
+        Lazily encode documents into padded batches, grouping documents of similar length.
+
+        Documents are read in pools of `bucket_size` documents. Each pool is sorted by length
+        and split into batches, so documents in a batch have similar lengths and little
+        padding is needed.
+
+        Args:
+            documents (Iterable[Document]): The tokenized documents.
+            batch_size (int): The number of documents per batch.
+            bucket_size (int | None): The number of documents sorted together. Defaults to 50
+                batches; 1 batch keeps the input order.
+            shuffle (bool): Whether to shuffle the order of the batches within a pool.
+            seed (int | None): The seed of the shuffle.
+
+        Yields:
+            EncodedBatch: The batches.
+        """
+
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1.")
+        bucket_size = bucket_size if bucket_size is not None else batch_size * 50
+        rng = np.random.default_rng(seed)
+        iterator = iter(documents)
+
+        while pool := list(islice(iterator, bucket_size)):
+            ids = [document.id for document in pool]
+            encoded = [self.encode_document(document) for document in pool]
+            order = np.argsort([len(input_ids) for input_ids, _, _ in encoded], kind="stable")
+            batches = [order[i:i + batch_size] for i in range(0, len(order), batch_size)]
+            if shuffle:
+                rng.shuffle(batches)
+            for batch in batches:
+                yield self._pad([ids[i] for i in batch], [encoded[i] for i in batch])
+
+    def _pad(self, document_ids: list[Any],
+             encoded: list[tuple[np.ndarray, np.ndarray | None, np.ndarray]]) -> EncodedBatch:
+        """
+        Pad encoded documents into a batch.
+        """
+
+        lengths = np.array([len(input_ids) for input_ids, _, _ in encoded], dtype=np.int64)
+        length = int(lengths.max()) if len(lengths) else 0
+        if self.pad_to_multiple_of:
+            length = -(-length // self.pad_to_multiple_of) * self.pad_to_multiple_of
+        mask = np.arange(length) < lengths[:, None]
+
+        input_ids = np.full((len(encoded), length), self.vocabulary.pad_id, dtype=np.int64)
+        offsets = np.zeros((len(encoded), length, 2), dtype=np.int64)
+        if encoded:
+            input_ids[mask] = np.concatenate([ids for ids, _, _ in encoded])
+            offsets[mask] = np.concatenate([document_offsets for _, _, document_offsets in encoded])
+        label_ids = None
+        if self.label_table is not None:
+            label_ids = np.full((len(encoded), length), self.label_pad_id, dtype=np.int64)
+            if encoded:
+                label_ids[mask] = np.concatenate([labels for _, labels, _ in encoded])
+
+        return EncodedBatch(document_ids=document_ids, input_ids=input_ids, label_ids=label_ids,
+                            attention_mask=mask.astype(np.int8), offsets=offsets, lengths=lengths)
@@ -0,0 +1,116 @@
+from __future__ import annotations
+from parselt.core.token_array import TokenArray
+from typing import TYPE_CHECKING, Iterable, Sequence
+import numpy as np
+
+if TYPE_CHECKING:
+    from parselt.core.document import Document
+
+
+class LabelTable:
+    """
+    A fixed mapping between token labels and integer IDs.
+
+    The outside label always gets ID 0. With BIO labeling every entity label gets a
+    "B-" and an "I-" label, in the order of the entity labels.
+
+    Args:
+        entity_labels (Iterable[str]): The entity labels.
+        default_label (str): The label of tokens outside of any entity.
+        use_bio_labeling (bool): Whether tokens have BIO labels.
+    """
+
+    def __init__(self, entity_labels: Iterable[str],
+                 default_label: str = "O",
+                 use_bio_labeling: bool = False) -> None:
+        self.entity_labels: list[str] = list(dict.fromkeys(entity_labels))
+        self.default_label = default_label
+        self.use_bio_labeling = use_bio_labeling
+
+        self.labels: list[str] = [default_label]
+        for label in self.entity_labels:
+            if use_bio_labeling:
+                self.labels.extend((f"B-{label}", f"I-{label}"))
+            elif label != default_label:
+                self.labels.append(label)
+        self._ids: dict[str, int] = {label: i for i, label in enumerate(self.labels)}
+
+    @classmethod
+    def from_documents(cls, documents: Iterable[Document], **kwargs) -> LabelTable:
+        """
+        Build a label table from the entity labels of documents, in sorted order.
+
+        A `Corpus` can be passed as well, its label vocabulary is used without visiting the entities.
+
+        Args:
+            documents (Iterable[Document]): The documents.
+            **kwargs: Passed on to the constructor.
+
+        Returns:
+            LabelTable: The label table.
+        """
+
+        if hasattr(documents, "entity_labels"):
+            labels = documents.entity_labels()
+        else:
+            labels = set()
+            for document in documents:
+                labels.update(document.entity_labels())
+        return cls(sorted(labels), **kwargs)
+
+    def id_of(self, label: str) -> int:
+        """
+        Returns the ID of a label.
+
+        Raises:
+            ValueError: If the label is not in the table.
+        """
+
+        label_id = self._ids.get(label)
+        if label_id is None:
+            raise ValueError(f"Unknown label {label!r}.")
+        return label_id
+
+    def encode(self, labels: Sequence[str | None]) -> np.ndarray:
+        """
+        Returns the ID of every label. Unlabeled tokens get the outside label.
+
+        Args:
+            labels (Sequence[str | None]): The token labels.
+
+        Returns:
+            np.ndarray: The label IDs.
+        """
+
+        ids = self._ids
+        try:
+            return np.fromiter((0 if label is None else ids[label] for label in labels),
+                               dtype=np.int64, count=len(labels))
+        except KeyError as error:
+            raise ValueError(f"Unknown label {error.args[0]!r}.") from None
+
+    def encode_tokens(self, tokens: Sequence) -> np.ndarray:
+        """
+        Returns the label ID of every token of a list of tokens or a TokenArray.
+
+        The label IDs of a TokenArray are translated with one array lookup.
+        """
+
+        if isinstance(tokens, TokenArray):
+            # Position 0 of the translation table is for unlabeled tokens (label ID -1)
+            table = np.concatenate(([0], self.encode(tokens.labels)))
+            return table[tokens.label_ids.astype(np.int64) + 1]
+        return self.encode([token.label for token in tokens])
+
+    def decode(self, ids: Iterable[int]) -> list[str]:
+        """
+        Returns the label of every ID.
+        """
+
+        return [self.labels[label_id] for label_id in ids]
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def __contains__(self, label: str) -> bool:
+        return label in self._ids
@@ -0,0 +1,147 @@
+from __future__ import annotations
+from parselt.core.token_array import TokenArray
+from collections import Counter
+from itertools import repeat
+from typing import TYPE_CHECKING, Iterable, Sequence
+import json
+import numpy as np
+
+if TYPE_CHECKING:
+    from parselt.core.document import Document
+
+
+class Vocabulary:
+    """
+    A mapping between token texts and integer IDs.
+
+    The padding and unknown tokens always get IDs 0 and 1. Encoding looks up all texts
+    with a single `map` over the vocabulary dictionary, so no Python loop runs per token.
+
+    Args:
+        tokens (Iterable[str]): The tokens of the vocabulary, after the special tokens.
+        pad_token (str): The token used for padding.
+        unk_token (str): The token replacing texts missing from the vocabulary.
+        lower (bool): Whether texts are lowercased before lookup.
+    """
+
+    def __init__(self, tokens: Iterable[str] = (),
+                 pad_token: str = "[PAD]",
+                 unk_token: str = "[UNK]",
+                 lower: bool = False) -> None:
+        self.pad_token = pad_token
+        self.unk_token = unk_token
+        self.lower = lower
+        self.tokens: list[str] = []
+        self._ids: dict[str, int] = {}
+        for token in (pad_token, unk_token, *tokens):
+            self.add(token)
+
+    @property
+    def pad_id(self) -> int:
+        return self._ids[self.pad_token]
+
+    @property
+    def unk_id(self) -> int:
+        return self._ids[self.unk_token]
+
+    @classmethod
+    def build(cls, documents: Iterable[Document],
+              min_count: int = 1,
+              max_size: int | None = None,
+              **kwargs) -> Vocabulary:
+        """
+        Build a vocabulary from the tokens of tokenized documents, most frequent first.
+
+        Args:
+            documents (Iterable[Document]): The tokenized documents.
+            min_count (int): The minimum number of occurrences of a token to be included.
+            max_size (int | None): The maximum number of tokens, not counting the special tokens.
+            **kwargs: Passed on to the constructor.
+
+        Returns:
+            Vocabulary: The vocabulary.
+        """
+
+        vocabulary = cls(**kwargs)
+        counts = Counter()
+        for document in documents:
+            counts.update(vocabulary._normalize(token_texts(document.tokens)))
+        ranked = sorted((token for token, count in counts.items() if count >= min_count),
+                        key=lambda token: (-counts[token], token))
+        for token in ranked[:max_size]:
+            vocabulary.add(token)
+        return vocabulary
+
+    def add(self, token: str) -> int:
+        """
+        Returns the ID of a token, adding it to the vocabulary if needed.
+        """
+
+        token_id = self._ids.get(token)
+        if token_id is None:
+            token_id = self._ids[token] = len(self.tokens)
+            self.tokens.append(token)
+        return token_id
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Returns the ID of every text, the unknown token ID for texts missing from the vocabulary.
+
+        Args:
+            texts (Sequence[str]): The token texts.
+
+        Returns:
+            np.ndarray: The token IDs.
+        """
+
+        return np.fromiter(map(self._ids.get, self._normalize(texts), repeat(self.unk_id)),
+                           dtype=np.int64, count=len(texts))
+
+    def decode(self, ids: Iterable[int]) -> list[str]:
+        """
+        Returns the token of every ID.
+        """
+
+        return [self.tokens[token_id] for token_id in ids]
+
+    def _normalize(self, texts: Iterable[str]) -> Iterable[str]:
+        return map(str.lower, texts) if self.lower else texts
+
+    def save(self, path: str) -> None:
+        """
+        Save the vocabulary as JSON.
+        """
+
+        with open(path, "w", encoding="utf-8") as vocabulary_file:
+            json.dump({"pad_token": self.pad_token, "unk_token": self.unk_token,
+                       "lower": self.lower, "tokens": self.tokens}, vocabulary_file)
+
+    @classmethod
+    def load(cls, path: str) -> Vocabulary:
+        """
+        Load a vocabulary saved with `save`.
+        """
+
+        with open(path, "r", encoding="utf-8") as vocabulary_file:
+            data = json.load(vocabulary_file)
+        return cls(data["tokens"], pad_token=data["pad_token"], unk_token=data["unk_token"], lower=data["lower"])
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def __contains__(self, token: str) -> bool:
+        return token in self._ids
+
+    def __getitem__(self, token: str) -> int:
+        return self._ids.get(token.lower() if self.lower else token, self.unk_id)
+
+
+def token_texts(tokens: Sequence) -> list[str]:
+    """
+    Returns the text of every token of a list of tokens or a TokenArray.
+    """
+
+    if isinstance(tokens, TokenArray):
+        text = tokens.text
+        return [text[start:end] for start, end in zip(tokens.starts.tolist(), tokens.ends.tolist())]
+    return [token.text for token in tokens]
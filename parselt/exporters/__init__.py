@@ -0,0 +1,11 @@
+from __future__ import annotations
+from .base_exporter import BaseExporter
+from .brat_exporter import BratExporter
+from .json_exporter import JSONExporter
+from .conll_exporter import CoNLLExporter
+
+__all__ = [
+    "BaseExporter",
+    "BratExporter",
+    "JSONExporter",
+    "CoNLLExporter"]
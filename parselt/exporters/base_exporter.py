@@ -0,0 +1,112 @@
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from parselt.utils.parallel import parallel_map
+from functools import partial
+from typing import TYPE_CHECKING, Iterable
+import os
+
+if TYPE_CHECKING:
+    from parselt.core.document import Document
+
+
+class BaseExporter(ABC):
+    """
+    Abstract base class for writing documents to files.
+
+    Exporters either write every document to its own file(s) in a directory, or, when
+    `single_file` is True, stream all documents into one file. Documents are formatted
+    with `format_document`, which only builds a string, so formatting can be fanned out
+    over a process pool while the calling process writes the results in order.
+
+    Args:
+        buffer_size (int): The size in bytes of the write buffer of every output file.
+    """
+
+    extension: str = ""
+    single_file: bool = False
+
+    def __init__(self, buffer_size: int = 1 << 20) -> None:
+        self.buffer_size = buffer_size
+
+    @abstractmethod
+    def format_document(self, document: Document) -> str:
+        """
+        Format a single document.
+
+        Args:
+            document (Document): The document to format.
+
+        Returns:
+            str: The formatted document.
+        """
+
+        pass
+
+    def export(self, documents: Iterable[Document], path: str,
+               workers: int | None = None,
+               chunksize: int = 16) -> int:
+        """
+        Write documents to a directory, or to a single file if the exporter has `single_file` set.
+
+        Documents are consumed lazily, so a whole corpus never has to be in memory.
+
+        Args:
+            documents (Iterable[Document]): The documents to write.
+            path (str): The output directory, or the output file for single file exporters.
+                Missing directories are created.
+            workers (int | None): The number of worker processes formatting, and for per-document
+                files writing, the documents. None or 1 runs serially. The exporter and the
+                documents are pickled and sent to the workers.
+            chunksize (int): The number of documents sent to a worker at once.
+
+        Returns:
+            int: The number of documents written.
+        """
+
+        written = 0
+        if self.single_file:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with self.open(path) as output_file:
+                for _, formatted, error in parallel_map(self.format_document, documents, workers=workers,
+                                                        ordered=True, chunksize=chunksize):
+                    if error is not None:
+                        raise error
+                    output_file.write(formatted)
+                    written += 1
+            return written
+
+        os.makedirs(path, exist_ok=True)
+        for _, _, error in parallel_map(partial(self.write_document, directory=path), documents,
+                                        workers=workers, ordered=False, chunksize=chunksize):
+            if error is not None:
+                raise error
+            written += 1
+        return written
+
+    def write_document(self, document: Document, directory: str) -> list[str]:
+        """
+        Write a single document to its own file(s) in a directory.
+
+        Args:
+            document (Document): The document to write.
+            directory (str): The output directory.
+
+        Returns:
+            list[str]: The paths of the written files.
+        """
+
+        path = os.path.join(directory, f"{document.id}{self.extension}")
+        # IDs of documents from recursive scans contain subdirectories, e.g. "train/sample1"
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self.open(path) as output_file:
+            output_file.write(self.format_document(document))
+        return [path]
+
+    def open(self, path: str):
+        """
+        Open an output file for buffered text writing.
+        """
+
+        return open(path, "w", encoding="utf-8", newline="", buffering=self.buffer_size)
@@ -0,0 +1,54 @@
+from __future__ import annotations
+from parselt.exporters.base_exporter import BaseExporter
+from typing import TYPE_CHECKING
+import os
+
+if TYPE_CHECKING:
+    from parselt.core.document import Document
+
+
+class BratExporter(BaseExporter):
+    """
+    Writes documents in the BRAT format: a ".ann" file with the entities and relations and
+    a ".txt" file with the text, per document. BRAT has no token annotations, so token
+    labels are not written.
+
+    Args:
+        text_dir (str | None): Optional directory for the text files. If None, they are written next to the ".ann" files.
+        buffer_size (int): The size in bytes of the write buffer of every output file.
+    """
+
+    extension: str = ".ann"
+
+    def __init__(self, text_dir: str | None = None, buffer_size: int = 1 << 20) -> None:
+        super().__init__(buffer_size)
+        self.text_dir = text_dir
+
+    def format_document(self, document: Document) -> str:
+        """
+        Format the annotations of a document as the content of a ".ann" file.
+        """
+
+        entities = sorted((interval.data for interval in document.entities),
+                          key=lambda entity: (entity.start, entity.end, str(entity.entity_id)))
+        lines = [f"T{entity.entity_id}\t{entity.label} {entity.start} {entity.end}\t{_single_line(entity.text)}\n"
+                 for entity in entities]
+        lines.extend(f"{relation}\n" for relation in document.relations)
+        return "".join(lines)
+
+    def write_document(self, document: Document, directory: str) -> list[str]:
+        ann_path, = super().write_document(document, directory)
+        text_dir = self.text_dir if self.text_dir is not None else directory
+        text_path = os.path.join(text_dir, f"{document.id}.txt")
+        os.makedirs(os.path.dirname(text_path), exist_ok=True)
+        with self.open(text_path) as text_file:
+            text_file.write(document.text)
+        return [ann_path, text_path]
+
+
+def _single_line(text: str) -> str:
+    """
+    Replace the line breaks of an entity text, which would break the line based ".ann" format.
+    """
+
+    return text.replace("\r", " ").replace("\n", " ") if "\n" in text or "\r" in text else text
@@ -0,0 +1,132 @@
+from __future__ import annotations
+from parselt.core.token_array import TokenArray
+from parselt.exporters.base_exporter import BaseExporter
+from typing import TYPE_CHECKING
+import re
+
+if TYPE_CHECKING:
+    from parselt.chunkers.base_chunker import BaseChunker
+    from parselt.core.document import Document
+
+
+class CoNLLExporter(BaseExporter):
+    """
+    Writes the labeled tokens of documents in the CoNLL format to a single file.
+
+    Every token is a line of whitespace separated columns: the token text, optionally its
+    start and end offsets, and its label. Documents start with a "-DOCSTART-" line,
+    followed by the document ID when `include_ids` is set, and sentences, if a chunker is
+    given, are separated by blank lines.
+
+    Args:
+        scheme (str): "bio" to write IOB2 labels, adding "B-"/"I-" prefixes to plain labels and
+            converting BIOES "S-"/"E-" prefixes, or "none" to write the labels as stored.
+        default_label (str): The label of tokens outside of any entity.
+        include_offsets (bool): Whether to write the token offsets as extra columns.
+        include_ids (bool): Whether to write the document ID on the "-DOCSTART-" line.
+        sentence_chunker (BaseChunker | None): Splits documents into sentences, separated by blank lines.
+        separator (str): The column separator.
+        buffer_size (int): The size in bytes of the write buffer of the output file.
+    """
+
+    extension: str = ".conll"
+    single_file: bool = True
+
+    def __init__(self, scheme: str = "bio",
+                 default_label: str = "O",
+                 include_offsets: bool = False,
+                 include_ids: bool = False,
+                 sentence_chunker: BaseChunker | None = None,
+                 separator: str = " ",
+                 buffer_size: int = 1 << 20) -> None:
+        super().__init__(buffer_size)
+        if scheme not in ("bio", "none"):
+            raise ValueError(f"Unknown scheme {scheme!r}, expected 'bio' or 'none'.")
+        self.scheme = scheme
+        self.default_label = default_label
+        self.include_offsets = include_offsets
+        self.include_ids = include_ids
+        self.sentence_chunker = sentence_chunker
+        self.separator = separator
+
+    def format_document(self, document: Document) -> str:
+        """
+        Format the tokens of a document as CoNLL lines.
+
+        Raises:
+            ValueError: If the document is not tokenized.
+        """
+
+        tokens = document.tokens
+        if not len(tokens):
+            raise ValueError(f"Document {document.id!r} is not tokenized.")
+
+        if isinstance(tokens, TokenArray):
+            starts, ends = tokens.starts.tolist(), tokens.ends.tolist()
+            text = tokens.text
+            texts = [text[start:end] for start, end in zip(starts, ends)]
+            labels = [tokens.labels[i] if i >= 0 else None for i in tokens.label_ids.tolist()]
+        else:
+            starts = [token.start for token in tokens]
+            ends = [token.end for token in tokens]
+            texts = [token.text for token in tokens]
+            labels = [token.label for token in tokens]
+
+        default_label = self.default_label
+        labels = [label if label is not None else default_label for label in labels]
+        if self.scheme == "bio":
+            labels = self._to_bio(labels)
+        texts = [_single_field(text) for text in texts]
+
+        separator = self.separator
+        if self.include_offsets:
+            lines = [f"{text}{separator}{start}{separator}{end}{separator}{label}\n"
+                     for text, start, end, label in zip(texts, starts, ends, labels)]
+        else:
+            lines = [f"{text}{separator}{label}\n" for text, label in zip(texts, labels)]
+
+        if self.sentence_chunker is not None:
+            # Insert a blank line after every sentence but the last, back to front so indexes stay valid
+            sentence_ends = [chunk.token_end for chunk in self.sentence_chunker.chunk(document)][:-1]
+            for sentence_end in reversed(sentence_ends):
+                lines.insert(sentence_end, "\n")
+
+        header = f"-DOCSTART-{separator}{document.id}\n\n" if self.include_ids else f"-DOCSTART-{separator}{default_label}\n\n"
+        return header + "".join(lines) + "\n"
+
+    def _to_bio(self, labels: list[str]) -> list[str]:
+        """
+        Prefix plain labels with "B-" at the start of a run of the same label and "I-" inside it.
+        Labels with a "B-" or "I-" prefix are kept, and the BIOES "S-" and "E-" prefixes become
+        "B-" and "I-".
+        """
+
+        default_label = self.default_label
+        bio_labels = []
+        previous = default_label
+        for label in labels:
+            if label == default_label or label[:2] in ("B-", "I-"):
+                bio_labels.append(label)
+            elif label[:2] in _BIOES_PREFIXES:
+                bio_labels.append(_BIOES_PREFIXES[label[:2]] + label[2:])
+            else:
+                bio_labels.append(f"I-{label}" if label == previous else f"B-{label}")
+            previous = label
+        return bio_labels
+
+
+# The IOB2 prefixes of the BIOES prefixes that IOB2 does not have
+_BIOES_PREFIXES = {"S-": "B-", "E-": "I-"}
+
+
+def _single_field(text: str) -> str:
+    """
+    Replace whitespace inside a token text, which would break the column format.
+    """
+
+    if not text:
+        return "_"
+    return "_".join(text.split()) if _WHITESPACE.search(text) else text
+
+
+_WHITESPACE = re.compile(r"\s")
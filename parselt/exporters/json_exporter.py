@@ -0,0 +1,119 @@
+from __future__ import annotations
+from parselt.core.token_array import TokenArray
+from parselt.exporters.base_exporter import BaseExporter
+from parselt.loaders.json_loader import JSONAnnotationSchema
+from json.encoder import encode_basestring
+from typing import TYPE_CHECKING, Any
+import json
+
+if TYPE_CHECKING:
+    from parselt.core.document import Document
+
+
+class JSONExporter(BaseExporter):
+    """
+    Writes documents as JSON following a `JSONAnnotationSchema`, readable by `JSONLoader`.
+
+    Every document gets its own ".json" file, or with `lines` every document is one line
+    of a single JSON Lines file.
+
+    Args:
+        custom_schema (JSONAnnotationSchema | None): The schema of the written JSON. Defaults to `JSONAnnotationSchema`.
+        lines (bool): Whether to write a single JSON Lines file.
+        include_tokens (bool): Whether to write the tokens of tokenized documents, with their labels.
+        indent (int | None): The indentation of ".json" files. JSON Lines are never indented.
+        buffer_size (int): The size in bytes of the write buffer of every output file.
+    """
+
+    extension: str = ".json"
+
+    def __init__(self, custom_schema: JSONAnnotationSchema | None = None,
+                 lines: bool = False,
+                 include_tokens: bool = True,
+                 indent: int | None = None,
+                 buffer_size: int = 1 << 20) -> None:
+        super().__init__(buffer_size)
+        self.schema: JSONAnnotationSchema = custom_schema if custom_schema is not None else JSONAnnotationSchema()
+        self.lines = lines
+        self.include_tokens = include_tokens
+        self.indent = indent
+
+    @property
+    def single_file(self) -> bool:
+        return self.lines
+
+    def format_document(self, document: Document) -> str:
+        if self.indent is not None and not self.lines:
+            return json.dumps(self.to_json(document), ensure_ascii=False, indent=self.indent)
+        
+        formatted = json.dumps(self.to_json(document, include_tokens=False), ensure_ascii=False)
+        if self.include_tokens and len(document.tokens):
+            # Tokens are the bulk of the output, so they are formatted directly instead of as a dict per token
+            formatted = f"{formatted[:-1]}, {encode_basestring(self.schema.token_key)}: [{self._format_tokens(document)}]}}"
+        return formatted + "\n" if self.lines else formatted
+
+    def to_json(self, document: Document, include_tokens: bool | None = None) -> dict[str, Any]:
+        """
+        Convert a document to a JSON-serializable dictionary following the schema.
+
+        Args:
+            document (Document): The document to convert.
+            include_tokens (bool | None): Whether to include the tokens. Defaults to `include_tokens` of the exporter.
+
+        Returns:
+            dict[str, Any]: The JSON object.
+        """
+
+        schema = self.schema
+        entity_fields = schema.entity_fields
+        relationship_fields = schema.relationship_fields
+        entities = sorted((interval.data for interval in document.entities),
+                          key=lambda entity: (entity.start, entity.end, str(entity.entity_id)))
+
+        data = {
+            schema.file_key: f"{document.id}{self.extension}",
+            schema.text_key: document.text,
+            schema.entity_key: [{entity_fields["id"]: entity.entity_id,
+                                 entity_fields["label"]: entity.label,
+                                 entity_fields["text"]: entity.text,
+                                 entity_fields["start"]: entity.start,
+                                 entity_fields["end"]: entity.end} for entity in entities],
+            schema.relationship_key: [{relationship_fields["id"]: relation.id,
+                                       relationship_fields["type"]: relation.label,
+                                       relationship_fields["arg1"]: relation.arg_1.entity_id,
+                                       relationship_fields["arg2"]: relation.arg_2.entity_id}
+                                      for relation in document.relations],
+        }
+        include_tokens = include_tokens if include_tokens is not None else self.include_tokens
+        if include_tokens and len(document.tokens):
+            fields = self.schema.token_fields
+            keys = (fields["text"], fields["start"], fields["end"], fields["label"])
+            data[schema.token_key] = [dict(zip(keys, row)) for row in zip(*_token_columns(document))]
+        return data
+
+    def _format_tokens(self, document: Document) -> str:
+        """
+        Format the tokens of a document as the comma separated JSON objects of a JSON array.
+        """
+
+        fields = self.schema.token_fields
+        text_key, start_key, end_key, label_key = (encode_basestring(fields[field]) for field in ("text", "start", "end", "label"))
+        texts, starts, ends, labels = _token_columns(document)
+        encoded_labels = {label: encode_basestring(label) if label is not None else "null" for label in set(labels)}
+        return ", ".join([f"{{{text_key}: {text}, {start_key}: {start}, {end_key}: {end}, {label_key}: {encoded_labels[label]}}}"
+                          for text, start, end, label in zip(map(encode_basestring, texts), starts, ends, labels)])
+
+
+def _token_columns(document: Document) -> tuple[list[str], list[int], list[int], list[str | None]]:
+    """
+    Returns the texts, starts, ends and labels of the tokens of a document, read straight from the arrays of a TokenArray.
+    """
+
+    tokens = document.tokens
+    if isinstance(tokens, TokenArray):
+        text = tokens.text
+        starts, ends = tokens.starts.tolist(), tokens.ends.tolist()
+        labels = [tokens.labels[i] if i >= 0 else None for i in tokens.label_ids.tolist()]
+        return [text[start:end] for start, end in zip(starts, ends)], starts, ends, labels
+    return ([token.text for token in tokens], [token.start for token in tokens],
+            [token.end for token in tokens], [token.label for token in tokens])
@@ -1,10 +1,17 @@
 from __future__ import annotations
 from .brat_loader import BratLoader
 from .json_loader import JSONLoader, JSONAnnotationSchema
+from .conll_loader import CoNLLLoader
 from .base_loader import BaseLoader
+from .corpus_cache import CorpusCache
+from .corpus_manifest import CorpusManifest, ManifestChanges
 
 __all__ = [
     "BaseLoader",
+    "CorpusCache",
+    "CorpusManifest",
+    "ManifestChanges",
     "BratLoader",
     "JSONLoader",
+    "CoNLLLoader",
     "JSONAnnotationSchema"]
\ No newline at end of file
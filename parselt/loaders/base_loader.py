@@ -1,14 +1,28 @@
+from __future__ import annotations
 from abc import ABC, abstractmethod
 from parselt.core.document import Document
-from typing import Generator
-import os
+from parselt.utils.files import scan_directory
+from parselt.utils.instrumentation import count
+from parselt.utils.parallel import parallel_map
+from typing import TYPE_CHECKING, Callable, Generator, Iterable
 from pathlib import Path
+import os
+
+if TYPE_CHECKING:
+    from parselt.loaders.corpus_cache import CorpusCache
+    from parselt.loaders.corpus_manifest import CorpusManifest
 
 class BaseLoader(ABC):
     """
     Abstract base class for loading documents from files.
+    
+    Attributes:
+        extensions (tuple[str, ...]): The extensions of the document files listed when loading a
+            directory. Empty lists every file.
     """
     
+    extensions: tuple[str, ...] = ()
+    
     @abstractmethod
     def load_file(self, document_path: str) -> Document | None:
         """
@@ -23,12 +37,86 @@ class BaseLoader(ABC):
         
         pass
     
-    def load_directory(self, directory_path: str) -> Generator[Document, None, None]:
+    def iter_file(self, document_path: str) -> Generator[Document, None, None]:
+        """
+        Lazily load the documents of a single file.
+        
+        Loaders whose files can hold many documents override this to stream them
+        instead of building the whole list in memory.
+        
+        Args:
+            document_path (str): The path to the document file.
+            
+        Yields:
+            Document: The loaded document.
+        """
+        
+        yield from self._as_documents(self.load_file(document_path))
+    
+    def load_handle(self, document_path: str) -> Document | list[Document] | None:
+        """
+        Create lazy handles to the documents of a file, whose text and annotations are loaded on first access.
+        
+        Loaders that can read the ID of a document without parsing it return `LazyDocument`s.
+        By default the documents are loaded eagerly with `load_file`.
+        
+        Args:
+            document_path (str): The path to the document file.
+            
+        Returns:
+            Document | list[Document] | None: The document handle or handles, or None if the file could not be loaded.
+        """
+        
+        return self.load_file(document_path)
+    
+    def load_directory(self, directory_path: str,
+                       workers: int | None = None,
+                       ordered: bool = True,
+                       chunksize: int = 1,
+                       on_error: Callable[[str, Exception], None] | None = None,
+                       cache: CorpusCache | None = None,
+                       lazy: bool = False,
+                       manifest: CorpusManifest | None = None,
+                       recursive: bool = False,
+                       extensions: tuple[str, ...] | None = None,
+                       pattern: str | None = None,
+                       shard_index: int = 0,
+                       num_shards: int = 1) -> Generator[Document, None, None]:
         """
         Lazily load documents from a directory.
         
+        Files are streamed through `iter_file` when loading serially. When `workers` is greater
+        than 1, `load_file` is fanned out over a process pool instead. The loader is pickled
+        and sent to the workers, so subclasses must be picklable.
+        
         Args:
             directory_path (str): The path to the directory containing document files.
+            workers (int | None): The number of worker processes. None or 1 loads serially.
+            ordered (bool): Whether to yield documents in directory order, or as soon as they are loaded.
+            chunksize (int): The number of files sent to a worker at once.
+            on_error (Callable[[str, Exception], None] | None): Called with the file path and the
+                exception when a file fails to load, after which the scan continues. If None, the
+                exception is raised.
+            cache (CorpusCache | None): A corpus cache to read the documents from when it is valid for
+                the current source files. Otherwise the documents are loaded and the cache is rebuilt.
+            lazy (bool): Whether to yield lazy handles from `load_handle` instead of loading every
+                document, so filtering or sampling a corpus only costs metadata I/O. Cannot be
+                combined with `cache` or `workers`.
+            manifest (CorpusManifest | None): A corpus manifest to reload incrementally: only added and
+                changed files are loaded, and the previously loaded documents of the other files are
+                reused. The changes are available from `manifest.last_changes`. Cannot be combined
+                with `cache` or `lazy`.
+            recursive (bool): Whether to load the files of subdirectories as well. The IDs of documents
+                loaded from a subdirectory are prefixed with its path relative to `directory_path`,
+                e.g. "train/sample1", so files with the same name in different subdirectories keep
+                distinct IDs. Documents in `directory_path` itself keep the IDs given by the loader.
+            extensions (tuple[str, ...] | None): Only load files with these extensions. Defaults to
+                the loader's `extensions`.
+            pattern (str | None): Only load files whose path relative to the directory matches this
+                glob pattern, see `parselt.utils.files.scan_directory`.
+            shard_index (int): The shard of the directory to load, so `num_shards` jobs can each load
+                a disjoint part of a corpus. Files are assigned by a hash of their relative path.
+            num_shards (int): The number of shards the files are split into.
             
         Yields:
             Document: The loaded document.
@@ -38,13 +126,163 @@ class BaseLoader(ABC):
         if not path.is_dir():
             raise ValueError(f"{directory_path} is not a directory.")
         
-        for file in os.listdir(path):
-            file_path = os.path.join(directory_path, file)
-            if os.path.isfile(file_path):
-                document = self.load_file(file_path)
-                if document:
-                    yield document
+        file_paths = self.list_files(directory_path, recursive=recursive, extensions=extensions,
+                                     pattern=pattern, shard_index=shard_index, num_shards=num_shards)
+        if manifest is not None:
+            if cache is not None or lazy:
+                raise ValueError("a manifest cannot be combined with a cache or lazy loading.")
+            manifest.refresh(self, directory_path, workers=workers, ordered=ordered,
+                             chunksize=chunksize, on_error=on_error, file_paths=file_paths)
+            yield from self._scope_ids(manifest.documents(), directory_path, recursive)
+            return
+        
+        if lazy:
+            if cache is not None or (workers is not None and workers > 1):
+                raise ValueError("lazy loading cannot be combined with a cache or workers.")
+            for file_path in file_paths:
+                try:
+                    handles = self._as_documents(self.load_handle(file_path))
+                except Exception as error:
+                    if on_error is None:
+                        raise
+                    on_error(file_path, error)
+                    continue
+                yield from self._scope_ids(handles, directory_path, recursive)
+            return
+        
+        if cache is not None:
+            file_paths = list(file_paths)
+            key = cache.make_key(self, file_paths)
+            if cache.is_valid(key):
+                yield from cache
+                return
+            # Files that fail to load are recorded, so a cache missing their documents is never committed
+            failed = []
+            def record_error(file_path: str, error: Exception) -> None:
+                failed.append(file_path)
+                on_error(file_path, error)
+            documents = self._load_files(file_paths, workers, ordered, chunksize,
+                                         record_error if on_error is not None else None)
+            documents = self._scope_ids(documents, directory_path, recursive)
+            yield from cache.write(key, documents, failed=failed)
+            return
+        
+        yield from self._scope_ids(self._load_files(file_paths, workers, ordered, chunksize, on_error),
+                                   directory_path, recursive)
+        
+    def _load_files(self, file_paths: Iterable[str],
+                    workers: int | None,
+                    ordered: bool,
+                    chunksize: int,
+                    on_error: Callable[[str, Exception], None] | None) -> Generator[Document, None, None]:
+        """
+        Lazily load documents from a list of files, see `load_directory`.
+        """
+        
+        if workers is None or workers <= 1:
+            for file_path in file_paths:
+                count("files", 1)
+                try:
+                    yield from self.iter_file(file_path)
+                except Exception as error:
+                    count("errors", 1)
+                    if on_error is None:
+                        raise
+                    on_error(file_path, error)
+            return
+        
+        for file_path, result, error in parallel_map(self.load_file, file_paths, workers=workers,
+                                                     ordered=ordered, chunksize=chunksize):
+            count("files", 1)
+            if error is not None:
+                count("errors", 1)
+                if on_error is None:
+                    raise error
+                on_error(file_path, error)
+                continue
+            
+            yield from self._as_documents(result)
                     
+    def config(self) -> dict:
+        """
+        Returns the configuration of the loader: its class and the options that change the loaded documents.
+        
+        Two loaders with the same configuration load the same documents from the same files,
+        so this is used to key corpus caches and manifests. Subclasses with their own options
+        should extend it.
+        
+        Returns:
+            dict: The JSON-serializable configuration.
+        """
+        
+        return {"class": f"{type(self).__module__}.{type(self).__qualname__}"}
+    
+    @staticmethod
+    def _scope_ids(documents: Iterable[Document], directory_path: str,
+                   recursive: bool) -> Iterable[Document]:
+        """
+        Prefix the IDs of documents loaded from subdirectories of a recursive scan with the
+        subdirectory relative to the scanned directory, see `load_directory`.
+        """
+        
+        if not recursive:
+            return documents
+        return (BaseLoader._scope_id(document, directory_path) for document in documents)
+    
+    @staticmethod
+    def _scope_id(document: Document, directory_path: str) -> Document:
+        subdirectory = os.path.relpath(os.path.dirname(document.path), directory_path)
+        if subdirectory != os.curdir:
+            document.id = f"{Path(subdirectory).as_posix()}/{document.id}"
+        return document
+    
+    def source_files(self, document_path: str) -> list[str]:
+        """
+        List the files a document file is loaded from, used to detect changes to the sources.
+        
+        Args:
+            document_path (str): The path to the document file.
+            
+        Returns:
+            list[str]: The paths of the source files.
+        """
+        
+        return [document_path]
+    
+    def list_files(self, directory_path: str,
+                   recursive: bool = False,
+                   extensions: tuple[str, ...] | None = None,
+                   pattern: str | None = None,
+                   shard_index: int = 0,
+                   num_shards: int = 1) -> Generator[str, None, None]:
+        """
+        List the files of a directory that should be passed to `load_file`, in name order.
         
+        Args:
+            directory_path (str): The path to the directory.
+            recursive (bool): Whether to list the files of subdirectories as well.
+            extensions (tuple[str, ...] | None): Only list files with these extensions. Defaults to
+                the loader's `extensions`.
+            pattern (str | None): Only list files whose path relative to the directory matches this glob pattern.
+            shard_index (int): The shard to list.
+            num_shards (int): The number of shards the files are split into.
             
+        Yields:
+            str: The path of each file.
+        """
+        
+        yield from scan_directory(directory_path, recursive=recursive,
+                                  extensions=self.extensions if extensions is None else tuple(extensions),
+                                  pattern=pattern, shard_index=shard_index, num_shards=num_shards)
+                
+    @staticmethod
+    def _as_documents(result: Document | list[Document] | None) -> list[Document]:
+        """
+        Normalize the return value of `load_file` to a list of documents.
+        """
         
+        if not result:
+            return []
+        if isinstance(result, list):
+            return result
+        return [result]
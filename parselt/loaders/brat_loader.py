@@ -1,10 +1,14 @@
 from __future__ import annotations
 from parselt.loaders.base_loader import BaseLoader
 from parselt.core.document import Document
+from parselt.core.lazy_document import LazyDocument
 from parselt.core.relation import Relation
 from parselt.core.entity import Entity
+from parselt.utils.instrumentation import count, stage
+from functools import partial
 import os
-from intervaltree import Interval, IntervalTree
+from parselt.core.interval_index import IntervalIndex
+from intervaltree import Interval
 
 
 class BratLoader(BaseLoader):
@@ -15,9 +19,16 @@ class BratLoader(BaseLoader):
         text_dir (str | None): Optional directory containing text files. If None, the text files are expected to be in the same directory as the annotations.
     """
     
+    extensions: tuple[str, ...] = (".ann",)
+    
     def __init__(self, text_dir: str | None=None) -> None:
         self.text_dir = text_dir
         
+    def config(self) -> dict:
+        config = super().config()
+        config["text_dir"] = self.text_dir
+        return config
+    
     def load_file(self, document_path: str) -> Document | None:
         """
         Load a single document from a BRAT formatted ".ann" file.
@@ -32,37 +43,125 @@ class BratLoader(BaseLoader):
         if not document_path.endswith(".ann"):
             return None
         
-        named_entities = []
-        relations = []
+        entities, relations, entity_index = self._load_annotations(document_path)
+        text = self._load_text(self._text_file_path(document_path))
+        
+        # Create a Document object
+        document = Document(id=self.document_id(document_path), path=document_path, 
+                            text=text, entities=entities, relations=relations,
+                            entity_index=entity_index)
+        return document
+    
+    def load_handle(self, document_path: str) -> LazyDocument | None:
+        """
+        Create a lazy handle to the document of a BRAT formatted ".ann" file without reading it.
+        
+        Args:
+            document_path (str): The path to the ".ann" file.
+            
+        Returns:
+            LazyDocument | None: The document handle, or None if the file is not a ".ann" file.
+        """
+        
+        if not document_path.endswith(".ann"):
+            return None
+        
+        return LazyDocument(id=self.document_id(document_path), path=document_path,
+                            load_text=partial(self._load_text, self._text_file_path(document_path)),
+                            load_annotations=partial(self._load_annotations, document_path))
+    
+    def document_id(self, document_path: str) -> str:
+        """
+        Returns the ID of the document stored in a ".ann" file.
+        """
+        
+        return os.path.basename(document_path.split(".")[0])
+    
+    def _load_annotations(self, document_path: str) -> tuple[IntervalIndex, list[Relation], dict[int, Entity]]:
+        """
+        Load the entities and relations of a ".ann" file.
+        
+        Args:
+            document_path (str): The path to the ".ann" file.
+            
+        Returns:
+            tuple[IntervalIndex, list[Relation], dict[int, Entity]]: The entities, the relations and
+                the entities keyed by entity ID.
+        """
+        
+        with stage("read"):
+            with open(document_path, "r", encoding="utf-8") as ann_file:
+                lines = ann_file.read().split("\n")
+                count("bytes_read", os.fstat(ann_file.fileno()).st_size)
         
-        # Load the annotation file
-        with open(document_path, "r", encoding="utf-8") as ann_file:
-            for line in ann_file:
+        named_entities = []
+        relation_lines = []
+        with stage("parse_annotations"):
+            for line in lines:
                 if line.startswith("T"):
                     named_entities.append(self._parse_term(line))
                 elif line.startswith("R"):
-                    relations.append(self._parse_relation(line, named_entities))
+                    relation_lines.append(line)
+        
+        with stage("build_index"):
+            entity_index = {interval.data.entity_id: interval.data for interval in named_entities}
+            entities = IntervalIndex(named_entities)
+        
+        with stage("resolve_relations"):
+            relations = [self._parse_relation(line, entity_index) for line in relation_lines]
+        
+        count("entities", len(named_entities))
+        count("relations", len(relations))
+        return entities, relations, entity_index
+    
+    def _load_text(self, text_file_path: str) -> str:
+        """
+        Load the text of a document.
+        
+        Args:
+            text_file_path (str): The path to the text file.
+            
+        Returns:
+            str: The text.
+        """
+        
+        with stage("read"), open(text_file_path, "r", encoding="utf-8") as text_file:
+            text = text_file.read()
+            count("bytes_read", os.fstat(text_file.fileno()).st_size)
+        return text
                 
-        # Load the text file
+    def source_files(self, document_path: str) -> list[str]:
+        """
+        List the files a document is loaded from: the ".ann" file and its text file.
+        
+        Args:
+            document_path (str): The path to the ".ann" file.
+            
+        Returns:
+            list[str]: The paths of the source files.
+        """
+        
+        if not document_path.endswith(".ann"):
+            return [document_path]
+        return [document_path, self._text_file_path(document_path)]
+    
+    def _text_file_path(self, document_path: str) -> str:
+        """
+        Returns the path of the text file belonging to a ".ann" file.
+        """
+        
         text_file_path = document_path.replace(".ann", ".txt")
         if self.text_dir:
             text_file_path = os.path.join(self.text_dir, os.path.basename(text_file_path))
-            
-        with open(text_file_path, "r", encoding="utf-8") as text_file:
-            text = text_file.read()
-        
-        # Create a Document object
-        document = Document(id=os.path.basename(document_path.split(".")[0]), path=document_path, 
-                            text=text, entities=IntervalTree(named_entities), relations=relations)
-        return document
+        return text_file_path
                 
-    def _parse_relation(self, line: str, entity_intervals: list[Interval]) -> Relation:
+    def _parse_relation(self, line: str, entity_index: dict[int, Entity]) -> Relation:
         """
         Parse a relation line from the annotation file.
         
         Args:
             line (str): The line to parse.
-            named_entities (list[Entity]): The list of named entities.
+            entity_index (dict[int, Entity]): The entities parsed so far, keyed by entity ID.
             
         Returns:
             Relation: The parsed relation.
@@ -75,19 +174,9 @@ class BratLoader(BaseLoader):
         arg_1_id = int(arg_1[6:])
         arg_2_id = int(arg_2[6:])
         
-        arg_1_token = None
-        arg_2_token = None
-        
-        for interval in entity_intervals:
-            entity: Entity = interval.data
-            assert isinstance(entity, Entity)
-            if entity.entity_id == arg_1_id:
-                arg_1_token = entity
-            elif entity.entity_id == arg_2_id:
-                arg_2_token = entity
-            if arg_1_token and arg_2_token:
-                break
-        else:
+        arg_1_token = entity_index.get(arg_1_id)
+        arg_2_token = entity_index.get(arg_2_id)
+        if arg_1_token is None or arg_2_token is None:
             raise ValueError(f"Entities {arg_1_id} and {arg_2_id} not found in the document.")
         
         return Relation(relation_id, label, arg_1_token, arg_2_token)
@@ -0,0 +1,285 @@
+from __future__ import annotations
+from parselt.loaders.base_loader import BaseLoader
+from parselt.core.document import Document
+from parselt.core.entity import Entity
+from parselt.core.token import Token
+from parselt.utils.instrumentation import count, stage
+from typing import Generator
+import os
+from parselt.core.interval_index import IntervalIndex
+from intervaltree import Interval
+
+
+class CoNLLLoader(BaseLoader):
+    """
+    A loader for CoNLL style files with one token per line and blank lines between sentences.
+
+    Files are parsed in a single buffered pass, and only the lines of the document being
+    built are held in memory. Documents start at "-DOCSTART-" lines, or every sentence is
+    its own document when `split_sentences` is set. A file without "-DOCSTART-" lines is
+    otherwise one document, held in memory as a whole, so memory use only stays bounded
+    for such files with `split_sentences` or `max_tokens_per_document`.
+
+    The text of a document is rebuilt from its tokens: at the token offsets when the file
+    has offset columns, otherwise joined by spaces with a newline between sentences.
+    Entities are decoded from the labels, which can be IOB2 ("B-"/"I-"), IOB1, BIOES
+    ("S-"/"E-" as well) or plain labels, where a run of tokens with the same label is one
+    entity. The tokens keep the labels as written in the file.
+
+    Args:
+        separator (str | None): The column separator. None splits on any whitespace.
+        text_column (int): The column of the token text.
+        label_column (int): The column of the token label.
+        offset_columns (tuple[int, int] | None): The columns of the token start and end offsets, if the file has them.
+        default_label (str): The label of tokens outside of any entity.
+        split_sentences (bool): Whether every sentence is loaded as its own document.
+        ids_on_docstart (bool): Whether "-DOCSTART-" lines hold the document ID in their second column.
+            Otherwise documents are numbered after the file name. When a document is split into
+            sentences, or by `max_tokens_per_document`, its parts get the ID with a "-1", "-2", ...
+            suffix per sentence, or a "-2", "-3", ... suffix for the parts after the first.
+        max_tokens_per_document (int | None): End a document at the first sentence boundary after
+            this many tokens and continue in a new document, so files without "-DOCSTART-" lines
+            are loaded in bounded memory. None never splits documents.
+        buffer_size (int): The size in bytes of the read buffer.
+        extensions (tuple[str, ...] | None): The extensions of the files the loader accepts, e.g. with
+            ".txt" added for corpora saved as text files. Defaults to `CoNLLLoader.extensions`.
+    """
+
+    DOCSTART: str = "-DOCSTART-"
+    extensions: tuple[str, ...] = (".conll", ".iob", ".bio", ".tsv")
+
+    def __init__(self, separator: str | None = None,
+                 text_column: int = 0,
+                 label_column: int = -1,
+                 offset_columns: tuple[int, int] | None = None,
+                 default_label: str = "O",
+                 split_sentences: bool = False,
+                 ids_on_docstart: bool = False,
+                 buffer_size: int = 1 << 20,
+                 extensions: tuple[str, ...] | None = None,
+                 max_tokens_per_document: int | None = None) -> None:
+        self.separator = separator
+        self.text_column = text_column
+        self.label_column = label_column
+        self.offset_columns = offset_columns
+        self.default_label = default_label
+        self.split_sentences = split_sentences
+        self.ids_on_docstart = ids_on_docstart
+        self.buffer_size = buffer_size
+        self.max_tokens_per_document = max_tokens_per_document
+        if extensions is not None:
+            self.extensions = tuple(extensions)
+
+    def config(self) -> dict:
+        config = super().config()
+        config["separator"] = self.separator
+        config["columns"] = [self.text_column, self.label_column, self.offset_columns]
+        config["default_label"] = self.default_label
+        config["split_sentences"] = self.split_sentences
+        config["ids_on_docstart"] = self.ids_on_docstart
+        config["max_tokens_per_document"] = self.max_tokens_per_document
+        return config
+
+    def load_file(self, file_path: str) -> list[Document]:
+        """
+        Load all documents of a CoNLL file.
+
+        Args:
+            file_path (str): The path to the CoNLL file.
+
+        Returns:
+            list[Document]: The documents.
+        """
+
+        return list(self.iter_file(file_path))
+
+    def iter_file(self, file_path: str) -> Generator[Document, None, None]:
+        """
+        Lazily load the documents of a CoNLL file.
+
+        Args:
+            file_path (str): The path to the CoNLL file.
+
+        Yields:
+            Document: The documents, in file order.
+        """
+
+        if not file_path.endswith(self.extensions):
+            raise ValueError(f"Invalid file format. Expected one of {', '.join(self.extensions)}.")
+
+        name = os.path.basename(file_path).split(".")[0]
+        separator = self.separator
+        text_column = self.text_column
+        label_column = self.label_column
+        offset_columns = self.offset_columns
+        max_tokens = self.max_tokens_per_document
+
+        # The sentences of the current document, as lists of (text, label, start, end) rows
+        sentences = []
+        sentence = []
+        document_tokens = 0
+        # The ID of the current "-DOCSTART-" document, and the number of its parts built so far
+        docstart_id = None
+        parts = 0
+        documents = 0
+
+        def flush() -> Document | None:
+            nonlocal sentences, document_tokens, parts, documents
+            if sentence:
+                sentences.append(sentence.copy())
+                sentence.clear()
+            if not sentences:
+                return None
+            documents += 1
+            parts += 1
+            if docstart_id is None:
+                document_id = f"{name}-{documents}"
+            elif parts == 1 and not self.split_sentences:
+                document_id = docstart_id
+            else:
+                document_id = f"{docstart_id}-{parts}"
+            document = self._build_document(document_id, file_path, sentences)
+            sentences = []
+            document_tokens = 0
+            return document
+
+        with open(file_path, "r", encoding="utf-8", buffering=self.buffer_size) as conll_file:
+            count("bytes_read", os.fstat(conll_file.fileno()).st_size)
+            for line in conll_file:
+                if not line.strip():
+                    # A blank line ends a sentence
+                    if sentence:
+                        document_tokens += len(sentence)
+                        sentences.append(sentence.copy())
+                        sentence.clear()
+                        if self.split_sentences or (max_tokens is not None and document_tokens >= max_tokens):
+                            yield flush()
+                    continue
+                fields = line.rstrip("\r\n").split(separator)
+                if fields[0].strip() == self.DOCSTART:
+                    document = flush()
+                    if document is not None:
+                        yield document
+                    docstart_id = (fields[1].strip() or None) if self.ids_on_docstart and len(fields) > 1 else None
+                    parts = 0
+                    continue
+
+                label = fields[label_column].strip()
+                if offset_columns is not None:
+                    sentence.append((fields[text_column].strip(), label,
+                                     int(fields[offset_columns[0]]), int(fields[offset_columns[1]])))
+                else:
+                    sentence.append((fields[text_column].strip(), label, None, None))
+
+        document = flush()
+        if document is not None:
+            yield document
+
+    def _build_document(self, document_id: str, file_path: str, sentences: list[list[tuple]]) -> Document:
+        """
+        Build a document from its sentences: rebuild the text, create the tokens and decode the entities.
+        """
+
+        with stage("parse_annotations"):
+            tokens = []
+            if self.offset_columns is None:
+                # Tokens are separated by a space, and sentences by a newline
+                position = 0
+                for sentence in sentences:
+                    for text, label, _, _ in sentence:
+                        end = position + len(text)
+                        token = Token(text, position, end, " ")
+                        token.label = label
+                        tokens.append(token)
+                        position = end + 1
+                    tokens[-1].next_char = "\n"
+                tokens[-1].next_char = ""
+                document_text = "\n".join([" ".join([row[0] for row in sentence]) for sentence in sentences])
+            else:
+                document_text = self._place_tokens(document_id, sentences, tokens)
+
+            entities = self._decode_entities(document_text, tokens, sentences)
+
+        with stage("build_index"):
+            entity_index = {interval.data.entity_id: interval.data for interval in entities}
+            entity_tree = IntervalIndex(entities)
+        count("entities", len(entities))
+        count("tokens", len(tokens))
+        return Document(id=document_id, path=file_path, text=document_text, entities=entity_tree,
+                        relations=[], tokens=tokens, entity_index=entity_index)
+
+    def _place_tokens(self, document_id: str, sentences: list[list[tuple]], tokens: list[Token]) -> str:
+        """
+        Rebuild the text of a document from tokens with offsets, filling the gaps with spaces and a
+        newline between sentences. The tokens are appended to `tokens`.
+        """
+
+        pieces = []
+        position = 0
+        for sentence in sentences:
+            for token_index, (text, label, start, end) in enumerate(sentence):
+                if start < position:
+                    raise ValueError(f"Token {text!r} of document {document_id!r} starts at {start}, "
+                                     f"before the end of the previous token.")
+                gap = start - position
+                if gap:
+                    pieces.append("\n" + " " * (gap - 1) if token_index == 0 and position else " " * gap)
+                pieces.append(text)
+                position = end
+
+                token = Token(text, start, end)
+                token.label = label
+                tokens.append(token)
+
+        document_text = "".join(pieces)
+        for token, next_token in zip(tokens, tokens[1:]):
+            token.next_char = document_text[token.end:next_token.start]
+        tokens[-1].next_char = document_text[tokens[-1].end:tokens[-1].end + 1]
+        return document_text
+
+    def _decode_entities(self, text: str, tokens: list[Token], sentences: list[list[tuple]]) -> list[Interval]:
+        """
+        Decode the entity spans from the token labels. Entities never cross a sentence boundary.
+        """
+
+        default_label = self.default_label
+        entities = []
+        entity_start = None
+        entity_end = None
+        entity_label = None
+
+        def close() -> None:
+            nonlocal entity_start, entity_label
+            if entity_label is not None:
+                entity_id = len(entities) + 1
+                entities.append(Interval(entity_start, entity_end,
+                                         Entity(text[entity_start:entity_end], entity_start, entity_end,
+                                                entity_label, entity_id)))
+            entity_start = None
+            entity_label = None
+
+        token_index = 0
+        for sentence in sentences:
+            for _ in sentence:
+                token = tokens[token_index]
+                token_index += 1
+                label = token.label
+                if label == default_label:
+                    close()
+                    continue
+
+                prefix, _, label_type = label.partition("-")
+                if not label_type or len(prefix) != 1 or prefix not in "BIES":
+                    # A plain label: runs of the same label are one entity
+                    prefix, label_type = "I", label
+
+                if prefix in "BS" or label_type != entity_label:
+                    close()
+                    entity_start = token.start
+                    entity_label = label_type
+                entity_end = token.end
+                if prefix in "ES":
+                    close()
+            close()
+
+        return entities
@@ -0,0 +1,293 @@
+from __future__ import annotations
+from parselt.core.document import Document
+from parselt.core.entity import Entity
+from parselt.core.relation import Relation
+from parselt.core.token_array import TokenArray
+from parselt.tokenizers.base_tokenizer import BaseTokenizer
+from parselt.core.interval_index import IntervalIndex
+from intervaltree import Interval
+from typing import TYPE_CHECKING, Any, BinaryIO, Generator, Iterable
+import copy
+import json
+import mmap
+import numpy as np
+import os
+import struct
+
+if TYPE_CHECKING:
+    from parselt.loaders.base_loader import BaseLoader
+
+
+class CorpusCache:
+    """
+    A memory-mapped binary cache of loaded, and optionally tokenized, documents.
+
+    The cache file stores every document of a corpus as one record: a small JSON header
+    with the annotations, followed by the UTF-8 text and the token offset and label
+    arrays. An index of record offsets is stored at the end of the file, so single
+    documents can be read at random without deserializing the rest, and token arrays
+    are read straight from the mapped file.
+
+    The cache is keyed on the loader configuration, the path, mtime and size of every
+    source file and the tokenizer configuration. Passing a cache to
+    `BaseLoader.load_directory` reads from it when the key matches and rebuilds it
+    otherwise.
+
+    File layout (little-endian):
+        header: magic (8 bytes), index offset (u64), index length (u64)
+        record: meta length (u32), meta JSON, text, padding to 8 bytes,
+                token starts (i64[n]), token ends (i64[n]), token label IDs (i32[n])
+        index:  JSON with the cache key and the offset and length of every record
+
+    Args:
+        cache_path (str): The path of the cache file.
+        tokenizer (BaseTokenizer | None): The tokenizer used to tokenize documents before caching, if any.
+        default_label (str): The label of tokens outside of any entity.
+        use_bio_labeling (bool): Whether tokens get BIO labels.
+        overlap_policy (str): Which entity labels a token that overlaps several.
+    """
+
+    MAGIC: bytes = b"PRLTCC01"
+    _HEADER = struct.Struct("<8sQQ")
+    _META_LENGTH = struct.Struct("<I")
+
+    def __init__(self, cache_path: str,
+                 tokenizer: BaseTokenizer | None = None,
+                 default_label: str = "O",
+                 use_bio_labeling: bool = False,
+                 overlap_policy: str = "first") -> None:
+        self.cache_path = cache_path
+        self.tokenizer = tokenizer
+        self.default_label = default_label
+        self.use_bio_labeling = use_bio_labeling
+        self.overlap_policy = overlap_policy
+
+        self._file: BinaryIO | None = None
+        self._map: mmap.mmap | None = None
+        self._index: dict | None = None
+        self._positions: dict[Any, int] | None = None
+
+    def make_key(self, loader: BaseLoader, file_paths: Iterable[str]) -> dict:
+        """
+        Build the cache key for a loader and its source files.
+
+        Args:
+            loader (BaseLoader): The loader reading the sources.
+            file_paths (Iterable[str]): The files passed to the loader.
+
+        Returns:
+            dict: The cache key.
+        """
+
+        sources = []
+        for file_path in file_paths:
+            for source_path in loader.source_files(file_path):
+                stat = os.stat(source_path)
+                sources.append([os.path.abspath(source_path), stat.st_mtime_ns, stat.st_size])
+        sources.sort()
+
+        key = {
+            "loader": loader.config(),
+            "tokenizer": self.tokenizer.config() if self.tokenizer is not None else None,
+            "labeling": [self.default_label, self.use_bio_labeling, self.overlap_policy],
+            "sources": sources,
+        }
+        # Round-trip through JSON so the key compares equal to the stored one
+        return json.loads(json.dumps(key))
+
+    def is_valid(self, key: dict) -> bool:
+        """
+        Checks if the cache file exists and was built for the given key.
+        """
+
+        try:
+            return self._load_index()["key"] == key
+        except (OSError, ValueError):
+            self.close()
+            return False
+
+    def write(self, key: dict, documents: Iterable[Document],
+              failed: list[str] | None = None) -> Generator[Document, None, None]:
+        """
+        Write documents to the cache while yielding them.
+
+        If the cache has a tokenizer, documents that are not already tokenized into token
+        arrays are copied and the copies are tokenized, so the given documents are left
+        unchanged. The cache file is only replaced once every document has been written,
+        so an interrupted write leaves the previous cache untouched.
+
+        Args:
+            key (dict): The cache key, see `make_key`.
+            documents (Iterable[Document]): The documents to cache.
+            failed (list[str] | None): The paths of the source files that failed to load, filled while
+                the documents are loaded. If any file failed, the documents are still yielded but the
+                cache is not replaced, since it would be missing their documents.
+
+        Yields:
+            Document: The cached documents, or their tokenized copies.
+        """
+
+        self.close()
+        temp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        records = []
+        ids = []
+        completed = False
+        try:
+            with open(temp_path, "wb") as cache_file:
+                cache_file.write(self._HEADER.pack(self.MAGIC, 0, 0))
+                for document in documents:
+                    if self.tokenizer is not None and not isinstance(document.tokens, TokenArray):
+                        document = copy.copy(document)
+                        document.tokenize(self.tokenizer,
+                                          default_label=self.default_label,
+                                          use_bio_labeling=self.use_bio_labeling,
+                                          overlap_policy=self.overlap_policy,
+                                          columnar=True)
+                    offset = cache_file.tell()
+                    self._write_record(cache_file, document)
+                    records.append([offset, cache_file.tell() - offset])
+                    ids.append(document.id)
+                    yield document
+                if failed:
+                    return
+
+                index = json.dumps({"key": key, "records": records, "ids": ids}).encode("utf-8")
+                index_offset = cache_file.tell()
+                cache_file.write(index)
+                cache_file.seek(0)
+                cache_file.write(self._HEADER.pack(self.MAGIC, index_offset, len(index)))
+            os.replace(temp_path, self.cache_path)
+            completed = True
+        finally:
+            if not completed and os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def _write_record(self, cache_file: BinaryIO, document: Document) -> None:
+        """
+        Write a single document record.
+        """
+
+        text = document.text.encode("utf-8")
+        tokens = document.tokens
+        if not isinstance(tokens, TokenArray):
+            tokens = TokenArray.from_tokens(tokens, document.text)
+
+        meta = json.dumps({
+            "id": document.id,
+            "path": document.path,
+            "text_length": len(text),
+            "token_count": len(tokens),
+            "labels": tokens.labels,
+            "entities": [[entity.entity_id, entity.label, entity.start, entity.end, entity.text]
+                         for entity in (interval.data for interval in document.entities)],
+            "relations": [[relation.id, relation.label, relation.arg_1.entity_id, relation.arg_2.entity_id]
+                          for relation in document.relations],
+        }).encode("utf-8")
+
+        cache_file.write(self._META_LENGTH.pack(len(meta)))
+        cache_file.write(meta)
+        cache_file.write(text)
+        cache_file.write(b"\0" * (-cache_file.tell() % 8))
+        cache_file.write(tokens.starts.astype("<i8", copy=False).tobytes())
+        cache_file.write(tokens.ends.astype("<i8", copy=False).tobytes())
+        cache_file.write(tokens.label_ids.astype("<i4", copy=False).tobytes())
+
+    def _load_index(self) -> dict:
+        """
+        Map the cache file and read its index.
+        """
+
+        if self._index is not None:
+            return self._index
+
+        self._file = open(self.cache_path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < self._HEADER.size:
+            raise ValueError(f"{self.cache_path} is not a corpus cache.")
+        magic, index_offset, index_length = self._HEADER.unpack_from(self._map, 0)
+        if magic != self.MAGIC or index_offset == 0:
+            raise ValueError(f"{self.cache_path} is not a corpus cache.")
+
+        self._index = json.loads(self._map[index_offset:index_offset + index_length])
+        return self._index
+
+    def _read_record(self, offset: int) -> Document:
+        """
+        Read the document record at the given offset.
+        """
+
+        buffer = self._map
+        meta_length, = self._META_LENGTH.unpack_from(buffer, offset)
+        position = offset + self._META_LENGTH.size
+        meta = json.loads(buffer[position:position + meta_length])
+        position += meta_length
+
+        text = buffer[position:position + meta["text_length"]].decode("utf-8")
+        position += meta["text_length"]
+        position += -position % 8
+
+        count = meta["token_count"]
+        starts = np.frombuffer(buffer, dtype="<i8", count=count, offset=position)
+        ends = np.frombuffer(buffer, dtype="<i8", count=count, offset=position + 8 * count)
+        label_ids = np.frombuffer(buffer, dtype="<i4", count=count, offset=position + 16 * count)
+
+        entity_index = {}
+        intervals = []
+        for entity_id, label, start, end, entity_text in meta["entities"]:
+            entity = Entity(entity_text, start, end, label, entity_id)
+            entity_index[entity_id] = entity
+            intervals.append(Interval(begin=start, end=end, data=entity))
+        relations = [Relation(relation_id, label, entity_index[arg_1], entity_index[arg_2])
+                     for relation_id, label, arg_1, arg_2 in meta["relations"]]
+
+        tokens = TokenArray(text, starts, ends, label_ids, meta["labels"]) if count else []
+        return Document(id=meta["id"], path=meta["path"], text=text, entities=IntervalIndex(intervals),
+                        relations=relations, tokens=tokens, entity_index=entity_index)
+
+    def get(self, document_id: Any) -> Document | None:
+        """
+        Returns the cached document with the specified ID, or None if not found.
+        """
+
+        index = self._load_index()
+        if self._positions is None:
+            self._positions = {document_id: i for i, document_id in enumerate(index["ids"])}
+        position = self._positions.get(document_id)
+        return self[position] if position is not None else None
+
+    def __len__(self) -> int:
+        return len(self._load_index()["records"])
+
+    def __getitem__(self, index: int) -> Document:
+        offset, _ = self._load_index()["records"][index]
+        return self._read_record(offset)
+
+    def __iter__(self) -> Generator[Document, None, None]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def close(self) -> None:
+        """
+        Unmap the cache file.
+
+        Token arrays of documents read from the cache point into the mapped file, so the
+        mapping stays alive until those documents are released.
+        """
+
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                pass
+        if self._file is not None:
+            self._file.close()
+        self._file = None
+        self._map = None
+        self._index = None
+        self._positions = None
+
+    def __enter__(self) -> CorpusCache:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
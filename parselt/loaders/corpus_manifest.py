@@ -0,0 +1,354 @@
+from __future__ import annotations
+from parselt.core.document import Document
+from parselt.tokenizers.base_tokenizer import BaseTokenizer
+from parselt.utils.instrumentation import count
+from parselt.utils.parallel import parallel_map
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable, Generator, Iterable
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+
+if TYPE_CHECKING:
+    from parselt.loaders.base_loader import BaseLoader
+
+
+@dataclass
+class ManifestChanges:
+    """
+    The changes to a corpus found by `CorpusManifest.refresh`, as lists of document file paths.
+
+    Attributes:
+        added (list[str]): Files that were not in the manifest and were loaded.
+        changed (list[str]): Files whose content, or the content of a source file such as the
+            text of a ".ann" file, changed and were reloaded.
+        deleted (list[str]): Files in the manifest that no longer exist.
+        unchanged (list[str]): Files whose previously loaded documents were reused.
+        failed (list[str]): Added or changed files that could not be loaded.
+    """
+
+    added: list[str] = field(default_factory=list)
+    changed: list[str] = field(default_factory=list)
+    deleted: list[str] = field(default_factory=list)
+    unchanged: list[str] = field(default_factory=list)
+    failed: list[str] = field(default_factory=list)
+
+    @property
+    def has_changes(self) -> bool:
+        """
+        Checks if any file was added, changed, deleted or failed to load.
+        """
+
+        return bool(self.added or self.changed or self.deleted or self.failed)
+
+
+class CorpusManifest:
+    """
+    Incrementally reloads a corpus, reparsing only the files that were added or changed.
+
+    The manifest records the path, mtime, size and content hash of every source file of a
+    corpus, and stores the documents loaded from each file (tokenized, if the manifest has
+    a tokenizer) in a state directory. On refresh, a file whose sources have the recorded
+    mtime and size is reused without being read. A source whose mtime or size differ is
+    hashed, and the file is only reparsed if the hash changed too. So a refresh reads and
+    parses the edited files only, and costs one `stat` per source file for the rest.
+
+    Documents are stored with `pickle`, so the state directory must only be shared
+    between trusted users.
+
+    Args:
+        state_dir (str): The directory holding the manifest and the stored documents, created if needed.
+        tokenizer (BaseTokenizer | None): The tokenizer used to tokenize reloaded documents, if any.
+        default_label (str): The label of tokens outside of any entity.
+        use_bio_labeling (bool): Whether tokens get BIO labels.
+        overlap_policy (str): Which entity labels a token that overlaps several.
+        columnar (bool): Whether tokens are stored as TokenArrays.
+    """
+
+    MANIFEST_NAME: str = "manifest.json"
+    VERSION: int = 1
+
+    def __init__(self, state_dir: str,
+                 tokenizer: BaseTokenizer | None = None,
+                 default_label: str = "O",
+                 use_bio_labeling: bool = False,
+                 overlap_policy: str = "first",
+                 columnar: bool = False) -> None:
+        self.state_dir = state_dir
+        self.tokenizer = tokenizer
+        self.default_label = default_label
+        self.use_bio_labeling = use_bio_labeling
+        self.overlap_policy = overlap_policy
+        self.columnar = columnar
+        self.files: dict[str, dict] = {}
+        self.last_changes: ManifestChanges | None = None
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.state_dir, self.MANIFEST_NAME)
+
+    def config(self, loader: BaseLoader) -> dict:
+        """
+        Returns the settings the stored documents depend on. Changing any of them reloads every file.
+
+        Args:
+            loader (BaseLoader): The loader reading the corpus.
+
+        Returns:
+            dict: The JSON-serializable configuration.
+        """
+
+        config = {
+            "version": self.VERSION,
+            "loader": loader.config(),
+            "tokenizer": self.tokenizer.config() if self.tokenizer is not None else None,
+            "labeling": [self.default_label, self.use_bio_labeling, self.overlap_policy, self.columnar],
+        }
+        # Round-trip through JSON so the configuration compares equal to the stored one
+        return json.loads(json.dumps(config))
+
+    def refresh(self, loader: BaseLoader, directory_path: str,
+                workers: int | None = None,
+                ordered: bool = True,
+                chunksize: int = 1,
+                on_error: Callable[[str, Exception], None] | None = None,
+                file_paths: Iterable[str] | None = None) -> ManifestChanges:
+        """
+        Bring the stored documents up to date with a directory.
+
+        Args:
+            loader (BaseLoader): The loader reading the corpus.
+            directory_path (str): The path to the directory containing document files.
+            workers (int | None): The number of worker processes loading added and changed files.
+                None or 1 loads serially.
+            ordered (bool): Whether to load files in directory order, or as soon as they are loaded.
+            chunksize (int): The number of files sent to a worker at once.
+            on_error (Callable[[str, Exception], None] | None): Called with the file path and the
+                exception when a file fails to load, after which the refresh continues. The file is
+                left out of the manifest, so it is retried on the next refresh. If None, the exception
+                is raised.
+            file_paths (Iterable[str] | None): The document files of the corpus. Defaults to
+                `loader.list_files(directory_path)`.
+
+        Returns:
+            ManifestChanges: The files that were added, changed, deleted, reused or failed to load.
+        """
+
+        config = self.config(loader)
+        previous = self._read_manifest()
+        stored_files = previous["files"] if previous is not None else {}
+        previous_files = stored_files if previous is not None and previous["config"] == config else {}
+
+        changes = ManifestChanges()
+        files = {}
+        to_load = {}
+        for file_path in (file_paths if file_paths is not None else loader.list_files(directory_path)):
+            file_path = os.path.abspath(file_path)
+            entry = previous_files.get(file_path)
+            sources = self._source_stats(loader, file_path, entry)
+            if entry is not None and self._same_content(sources, entry["sources"]):
+                # Touched sources keep their documents, with their new stats recorded
+                files[file_path] = dict(entry, sources=sources)
+                changes.unchanged.append(file_path)
+                continue
+            (changes.changed if entry is not None else changes.added).append(file_path)
+            to_load[file_path] = sources
+        changes.deleted = [file_path for file_path in previous_files
+                           if file_path not in files and file_path not in to_load]
+
+        os.makedirs(os.path.join(self.state_dir, "documents"), exist_ok=True)
+        try:
+            for file_path, documents, error in self._load(loader, list(to_load), workers, ordered, chunksize):
+                if error is not None:
+                    changes.failed.append(file_path)
+                    (changes.changed if file_path in changes.changed else changes.added).remove(file_path)
+                    if file_path in previous_files:
+                        # Keep the last documents that loaded, the file is retried on the next refresh
+                        files[file_path] = previous_files[file_path]
+                    if on_error is None:
+                        raise error
+                    on_error(file_path, error)
+                    continue
+                files[file_path] = self._write_record(file_path, to_load[file_path], documents)
+        finally:
+            # Save the files loaded so far even if a failure is raised, and drop stale documents
+            for file_path, entry in stored_files.items():
+                if file_path not in files:
+                    self._remove_record(entry)
+            self.files = files
+            self._write_manifest({"config": config, "files": files})
+
+        self.last_changes = changes
+        return changes
+
+    def documents(self, file_paths: Iterable[str] | None = None) -> Generator[Document, None, None]:
+        """
+        Lazily read the stored documents.
+
+        The documents of a file whose record is missing or corrupt, e.g. truncated by an
+        interrupted write, are skipped, and the file is removed from the manifest so the
+        next refresh loads it again.
+
+        Args:
+            file_paths (Iterable[str] | None): The document files to read the documents of.
+                Defaults to every file in the manifest.
+
+        Yields:
+            Document: The stored documents.
+        """
+
+        if not self.files:
+            manifest = self._read_manifest()
+            self.files = manifest["files"] if manifest is not None else {}
+        for file_path in (file_paths if file_paths is not None else list(self.files)):
+            file_path = os.path.abspath(file_path)
+            entry = self.files[file_path]
+            try:
+                with open(os.path.join(self.state_dir, "documents", entry["record"]), "rb") as record_file:
+                    documents = pickle.load(record_file)
+            except (FileNotFoundError, pickle.UnpicklingError, EOFError):
+                count("corrupt_records", 1)
+                self._forget(file_path)
+                continue
+            yield from documents
+
+    def _source_stats(self, loader: BaseLoader, file_path: str, entry: dict | None) -> list[list]:
+        """
+        Returns the path, mtime, size and content hash of every source file of a document file.
+
+        A source with the mtime and size recorded in the manifest entry keeps its recorded hash,
+        so only sources that look modified are read.
+        """
+
+        recorded = {source[0]: source for source in entry["sources"]} if entry is not None else {}
+        sources = []
+        for source_path in loader.source_files(file_path):
+            source_path = os.path.abspath(source_path)
+            try:
+                stat = os.stat(source_path)
+            except FileNotFoundError:
+                # Reloaded so the loader reports the missing source
+                sources.append([source_path, None, None, None])
+                continue
+            source = recorded.get(source_path)
+            if source is not None and source[1] == stat.st_mtime_ns and source[2] == stat.st_size:
+                sources.append(source)
+                continue
+            # Touched sources with the same hash get their new stats, so they are not hashed again
+            sources.append([source_path, stat.st_mtime_ns, stat.st_size, self._hash_file(source_path)])
+        return sources
+
+    @staticmethod
+    def _same_content(sources: list[list], recorded: list[list]) -> bool:
+        """
+        Checks if two source lists have the same paths and content hashes, whatever their stats.
+        Missing sources never match, so the loader reports them.
+        """
+
+        if any(source[3] is None for source in sources):
+            return False
+        return [[source[0], source[3]] for source in sources] == [[source[0], source[3]] for source in recorded]
+
+    @staticmethod
+    def _hash_file(file_path: str) -> str:
+        """
+        Returns the BLAKE2b hash of a file's content.
+        """
+
+        digest = hashlib.blake2b(digest_size=16)
+        with open(file_path, "rb") as source_file:
+            while chunk := source_file.read(1 << 20):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _load(self, loader: BaseLoader, file_paths: list[str],
+              workers: int | None, ordered: bool,
+              chunksize: int) -> Generator[tuple[str, list[Document] | None, Exception | None], None, None]:
+        """
+        Load the documents of every file, yielding (file path, documents, error) triples.
+        """
+
+        if workers is None or workers <= 1:
+            for file_path in file_paths:
+                try:
+                    yield file_path, list(loader.iter_file(file_path)), None
+                except Exception as error:
+                    yield file_path, None, error
+            return
+
+        for file_path, result, error in parallel_map(loader.load_file, file_paths, workers=workers,
+                                                     ordered=ordered, chunksize=chunksize):
+            yield file_path, loader._as_documents(result) if error is None else None, error
+
+    def _write_record(self, file_path: str, sources: list[list], documents: list[Document]) -> dict:
+        """
+        Tokenize and store the documents of a file, returning its manifest entry.
+        """
+
+        if self.tokenizer is not None:
+            for document in documents:
+                document.tokenize(self.tokenizer,
+                                  default_label=self.default_label,
+                                  use_bio_labeling=self.use_bio_labeling,
+                                  overlap_policy=self.overlap_policy,
+                                  columnar=self.columnar)
+
+        record = hashlib.blake2b(file_path.encode("utf-8"), digest_size=16).hexdigest() + ".pickle"
+        record_path = os.path.join(self.state_dir, "documents", record)
+        # A unique temporary file per write, so processes refreshing the same state do not collide
+        descriptor, temp_path = tempfile.mkstemp(suffix=".tmp", prefix=record, dir=os.path.dirname(record_path))
+        try:
+            with os.fdopen(descriptor, "wb") as record_file:
+                pickle.dump(documents, record_file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, record_path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+        return {"sources": sources, "record": record, "documents": len(documents)}
+
+    def _remove_record(self, entry: dict | None) -> None:
+        """
+        Delete the stored documents of a manifest entry, if any.
+        """
+
+        if entry is None:
+            return
+        try:
+            os.remove(os.path.join(self.state_dir, "documents", entry["record"]))
+        except FileNotFoundError:
+            pass
+
+    def _forget(self, file_path: str) -> None:
+        """
+        Remove a file from the manifest, so the next refresh loads it again.
+        """
+
+        self.files.pop(file_path, None)
+        manifest = self._read_manifest()
+        if manifest is not None and manifest["files"].pop(file_path, None) is not None:
+            self._write_manifest(manifest)
+
+    def _read_manifest(self) -> dict | None:
+        """
+        Read the manifest file, or return None if there is none or it is corrupt, in which case
+        every file is loaded again.
+        """
+
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as manifest_file:
+                return json.load(manifest_file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _write_manifest(self, manifest: dict) -> None:
+        """
+        Atomically replace the manifest file.
+        """
+
+        os.makedirs(self.state_dir, exist_ok=True)
+        temp_path = f"{self.manifest_path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as manifest_file:
+            json.dump(manifest, manifest_file)
+        os.replace(temp_path, self.manifest_path)
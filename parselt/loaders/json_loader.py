@@ -1,8 +1,13 @@
-from parselt import Document, Entity, Relation
+from parselt import Document, Entity, Relation, Token
 from parselt.loaders.base_loader import BaseLoader
+from parselt.utils.instrumentation import count, stage
+from parselt.utils.parallel import parallel_map
+from functools import partial
+from typing import Any, Generator, TextIO
 import json
 import os
-from intervaltree import Interval, IntervalTree
+from parselt.core.interval_index import IntervalIndex
+from intervaltree import Interval
 
 
 class JSONAnnotationSchema:
@@ -20,6 +25,8 @@ class JSONAnnotationSchema:
         relationship_key (str): Key for accessing the list of relationships.
         entity_fields (dict[str, str]): Mapping of entity attributes to JSON keys.
         relationship_fields (dict[str, str]): Mapping of relationship attributes to JSON keys.
+        token_key (str): Key for accessing the optional list of labeled tokens.
+        token_fields (dict[str, str]): Mapping of token attributes to JSON keys.
     """
 
     file_key: str = "document"
@@ -42,13 +49,24 @@ class JSONAnnotationSchema:
         "arg2": "arg2"
     }
 
+    token_key: str = "tokens"
+    token_fields: dict[str, str] = {
+        "text": "text",
+        "start": "start",
+        "end": "end",
+        "label": "label"
+    }
+
 
 class JSONLoader(BaseLoader):
     """
     A loader for reading JSON files containing text and annotations.
 
     This class loads JSON data from a given file and can optionally retrieve 
-    text from external `.txt` files stored in a specified directory.
+    text from external `.txt` files stored in a specified directory. Files are
+    either a single JSON document, a JSON array of documents, or JSON Lines
+    (`.jsonl`/`.ndjson`) with one document per line. `iter_file` streams the
+    documents of large files with bounded memory.
 
     Attributes:
         text_dir (str | None): Directory containing text files referenced in the JSON.
@@ -58,6 +76,9 @@ class JSONLoader(BaseLoader):
         ValueError: If `load_txt_files` is True but `text_dir` is not provided.
     """
 
+    extensions: tuple[str, ...] = (".json", ".jsonl", ".ndjson")
+    json_lines_extensions: tuple[str, ...] = (".jsonl", ".ndjson")
+
     def __init__(self, text_dir: str | None = None, 
                  load_txt_files: bool = False,
                  custom_schema: JSONAnnotationSchema = None) -> None:
@@ -81,6 +102,16 @@ class JSONLoader(BaseLoader):
 
         self.default_schema: JSONAnnotationSchema = custom_schema if custom_schema is not None else JSONAnnotationSchema()
 
+    def config(self) -> dict:
+        config = super().config()
+        config["text_dir"] = self.text_dir
+        config["load_txt_files"] = self.load_txt_files
+        schema = self.default_schema
+        config["schema"] = {name: getattr(schema, name)
+                            for name in ("file_key", "text_key", "entity_key", "relationship_key", "entity_fields",
+                                         "relationship_fields", "token_key", "token_fields")}
+        return config
+    
     def load_file(self, file_path: str) -> Document | list[Document]:
         """
         Loads JSON data from the specified file.
@@ -89,14 +120,20 @@ class JSONLoader(BaseLoader):
             file_path (str): Path to the JSON file to be loaded.
 
         Returns:
-            dict: Parsed JSON data.
+            Document | list[Document]: The parsed document, or a list of documents if the file
+                holds an array of documents or JSON Lines.
         """
         
+        if file_path.endswith(self.json_lines_extensions):
+            return list(self.iter_file(file_path))
         if not file_path.endswith(".json"):
             raise ValueError("Invalid file format. Expected a JSON file.")
         
-        with open(file_path, "r", encoding="utf-8") as json_file:
-            data = json.load(json_file)
+        with stage("read"), open(file_path, "r", encoding="utf-8") as json_file:
+            content = json_file.read()
+            count("bytes_read", os.fstat(json_file.fileno()).st_size)
+        with stage("parse_annotations"):
+            data = json.loads(content)
         
         if isinstance(data, list):
             docs = []
@@ -108,7 +145,147 @@ class JSONLoader(BaseLoader):
         else:
             raise ValueError("Invalid JSON format. Expected a dictionary or a list of dictionaries.")
         
+    def iter_file(self, file_path: str,
+                  workers: int | None = None,
+                  ordered: bool = True,
+                  chunksize: int = 64,
+                  read_size: int = 1 << 16) -> Generator[Document, None, None]:
+        """
+        Lazily loads the documents of a JSON or JSON Lines file.
+
+        JSON Lines files are read one line at a time and a top-level JSON array is
+        decoded one element at a time, so only the documents in flight are held in
+        memory. The lines of JSON Lines files can be decoded and parsed over a process
+        pool. The elements of a JSON array are already decoded while the file is read,
+        and sending decoded records to workers costs more than parsing them, so they are
+        always parsed serially; use `load_directory(workers=...)` to parse many JSON
+        files in parallel.
+
+        Args:
+            file_path (str): Path to the `.json`, `.jsonl` or `.ndjson` file.
+            workers (int | None): The number of worker processes parsing the lines of a JSON Lines file.
+                None or 1 parses serially.
+            ordered (bool): Whether to yield documents in file order, or as soon as they are parsed.
+            chunksize (int): The number of records sent to a worker at once.
+            read_size (int): The minimum number of characters read at a time from a JSON array.
+
+        Yields:
+            Document: The parsed document.
+        """
+        
+        if file_path.endswith(self.json_lines_extensions):
+            parse = partial(self._parse_json_line, file_path=file_path)
+        elif file_path.endswith(".json"):
+            parse = partial(self._parse_json_record, file_path=file_path)
+        else:
+            raise ValueError("Invalid file format. Expected a JSON or JSON Lines file.")
+        
+        with open(file_path, "r", encoding="utf-8") as json_file:
+            count("bytes_read", os.fstat(json_file.fileno()).st_size)
+            if file_path.endswith(self.json_lines_extensions):
+                records = (line for line in json_file if line.strip())
+            else:
+                records = self._iter_json_records(json_file, read_size)
+                workers = None
+                
+            for _, document, error in parallel_map(parse, records, workers=workers,
+                                                   ordered=ordered, chunksize=chunksize):
+                if error is not None:
+                    raise error
+                yield document
+        
+    def _parse_json_line(self, line: str, file_path: str) -> Document:
+        """
+        Parses one line of a JSON Lines file into a Document object.
+        """
+        
+        return self._parse_json_record(json.loads(line), file_path)
+    
+    def _parse_json_record(self, data: Any, file_path: str) -> Document:
+        """
+        Parses one record of a JSON file into a Document object.
+        """
+        
+        if not isinstance(data, dict):
+            raise ValueError("Invalid JSON format. Expected a dictionary or a list of dictionaries.")
+        return self.parse_json_document(data, file_path)
+    
+    @staticmethod
+    def _iter_json_records(json_file: TextIO, read_size: int) -> Generator[Any, None, None]:
+        """
+        Incrementally decodes a JSON file, yielding the elements of a top-level array one at a time.
+        
+        A file holding a single value (not an array) yields that value.
+        
+        When an element does not fit in the buffer, the next read is at least as large as
+        the part of the element already buffered, so the buffer doubles on every retry and
+        decoding an element costs time linear in its size rather than quadratic.
+        
+        Args:
+            json_file (TextIO): The open JSON file.
+            read_size (int): The minimum number of characters read at a time.
+            
+        Yields:
+            Any: The decoded elements.
+        """
+        
+        decoder = json.JSONDecoder()
+        buffer = ""
+        position = 0
+        eof = False
+        
+        def fill() -> bool:
+            nonlocal buffer, position, eof
+            if eof:
+                return False
+            chunk = json_file.read(max(read_size, len(buffer) - position))
+            if not chunk:
+                eof = True
+                return False
+            buffer = buffer[position:] + chunk
+            position = 0
+            return True
+        
+        def skip_whitespace() -> str:
+            nonlocal position
+            while True:
+                while position < len(buffer) and buffer[position].isspace():
+                    position += 1
+                if position < len(buffer) or not fill():
+                    return buffer[position:position + 1]
+        
+        if skip_whitespace() != "[":
+            while fill():
+                pass
+            yield json.loads(buffer[position:])
+            return
+        position += 1
         
+        if skip_whitespace() == "]":
+            return
+        while True:
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError:
+                    if not fill():
+                        raise
+                    continue
+                # A value that ends at the buffer boundary may continue in the next chunk
+                if end == len(buffer) and fill():
+                    continue
+                break
+            position = end
+            yield value
+            
+            separator = skip_whitespace()
+            position += 1
+            if separator == "]":
+                return
+            if separator != ",":
+                raise json.JSONDecodeError("Expected ',' or ']' in JSON array", buffer, position - 1)
+            skip_whitespace()
+            
     def parse_json_document(self, data: dict, file_path: str) -> Document:
         """
         Parses JSON data into a Document object.
@@ -122,18 +299,55 @@ class JSONLoader(BaseLoader):
         
         text = None
         if self.load_txt_files:
-            with open(os.path.join(self.text_dir, data[self.default_schema.file_key]), "r", encoding="utf-8") as text_file:
+            with stage("read"), open(os.path.join(self.text_dir, data[self.default_schema.file_key]), "r", encoding="utf-8") as text_file:
                 text = text_file.read()
+                count("bytes_read", os.fstat(text_file.fileno()).st_size)
         else:
             text = data[self.default_schema.text_key]
         
-        entities = self._parse_entities(data)
-        relations = self._parse_relations(data, entities)
+        with stage("parse_annotations"):
+            entities = self._parse_entities(data)
+        with stage("build_index"):
+            entity_index = {interval.data.entity_id: interval.data for interval in entities}
+            entities = IntervalIndex(entities)
+        with stage("resolve_relations"):
+            relations = self._parse_relations(data, entity_index)
+        count("entities", len(entities))
+        count("relations", len(relations))
         
         doc_id = os.path.basename(data[self.default_schema.file_key].split(".")[0])
         
-        document = Document(id=doc_id, path=file_path, text=text, entities=entities, relations=relations)
+        document = Document(id=doc_id, path=file_path, text=text, entities=entities, relations=relations,
+                            tokens=self._parse_tokens(data, text), entity_index=entity_index)
         return document
+    
+    def _parse_tokens(self, data: dict, text: str) -> list[Token] | None:
+        """
+        Parses the labeled tokens written by `JSONExporter`, if the JSON data has any.
+
+        Args:
+            data (dict): JSON data, optionally containing tokens.
+            text (str): The text of the document.
+
+        Returns:
+            list[Token] | None: The parsed tokens, or None if there are none.
+        """
+        
+        tokens = data.get(self.default_schema.token_key)
+        if not tokens:
+            return None
+        
+        fields = self.default_schema.token_fields
+        text_field, start_field, end_field, label_field = fields["text"], fields["start"], fields["end"], fields["label"]
+        parsed_tokens = []
+        for token in tokens:
+            parsed_token = Token(token[text_field], token[start_field], token[end_field])
+            parsed_token.label = token.get(label_field)
+            if parsed_tokens:
+                parsed_tokens[-1].next_char = text[parsed_tokens[-1].end:parsed_token.start]
+            parsed_tokens.append(parsed_token)
+        parsed_tokens[-1].next_char = text[parsed_tokens[-1].end:parsed_tokens[-1].end + 1]
+        return parsed_tokens
         
     def _parse_entities(self, data: dict) -> list[Interval]:
         """
@@ -159,13 +373,13 @@ class JSONLoader(BaseLoader):
         
         return parsed_entities
     
-    def _parse_relations(self, data: dict, entity_intervals: list[Interval]) -> list[dict]:
+    def _parse_relations(self, data: dict, entity_index: dict[int, Entity]) -> list[Relation]:
         """
         Parses relationship annotations from the JSON data.
 
         Args:
             data (dict): JSON data containing relationship annotations.
-            entities (list[dict]): List of parsed entity annotations.
+            entity_index (dict[int, Entity]): Parsed entities keyed by entity ID.
 
         Returns:
             list[dict]: List of parsed relationship annotations.
@@ -180,21 +394,11 @@ class JSONLoader(BaseLoader):
             arg1_id = relation[self.default_schema.relationship_fields["arg1"]]
             arg2_id = relation[self.default_schema.relationship_fields["arg2"]]
             
-            arg1_token = None
-            arg2_token = None
-            for interval in entity_intervals:
-                entity: Entity = interval.data
-                assert isinstance(entity, Entity)
-                if entity.entity_id == arg1_id:
-                    arg1_token = entity
-                elif entity.entity_id == arg2_id:
-                    arg2_token = entity
-                if arg1_token and arg2_token:
-                    break
-            else:
+            arg1_token = entity_index.get(arg1_id)
+            arg2_token = entity_index.get(arg2_id)
+            if arg1_token is None or arg2_token is None:
                 raise ValueError(f"Entities {arg1_id} and {arg2_id} not found in the document.")
             
-            
             parsed_relation = Relation(relation_id, relation_type, arg1_token, arg2_token)
             parsed_relations.append(parsed_relation)
         
@@ -1,7 +1,15 @@
 from parselt.tokenizers.word_tokenizer import WordTokenizer
 from parselt.tokenizers.base_tokenizer import BaseTokenizer
+from parselt.tokenizers.cached_tokenizer import CachedTokenizer
+from parselt.tokenizers.subword_tokenizer import BPETokenizer, SubwordTokenizer, WordPieceTokenizer
+from parselt.tokenizers.batch import tokenize_documents
 
 __all__ = [
     "WordTokenizer",
-    "BaseTokenizer"
-]
\ No newline at end of file
+    "BaseTokenizer",
+    "CachedTokenizer",
+    "SubwordTokenizer",
+    "WordPieceTokenizer",
+    "BPETokenizer",
+    "tokenize_documents"
+]
@@ -1,5 +1,11 @@
 from abc import ABC, abstractmethod
 from parselt.core.token import Token
+from parselt.core.token_array import TokenArray
+from parselt.utils.instrumentation import count, stage
+from parselt.utils.parallel import parallel_map
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable
+import numpy as np
 import re
 
 class BaseTokenizer(ABC):
@@ -27,6 +33,27 @@ class BaseTokenizer(ABC):
         self.remove_stopwords = remove_stopwords
         self.tokenize_numbers = tokenize_numbers
         
+    def config(self) -> dict:
+        """
+        Returns the configuration of the tokenizer: its class and preprocessing options.
+        
+        Two tokenizers with the same configuration produce the same tokens, so this can
+        be used to key caches of tokenizer output. Subclasses with their own options
+        should extend it.
+        
+        Returns:
+            dict: The JSON-serializable configuration.
+        """
+        
+        return {
+            "class": f"{type(self).__module__}.{type(self).__qualname__}",
+            "lower": self.lower,
+            "remove_punctuation": self.remove_punctuation,
+            "normalize_whitespace": self.normalize_whitespace,
+            "remove_stopwords": self.remove_stopwords,
+            "tokenize_numbers": self.tokenize_numbers,
+        }
+        
     def __call__(self, text: str) -> list[Token]:
         """
         Preprocess and tokenize the input text.
@@ -38,8 +65,54 @@ class BaseTokenizer(ABC):
             list[Token]: A list of tokens.
         """
         
-        preprocessed_text = self.preprocess(text)
-        return self.tokenize(preprocessed_text)
+        with stage("preprocess"):
+            preprocessed_text, offsets = self.preprocess_with_offsets(text)
+        with stage("tokenize"):
+            tokens = self.tokenize(preprocessed_text)
+            if offsets is not None:
+                self._restore_offsets(tokens, offsets, len(text))
+        count("tokens", len(tokens))
+        return tokens
+    
+    def tokenize_batch(self, texts: Iterable[str],
+                       workers: int | None = None,
+                       chunksize: int = 16,
+                       columnar: bool = False) -> list[list[Token]] | list[TokenArray]:
+        """
+        Preprocess and tokenize many texts, optionally over a process pool.
+        
+        The tokenizer is pickled once per worker process when the pool starts, so workers
+        keep their compiled patterns, vocabularies and memoized state for the whole batch
+        and only the texts are sent with every chunk.
+        
+        Args:
+            texts (Iterable[str]): The texts to tokenize.
+            workers (int | None): The number of worker processes. None or 1 tokenizes serially.
+            chunksize (int): The number of texts sent to a worker at once.
+            columnar (bool): Whether to return a TokenArray per text instead of a list of tokens.
+            
+        Returns:
+            list[list[Token]] | list[TokenArray]: The tokens of every text, in input order.
+        """
+        
+        if workers is None or workers <= 1:
+            tokenize = self.tokenize_array if columnar else self
+            executor = None
+        else:
+            tokenize = _tokenize_array_in_worker if columnar else _tokenize_in_worker
+            executor = ProcessPoolExecutor(max_workers=workers, initializer=_set_worker_tokenizer, initargs=(self,))
+        
+        results = []
+        try:
+            for _, tokens, error in parallel_map(tokenize, texts, workers=workers, ordered=True,
+                                                 chunksize=chunksize, executor=executor):
+                if error is not None:
+                    raise error
+                results.append(tokens)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+        return results
     
     @abstractmethod
     def tokenize(self, text: str) -> list[Token]:
@@ -55,6 +128,21 @@ class BaseTokenizer(ABC):
         
         pass
     
+    def tokenize_array(self, text: str) -> TokenArray:
+        """
+        Preprocess and tokenize the input text into a columnar token array.
+        
+        Subclasses can override this to fill the arrays without creating token objects.
+        
+        Args:
+            text (str): The text to tokenize.
+            
+        Returns:
+            TokenArray: The tokens, with offsets into and text taken from the original text.
+        """
+        
+        return TokenArray.from_tokens(self(text), text)
+    
     def preprocess(self, text: str) -> str:
         """
         Preprocess the input text before tokenization.
@@ -66,12 +154,50 @@ class BaseTokenizer(ABC):
             str: The preprocessed text.
         """
         
+        return self._preprocess(text, with_offsets=False)[0]
+    
+    def preprocess_with_offsets(self, text: str) -> tuple[str, np.ndarray | None]:
+        """
+        Preprocess the input text and map every preprocessed character back to the original text.
+        
+        Args:
+            text (str): The text to preprocess.
+            
+        Returns:
+            tuple[str, np.ndarray | None]: The preprocessed text and, for every character of it, the
+                offset of the original character it came from. The offset map is None when
+                preprocessing did not move any character.
+        """
+        
+        return self._preprocess(text, with_offsets=True)
+    
+    def _preprocess(self, text: str, with_offsets: bool) -> tuple[str, np.ndarray | None]:
+        """
+        Apply all enabled preprocessing options, optionally building the offset map.
+        
+        Lowercasing is a single `str.lower` call, and punctuation removal and whitespace
+        normalization together are one split by a regex compiled once at import, so no
+        option loops over characters in Python. The preprocessed text and the offset map
+        are both built from the split, where every run of removed characters is dropped
+        or becomes one space. Offsets are int32 unless the text is too long for them.
+        """
+        
+        offsets = None
+        
         if self.lower:
-            text = text.lower()
-        if self.remove_punctuation:
-            text = ''.join(char for char in text if char.isalnum() or char.isspace())
-        if self.normalize_whitespace:
-            text = re.sub(r'\s+', ' ', text).strip()
+            lowered = text.lower()
+            if with_offsets and len(lowered) != len(text):
+                # A few characters lowercase to more than one character
+                offsets = np.repeat(np.arange(len(text), dtype=_offset_dtype(len(lowered))),
+                                    [len(char.lower()) for char in text])
+            text = lowered
+            
+        preprocessor = self._compiled_preprocessor()
+        if preprocessor is not None:
+            text, run_offsets = self._apply_preprocessor(preprocessor, text, with_offsets)
+            if run_offsets is not None:
+                offsets = run_offsets if offsets is None else offsets[run_offsets]
+                
         if self.remove_stopwords:
             # Placeholder for stopword removal logic
             pass
@@ -79,6 +205,123 @@ class BaseTokenizer(ABC):
             # Placeholder for number tokenization logic
             pass
         
-        return text
+        return text, offsets
+    
+    def _compiled_preprocessor(self) -> tuple[re.Pattern, bool | None] | None:
+        """
+        Returns the precompiled regex matching the runs of characters removed or collapsed by preprocessing.
+        
+        Returns:
+            tuple[re.Pattern, bool | None] | None: The regex, and whether every run becomes a space (True),
+                is removed (False), or becomes a space only if it contains whitespace (None). None if no
+                regex based option is enabled.
+        """
+        
+        if self.remove_punctuation and self.normalize_whitespace:
+            return _NON_ALPHANUMERIC_RUN, None
+        if self.remove_punctuation:
+            return _PUNCTUATION_RUN, False
+        if self.normalize_whitespace:
+            return _WHITESPACE_RUN, True
+        return None
+    
+    def _apply_preprocessor(self, preprocessor: tuple[re.Pattern, bool | None], text: str,
+                            with_offsets: bool) -> tuple[str, np.ndarray | None]:
+        """
+        Remove or collapse the runs matched by the preprocessing regex, and build the offset map.
+        
+        The text is split into kept segments and matched runs in a single regex pass, and
+        both the preprocessed text and the offset map are built from those parts.
+        """
+        
+        runs, spaced = preprocessor
+        # Kept segments and matched runs alternate: segment, run, segment, ..., segment
+        parts = runs.split(text)
+        if len(parts) == 1:
+            return text, None
+        
+        # Every run becomes one space or nothing
+        if spaced is None:
+            spaces = [_WHITESPACE.search(run) is not None for run in parts[1::2]]
+        else:
+            spaces = [spaced] * (len(parts) // 2)
+        if self.normalize_whitespace:
+            # Runs at the ends of the text are stripped
+            if not parts[0]:
+                spaces[0] = False
+            if not parts[-1]:
+                spaces[-1] = False
+        pieces = parts.copy()
+        pieces[1::2] = [" " if space else "" for space in spaces]
+        preprocessed_text = "".join(pieces)
+        if not with_offsets:
+            return preprocessed_text, None
+        
+        dtype = _offset_dtype(len(text))
+        part_lengths = np.fromiter(map(len, parts), dtype=dtype, count=len(parts))
+        piece_lengths = part_lengths.copy()
+        piece_lengths[1::2] = spaces
+        part_starts = np.cumsum(part_lengths, dtype=dtype) - part_lengths
+        piece_starts = np.cumsum(piece_lengths, dtype=dtype) - piece_lengths
+        offsets = np.arange(len(preprocessed_text), dtype=dtype) + np.repeat(part_starts - piece_starts, piece_lengths)
+        return preprocessed_text, offsets
+    
+    @staticmethod
+    def _map_spans(starts: np.ndarray, ends: np.ndarray, offsets: np.ndarray,
+                   original_length: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Map span offsets in the preprocessed text back to the original text.
+        """
+        
+        offsets = np.append(offsets, original_length)
+        mapped_starts = offsets[starts]
+        mapped_ends = np.where(ends > starts, offsets[np.maximum(ends - 1, 0)] + 1, mapped_starts)
+        return mapped_starts, mapped_ends
+    
+    def _restore_offsets(self, tokens: list[Token], offsets: np.ndarray, original_length: int) -> None:
+        """
+        Move token offsets from the preprocessed text back to the original text, in place.
+        """
+        
+        if not tokens:
+            return
+        starts = np.fromiter((token.start for token in tokens), dtype=np.int64, count=len(tokens))
+        ends = np.fromiter((token.end for token in tokens), dtype=np.int64, count=len(tokens))
+        starts, ends = self._map_spans(starts, ends, offsets, original_length)
+        for token, start, end in zip(tokens, starts.tolist(), ends.tolist()):
+            token.start = start
+            token.end = end
+
 
+def _offset_dtype(length: int) -> type:
+    """
+    Returns the dtype of the offset map of a text: int32, unless the text is too long for it.
+    """
     
+    return np.int32 if length < 2 ** 31 else np.int64
+
+
+# The tokenizer of a `tokenize_batch` worker process, set once when the process starts
+_worker_tokenizer: BaseTokenizer | None = None
+
+
+def _set_worker_tokenizer(tokenizer: BaseTokenizer) -> None:
+    global _worker_tokenizer
+    _worker_tokenizer = tokenizer
+
+
+def _tokenize_in_worker(text: str) -> list[Token]:
+    return _worker_tokenizer(text)
+
+
+def _tokenize_array_in_worker(text: str) -> TokenArray:
+    return _worker_tokenizer.tokenize_array(text)
+
+
+# Runs of characters that preprocessing removes or collapses, captured so `split` keeps them.
+# Punctuation is anything that is neither alphanumeric nor whitespace, the same as
+# `not (char.isalnum() or char.isspace())`.
+_PUNCTUATION_RUN = re.compile(r"((?:[^\w\s]|_)+)")
+_WHITESPACE_RUN = re.compile(r"(\s+)")
+_NON_ALPHANUMERIC_RUN = re.compile(r"((?:[^\w]|_)+)")
+_WHITESPACE = re.compile(r"\s")
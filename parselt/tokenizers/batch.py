@@ -0,0 +1,46 @@
+from __future__ import annotations
+from parselt.tokenizers.base_tokenizer import BaseTokenizer
+from typing import TYPE_CHECKING, Iterable
+
+if TYPE_CHECKING:
+    from parselt.core.document import Document
+
+
+def tokenize_documents(documents: Iterable[Document],
+                       tokenizer: BaseTokenizer,
+                       default_label: str = "O",
+                       use_bio_labeling: bool = False,
+                       overlap_policy: str = "first",
+                       columnar: bool = False,
+                       workers: int | None = None,
+                       chunksize: int = 16) -> list[Document]:
+    """
+    Tokenize and label many documents in place, optionally over a process pool.
+    
+    Only the texts are sent to the workers; labeling from the entities happens in the
+    calling process. This is equivalent to calling `Document.tokenize` on every document.
+    
+    Args:
+        documents (Iterable[Document]): The documents to tokenize.
+        tokenizer (BaseTokenizer): The tokenizer to use for tokenization.
+        default_label (str): The label of tokens outside of any entity.
+        use_bio_labeling (bool): Whether to prefix labels with "B-" or "I-".
+        overlap_policy (str): Which entity labels a token that overlaps several: "first",
+            "longest" or "innermost".
+        columnar (bool): Whether to store the tokens as a TokenArray instead of a list of tokens.
+        workers (int | None): The number of worker processes. None or 1 tokenizes serially.
+        chunksize (int): The number of texts sent to a worker at once.
+        
+    Returns:
+        list[Document]: The tokenized documents, in input order.
+    """
+    
+    documents = list(documents)
+    batch = tokenizer.tokenize_batch((document.text for document in documents),
+                                     workers=workers, chunksize=chunksize, columnar=columnar)
+    for document, tokens in zip(documents, batch):
+        document.set_tokens(tokens,
+                            default_label=default_label,
+                            use_bio_labeling=use_bio_labeling,
+                            overlap_policy=overlap_policy)
+    return documents
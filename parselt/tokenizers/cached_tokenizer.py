@@ -0,0 +1,239 @@
+from __future__ import annotations
+from parselt.tokenizers.base_tokenizer import BaseTokenizer
+from parselt.core.token import OffsetToken, Token
+from parselt.core.token_array import TokenArray
+from parselt.utils.instrumentation import count
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import struct
+import tempfile
+import numpy as np
+
+
+class CachedTokenizer(BaseTokenizer):
+    """
+    Wraps a tokenizer with a content-addressed cache of its output.
+
+    Entries are keyed by the SHA-256 of the wrapped tokenizer's `config()` and the text,
+    so a text is only tokenized once per configuration, however many documents contain
+    it. Token offsets are kept in a bounded in-memory LRU and, if `cache_dir` is set, in
+    one file per entry that any number of processes can share: files are written to a
+    temporary name and renamed into place, so readers never see a partial entry.
+
+    On a hit, tokens are rebuilt from the offsets without running the wrapped tokenizer:
+    their text and following characters are sliced from the text, or read from the entry
+    when the tokenizer does not return slices of it (e.g. when lowercasing).
+
+    Args:
+        tokenizer (BaseTokenizer): The tokenizer whose output is cached.
+        cache_dir (str | None): The directory of the on-disk cache, created if needed. None keeps
+            the cache in memory only.
+        max_entries (int): The number of entries kept in memory.
+    """
+
+    _HEADER = struct.Struct("<QI")
+
+    def __init__(self, tokenizer: BaseTokenizer, cache_dir: str | None = None, max_entries: int = 4096) -> None:
+        super().__init__(lower=tokenizer.lower,
+                         remove_punctuation=tokenizer.remove_punctuation,
+                         normalize_whitespace=tokenizer.normalize_whitespace,
+                         remove_stopwords=tokenizer.remove_stopwords,
+                         tokenize_numbers=tokenizer.tokenize_numbers)
+        self.tokenizer = tokenizer
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple] = OrderedDict()
+        self._config_digest = hashlib.sha256(json.dumps(tokenizer.config(), sort_keys=True).encode("utf-8") + b"\0")
+
+    def config(self) -> dict:
+        """
+        Returns the configuration of the wrapped tokenizer, whose tokens the cache returns unchanged.
+        """
+
+        return self.tokenizer.config()
+
+    def key(self, text: str) -> str:
+        """
+        Returns the cache key of a text.
+        """
+
+        digest = self._config_digest.copy()
+        digest.update(text.encode("utf-8", "surrogatepass"))
+        return digest.hexdigest()
+
+    def __call__(self, text: str) -> list[Token]:
+        """
+        Tokenize the text, or rebuild its tokens from the cache.
+
+        Args:
+            text (str): The text to tokenize.
+
+        Returns:
+            list[Token]: A list of tokens.
+        """
+
+        key = self.key(text)
+        entry = self._get(key)
+        if entry is not None and entry[2] is not None:
+            count("cache_hits", 1)
+            count("tokens", len(entry[0]))
+            if entry[2] and getattr(self.tokenizer, "offset_tokens", False):
+                return OffsetToken.from_offsets(text, entry[0].tolist(), entry[1].tolist())
+            return _to_tokens(text, *entry)
+
+        count("cache_misses", 1)
+        tokens = self.tokenizer(text)
+        starts = np.fromiter((token.start for token in tokens), dtype=np.int64, count=len(tokens))
+        ends = np.fromiter((token.end for token in tokens), dtype=np.int64, count=len(tokens))
+        rebuilt = _to_tokens(text, starts, ends, True, None)
+        verbatim = all(token.text == copy.text and token.next_char == copy.next_char
+                       for token, copy in zip(tokens, rebuilt))
+        strings = None if verbatim else [[token.text for token in tokens], [token.next_char for token in tokens]]
+        self._put(key, (starts, ends, verbatim, strings))
+        return tokens
+
+    def tokenize(self, text: str) -> list[Token]:
+        return self.tokenizer.tokenize(text)
+
+    def tokenize_array(self, text: str) -> TokenArray:
+        """
+        Tokenize the text into a columnar token array, or rebuild it from the cache.
+
+        Args:
+            text (str): The text to tokenize.
+
+        Returns:
+            TokenArray: The tokens, with offsets into and text taken from the original text.
+        """
+
+        key = self.key(text)
+        entry = self._get(key)
+        if entry is not None:
+            count("cache_hits", 1)
+            count("tokens", len(entry[0]))
+            return TokenArray(text, entry[0], entry[1])
+
+        count("cache_misses", 1)
+        tokens = self.tokenizer.tokenize_array(text)
+        # Whether the tokens are slices of the text is unknown until they are built by `__call__`
+        self._put(key, (tokens.starts.copy(), tokens.ends.copy(), None, None))
+        return tokens
+
+    def clear(self) -> None:
+        """
+        Discard the entries kept in memory. The on-disk cache is left untouched.
+        """
+
+        self._entries.clear()
+
+    def _get(self, key: str) -> tuple | None:
+        """
+        Returns the (starts, ends, verbatim, strings) entry of a key, or None if it is not cached.
+        """
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            return entry
+        if self.cache_dir is None:
+            return None
+
+        try:
+            with open(self._entry_path(key), "rb") as entry_file:
+                buffer = entry_file.read()
+        except FileNotFoundError:
+            return None
+        try:
+            token_count, meta_length = self._HEADER.unpack_from(buffer)
+            position = self._HEADER.size
+            meta = json.loads(buffer[position:position + meta_length])
+            position += meta_length
+            if len(buffer) != position + 16 * token_count:
+                raise ValueError(f"Expected {token_count} token offsets.")
+            starts = np.frombuffer(buffer, dtype="<i8", count=token_count, offset=position)
+            ends = np.frombuffer(buffer, dtype="<i8", count=token_count, offset=position + 8 * token_count)
+            entry = (starts, ends, meta["verbatim"], meta["strings"])
+        except (struct.error, ValueError, KeyError, TypeError):
+            # A truncated or corrupt entry is a miss, and is overwritten when the text is tokenized again
+            count("cache_corrupt", 1)
+            return None
+        self._remember(key, entry)
+        return entry
+
+    def _put(self, key: str, entry: tuple) -> None:
+        """
+        Store an entry in memory and, if the cache has a directory, atomically on disk.
+        """
+
+        self._remember(key, entry)
+        if self.cache_dir is None:
+            return
+
+        starts, ends, verbatim, strings = entry
+        meta = json.dumps({"verbatim": verbatim, "strings": strings}).encode("utf-8")
+        entry_path = self._entry_path(key)
+        os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+        # A unique temporary file per write, so threads and processes writing the same entry do not collide
+        descriptor, temp_path = tempfile.mkstemp(suffix=".tmp", prefix=key, dir=os.path.dirname(entry_path))
+        try:
+            with os.fdopen(descriptor, "wb") as entry_file:
+                entry_file.write(self._HEADER.pack(len(starts), len(meta)))
+                entry_file.write(meta)
+                entry_file.write(np.ascontiguousarray(starts, dtype="<i8").tobytes())
+                entry_file.write(np.ascontiguousarray(ends, dtype="<i8").tobytes())
+            os.replace(temp_path, entry_path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    def _remember(self, key: str, entry: tuple) -> None:
+        """
+        Add an entry to the in-memory LRU, evicting the least recently used entries beyond `max_entries`.
+        """
+
+        # Entries are shared by every hit, so their arrays are made read-only
+        for offsets in entry[:2]:
+            offsets.flags.writeable = False
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key + ".tokens")
+
+    def __getstate__(self) -> dict:
+        # Workers share the on-disk cache, not the entries in memory
+        state = self.__dict__.copy()
+        state["_entries"] = OrderedDict()
+        del state["_config_digest"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._config_digest = hashlib.sha256(json.dumps(self.tokenizer.config(), sort_keys=True).encode("utf-8") + b"\0")
+
+
+def _to_tokens(text: str, starts: np.ndarray, ends: np.ndarray,
+               verbatim: bool | None, strings: list[list[str]] | None) -> list[Token]:
+    """
+    Rebuild tokens from their offsets, taking their text and following characters from the text,
+    or from `strings` if the tokens are not slices of it.
+    """
+
+    starts = starts.tolist()
+    ends = ends.tolist()
+    if not verbatim:
+        token_texts, next_chars = strings
+        return [Token(text=token_text, start=start, end=end, next_char=next_char)
+                for token_text, start, end, next_char in zip(token_texts, starts, ends, next_chars)]
+
+    if not starts:
+        return []
+    # The last token is followed by one character, the others by the gap before the next token
+    next_starts = starts[1:]
+    next_starts.append(ends[-1] + 1)
+    return [Token(text[start:end], start, end, text[end:next_start])
+            for start, end, next_start in zip(starts, ends, next_starts)]
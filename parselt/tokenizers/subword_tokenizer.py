@@ -0,0 +1,297 @@
+from __future__ import annotations
+from abc import abstractmethod
+from parselt.tokenizers.base_tokenizer import BaseTokenizer
+from parselt.core.token import Token
+import hashlib
+import re
+
+
+class SubwordTokenizer(BaseTokenizer):
+    """
+    A base class for tokenizers that split words into subword pieces from a vocabulary file.
+
+    Text is split into words and single punctuation characters, and every word is
+    segmented into pieces by `segment`. Segmentations are memoized per word, so a word
+    repeated across a text or a batch of texts is only segmented once. Pieces keep the
+    exact character offsets of the text they cover, so documents tokenized into pieces
+    are labeled from their entities like any other tokens. A token's text is its
+    vocabulary piece, e.g. "##ing", which can differ from the text it covers.
+
+    Args:
+        unk_token (str): The piece of words that cannot be segmented.
+        max_cached_words (int): The number of word segmentations kept in memory. The memo is
+            cleared when it is full.
+        **kwargs: The preprocessing options of `BaseTokenizer`.
+    """
+
+    word_pattern: re.Pattern = re.compile(r"\w+|[^\w\s]")
+
+    def __init__(self, unk_token: str = "[UNK]", max_cached_words: int = 1 << 16, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.unk_token = unk_token
+        self.max_cached_words = max_cached_words
+        self._segmentations: dict[str, tuple[tuple[str, int, int], ...]] = {}
+
+    def config(self) -> dict:
+        config = super().config()
+        config["unk_token"] = self.unk_token
+        return config
+
+    @abstractmethod
+    def segment(self, word: str) -> tuple[tuple[str, int, int], ...]:
+        """
+        Split a word into vocabulary pieces.
+
+        Args:
+            word (str): The word.
+
+        Returns:
+            tuple[tuple[str, int, int], ...]: The pieces, with their start and end offsets in the word.
+        """
+
+        pass
+
+    def tokenize(self, text: str) -> list[Token]:
+        """
+        Tokenize the input text into subword tokens.
+
+        Args:
+            text (str): The text to tokenize.
+
+        Returns:
+            list[Token]: A list of tokens, one per piece.
+        """
+
+        segmentations = self._segmentations
+        texts = []
+        starts = []
+        ends = []
+        for match in self.word_pattern.finditer(text):
+            word = match.group(0)
+            pieces = segmentations.get(word)
+            if pieces is None:
+                if len(segmentations) >= self.max_cached_words:
+                    segmentations.clear()
+                pieces = segmentations[word] = self.segment(word)
+            offset = match.start()
+            for piece, start, end in pieces:
+                texts.append(piece)
+                starts.append(offset + start)
+                ends.append(offset + end)
+
+        if not texts:
+            return []
+        # Every token is followed by the gap before the next token, the last one by one character
+        next_starts = starts[1:]
+        next_starts.append(ends[-1] + 1)
+        return [Token(text=piece, start=start, end=end, next_char=text[end:next_start])
+                for piece, start, end, next_start in zip(texts, starts, ends, next_starts)]
+
+    def __getstate__(self) -> dict:
+        # Worker processes build their own memo instead of receiving a copy of this one
+        state = self.__dict__.copy()
+        state["_segmentations"] = {}
+        return state
+
+
+class WordPieceTokenizer(SubwordTokenizer):
+    """
+    Splits words into the longest pieces of a WordPiece vocabulary, as used by BERT.
+
+    The vocabulary is compiled into two character tries, one for the pieces that start a
+    word and one for the continuation pieces, so the longest piece at a position is found
+    in one walk over the word instead of a lookup per candidate length.
+
+    Args:
+        vocab_path (str): The path to the vocabulary file, with one piece per line.
+        unk_token (str): The piece of words that cannot be segmented.
+        continuation_prefix (str): The prefix marking pieces that continue a word.
+        max_word_length (int): Words longer than this many characters are unknown.
+        max_cached_words (int): The number of word segmentations kept in memory.
+        **kwargs: The preprocessing options of `BaseTokenizer`, e.g. `lower=True` for uncased vocabularies.
+    """
+
+    def __init__(self, vocab_path: str, unk_token: str = "[UNK]",
+                 continuation_prefix: str = "##",
+                 max_word_length: int = 100,
+                 max_cached_words: int = 1 << 16, **kwargs) -> None:
+        super().__init__(unk_token=unk_token, max_cached_words=max_cached_words, **kwargs)
+        self.vocab_path = vocab_path
+        self.continuation_prefix = continuation_prefix
+        self.max_word_length = max_word_length
+        self.vocab: dict[str, int] = read_pieces(vocab_path)
+        self.vocab_hash: str = hash_file(vocab_path)
+
+        # Tries of nested dicts keyed by character. The piece ending at a node is stored under "".
+        self._initial_trie: dict = {}
+        self._continuation_trie: dict = {}
+        for piece in self.vocab:
+            if continuation_prefix and piece.startswith(continuation_prefix) and len(piece) > len(continuation_prefix):
+                node, characters = self._continuation_trie, piece[len(continuation_prefix):]
+            else:
+                node, characters = self._initial_trie, piece
+            for character in characters:
+                node = node.setdefault(character, {})
+            node[""] = piece
+
+    def config(self) -> dict:
+        config = super().config()
+        config["vocab"] = [self.vocab_path, self.vocab_hash]
+        config["continuation_prefix"] = self.continuation_prefix
+        config["max_word_length"] = self.max_word_length
+        return config
+
+    def segment(self, word: str) -> tuple[tuple[str, int, int], ...]:
+        """
+        Split a word into its longest vocabulary pieces, from left to right.
+
+        Args:
+            word (str): The word.
+
+        Returns:
+            tuple[tuple[str, int, int], ...]: The pieces, with their start and end offsets in the word,
+                or a single unknown piece covering the word if it cannot be segmented.
+        """
+
+        length = len(word)
+        if length > self.max_word_length:
+            return ((self.unk_token, 0, length),)
+
+        pieces = []
+        position = 0
+        trie = self._initial_trie
+        while position < length:
+            node = trie
+            match = None
+            index = position
+            while index < length:
+                node = node.get(word[index])
+                if node is None:
+                    break
+                index += 1
+                piece = node.get("")
+                if piece is not None:
+                    match = (piece, index)
+            if match is None:
+                return ((self.unk_token, 0, length),)
+            pieces.append((match[0], position, match[1]))
+            position = match[1]
+            trie = self._continuation_trie
+        return tuple(pieces)
+
+
+class BPETokenizer(SubwordTokenizer):
+    """
+    Splits words into pieces by byte-pair encoding merges, applied in rank order.
+
+    Every word starts as its characters, and the adjacent pair with the lowest rank in
+    the merges file is merged until no ranked pair is left. Merge ranks are compiled into
+    a dictionary keyed by pair.
+
+    Args:
+        merges_path (str): The path to the merges file, with one space separated pair per line in
+            rank order. A "#version" header line is skipped.
+        vocab_path (str | None): The path to a vocabulary file with one piece per line. Pieces
+            missing from it become `unk_token`. If None, every piece is kept.
+        unk_token (str): The piece replacing pieces missing from the vocabulary.
+        end_of_word_suffix (str): A suffix added to the last character of every word before merging,
+            e.g. "</w>", as in merges files that mark the ends of words.
+        max_cached_words (int): The number of word segmentations kept in memory.
+        **kwargs: The preprocessing options of `BaseTokenizer`.
+    """
+
+    def __init__(self, merges_path: str, vocab_path: str | None = None,
+                 unk_token: str = "<unk>",
+                 end_of_word_suffix: str = "",
+                 max_cached_words: int = 1 << 16, **kwargs) -> None:
+        super().__init__(unk_token=unk_token, max_cached_words=max_cached_words, **kwargs)
+        self.merges_path = merges_path
+        self.vocab_path = vocab_path
+        self.end_of_word_suffix = end_of_word_suffix
+        self.merges_hash: str = hash_file(merges_path)
+        self.vocab: dict[str, int] | None = read_pieces(vocab_path) if vocab_path is not None else None
+        self.vocab_hash: str | None = hash_file(vocab_path) if vocab_path is not None else None
+
+        self.ranks: dict[tuple[str, str], int] = {}
+        with open(merges_path, "r", encoding="utf-8") as merges_file:
+            for line in merges_file:
+                if line.startswith("#version"):
+                    continue
+                pair = line.split()
+                if len(pair) == 2:
+                    self.ranks.setdefault((pair[0], pair[1]), len(self.ranks))
+
+    def config(self) -> dict:
+        config = super().config()
+        config["merges"] = [self.merges_path, self.merges_hash]
+        config["vocab"] = [self.vocab_path, self.vocab_hash]
+        config["end_of_word_suffix"] = self.end_of_word_suffix
+        return config
+
+    def segment(self, word: str) -> tuple[tuple[str, int, int], ...]:
+        """
+        Merge the characters of a word into pieces.
+
+        Args:
+            word (str): The word.
+
+        Returns:
+            tuple[tuple[str, int, int], ...]: The pieces, with their start and end offsets in the word.
+        """
+
+        symbols = list(word)
+        symbols[-1] += self.end_of_word_suffix
+        bounds = list(range(len(word) + 1))
+        ranks = self.ranks
+
+        while len(symbols) > 1:
+            best_rank = None
+            for pair in zip(symbols, symbols[1:]):
+                rank = ranks.get(pair)
+                if rank is not None and (best_rank is None or rank < best_rank):
+                    best_rank, best = rank, pair
+            if best_rank is None:
+                break
+
+            # Merge every occurrence of the pair, from left to right
+            merged_symbols = []
+            merged_bounds = [0]
+            index = 0
+            while index < len(symbols):
+                if index + 1 < len(symbols) and symbols[index] == best[0] and symbols[index + 1] == best[1]:
+                    merged_symbols.append(best[0] + best[1])
+                    index += 2
+                else:
+                    merged_symbols.append(symbols[index])
+                    index += 1
+                merged_bounds.append(bounds[index])
+            symbols, bounds = merged_symbols, merged_bounds
+
+        vocab = self.vocab
+        return tuple((symbol if vocab is None or symbol in vocab else self.unk_token, bounds[i], bounds[i + 1])
+                     for i, symbol in enumerate(symbols))
+
+
+def read_pieces(vocab_path: str) -> dict[str, int]:
+    """
+    Read a vocabulary file with one piece per line, mapping every piece to its index among the
+    pieces. Blank lines are skipped and do not take an index, and a repeated piece keeps the
+    index of its first line.
+    """
+
+    vocab = {}
+    with open(vocab_path, "r", encoding="utf-8") as vocab_file:
+        for line in vocab_file:
+            piece = line.rstrip("\r\n")
+            if piece:
+                vocab.setdefault(piece, len(vocab))
+    return vocab
+
+
+def hash_file(file_path: str) -> str:
+    """
+    Returns the BLAKE2b hash of a file's content, so tokenizer configurations change with their files.
+    """
+
+    with open(file_path, "rb") as source_file:
+        return hashlib.blake2b(source_file.read(), digest_size=16).hexdigest()
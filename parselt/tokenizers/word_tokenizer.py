@@ -1,5 +1,9 @@
 from parselt.tokenizers.base_tokenizer import BaseTokenizer
-from parselt.core.token import Token
+from parselt.core.token import OffsetToken, Token
+from parselt.core.token_array import TokenArray
+from parselt.utils.instrumentation import count, stage
+from itertools import chain
+import numpy as np
 import re
 
 class WordTokenizer(BaseTokenizer):
@@ -7,6 +11,40 @@ class WordTokenizer(BaseTokenizer):
     Tokenizer that splits text into words based on whitespace and punctuation.
     """
     
+    pattern: re.Pattern = re.compile(r"\b[\w’-]+\b")
+    
+    def __init__(self, lower: bool = False, remove_punctuation: bool = False,
+                 normalize_whitespace: bool = False, remove_stopwords: bool = False,
+                 tokenize_numbers: bool = False, offset_tokens: bool = False) -> None:
+        """
+        Initialize the tokenizer.
+        
+        Args:
+            lower (bool): Whether to convert text to lowercase before tokenization.
+            remove_punctuation (bool): Whether to remove punctuation from the text.
+            normalize_whitespace (bool): Whether to normalize whitespace in the text.
+            remove_stopwords (bool): Whether to remove stopwords from the text.
+            tokenize_numbers (bool): Whether to tokenize numbers as separate tokens.
+            offset_tokens (bool): Whether to return `OffsetToken`s, which slice their text from the
+                text on access instead of copying it. Cannot be combined with preprocessing, which
+                changes the token texts.
+                
+        Raises:
+            ValueError: If `offset_tokens` is combined with a preprocessing option.
+        """
+        
+        super().__init__(lower=lower, remove_punctuation=remove_punctuation,
+                         normalize_whitespace=normalize_whitespace, remove_stopwords=remove_stopwords,
+                         tokenize_numbers=tokenize_numbers)
+        if offset_tokens and (lower or remove_punctuation or normalize_whitespace or remove_stopwords or tokenize_numbers):
+            raise ValueError("offset_tokens cannot be combined with preprocessing options.")
+        self.offset_tokens = offset_tokens
+        
+    def config(self) -> dict:
+        config = super().config()
+        config["offset_tokens"] = self.offset_tokens
+        return config
+    
     def tokenize(self, text: str) -> list[Token]:
         """
         Tokenize the input text into a list of tokens.
@@ -15,12 +53,16 @@ class WordTokenizer(BaseTokenizer):
             text (str): The text to tokenize.
             
         Returns:
-            list[Token]: A list of tokens.
+            list[Token]: A list of tokens, or of `OffsetToken`s if `offset_tokens` is set.
         """
         
+        if self.offset_tokens:
+            spans = [match.span() for match in self.pattern.finditer(text)]
+            return OffsetToken.from_offsets(text, [span[0] for span in spans], [span[1] for span in spans])
+        
         tokens = []
         previous_tok: Token = None
-        for match in re.finditer(r"\b[\w’-]+\b", text):
+        for match in self.pattern.finditer(text):
             start, end = match.span()
             token_text = match.group(0)
             token = Token(text=token_text, start=start, end=end, next_char=text[end:end+1])
@@ -30,4 +72,33 @@ class WordTokenizer(BaseTokenizer):
             previous_tok = token
         
         return tokens
-    
\ No newline at end of file
+    
+    def tokenize_array(self, text: str) -> TokenArray:
+        """
+        Tokenize the input text straight into a columnar token array, without creating token objects.
+        
+        Args:
+            text (str): The text to tokenize.
+            
+        Returns:
+            TokenArray: The tokens, with offsets into and text taken from the original text.
+        """
+        
+        starts, ends = self._spans(text)
+        count("tokens", len(starts))
+        return TokenArray(text, starts, ends)
+    
+    def _spans(self, text: str) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Preprocess the text and find the start and end offsets of its tokens in the original text.
+        """
+        
+        with stage("preprocess"):
+            preprocessed_text, offsets = self.preprocess_with_offsets(text)
+        with stage("tokenize"):
+            spans = np.fromiter(chain.from_iterable(match.span() for match in self.pattern.finditer(preprocessed_text)),
+                                dtype=np.int64).reshape(-1, 2)
+            starts, ends = spans[:, 0], spans[:, 1]
+            if offsets is not None:
+                starts, ends = self._map_spans(starts, ends, offsets, len(text))
+        return starts, ends
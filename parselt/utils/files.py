@@ -0,0 +1,79 @@
+from __future__ import annotations
+from fnmatch import translate
+from typing import Generator
+import os
+import re
+import zlib
+
+
+def shard_of(relative_path: str, num_shards: int) -> int:
+    """
+    Returns the shard of a file, from the CRC-32 of its path relative to the scanned directory.
+
+    The hash does not depend on the process, the machine or the other files, so every
+    worker of a job agrees on the shards without coordinating.
+
+    Args:
+        relative_path (str): The path of the file relative to the scanned directory, with "/" separators.
+        num_shards (int): The number of shards.
+
+    Returns:
+        int: The shard index, from 0 to `num_shards - 1`.
+    """
+
+    return zlib.crc32(relative_path.encode("utf-8")) % num_shards
+
+
+def scan_directory(directory_path: str,
+                   recursive: bool = False,
+                   extensions: tuple[str, ...] = (),
+                   pattern: str | None = None,
+                   shard_index: int = 0,
+                   num_shards: int = 1) -> Generator[str, None, None]:
+    """
+    Lazily list the files of a directory with `os.scandir`, filtered by name before any file is opened.
+
+    Entries are listed in name order, so the listing is the same on every run. Names are
+    filtered by extension and pattern before their type is checked, which `os.scandir`
+    usually answers without a `stat` call. Symbolic links to directories are not followed.
+
+    Args:
+        directory_path (str): The path to the directory.
+        recursive (bool): Whether to list the files of subdirectories as well.
+        extensions (tuple[str, ...]): Only list files ending with one of these extensions. Empty lists every file.
+        pattern (str | None): Only list files whose path relative to the directory, with "/"
+            separators, matches this glob pattern, e.g. "train/*.ann". "*" matches across "/".
+        shard_index (int): The shard to list, see `shard_of`.
+        num_shards (int): The number of shards the files are split into.
+
+    Yields:
+        str: The path of each file.
+    """
+
+    if num_shards < 1 or not 0 <= shard_index < num_shards:
+        raise ValueError(f"Invalid shard {shard_index} of {num_shards}, expected 0 <= shard_index < num_shards.")
+    matches = re.compile(translate(pattern)).match if pattern is not None else None
+
+    directories = [(directory_path, "")]
+    while directories:
+        path, prefix = directories.pop()
+        with os.scandir(path) as scan:
+            entries = sorted(scan, key=lambda entry: entry.name)
+
+        subdirectories = []
+        for entry in entries:
+            name = entry.name
+            if recursive and entry.is_dir(follow_symlinks=False):
+                subdirectories.append((entry.path, prefix + name + "/"))
+                continue
+            if extensions and not name.endswith(extensions):
+                continue
+            relative_path = prefix + name
+            if matches is not None and matches(relative_path) is None:
+                continue
+            if num_shards > 1 and shard_of(relative_path, num_shards) != shard_index:
+                continue
+            if entry.is_file():
+                yield entry.path
+        # Popped in reverse, so subdirectories are listed in name order after the files
+        directories.extend(reversed(subdirectories))
@@ -0,0 +1,237 @@
+from __future__ import annotations
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Any, Callable, Generator, TextIO
+import json
+
+
+class Sink:
+    """
+    Receives the measurements recorded while instrumentation is enabled.
+
+    Subclasses override `record_stage` and `record_count`.
+    """
+
+    def record_stage(self, name: str, seconds: float) -> None:
+        """
+        Record the wall time of one run of a stage.
+
+        Args:
+            name (str): The name of the stage, e.g. "read" or "tokenize".
+            seconds (float): The wall time of the run.
+        """
+
+        pass
+
+    def record_count(self, name: str, value: int) -> None:
+        """
+        Record a count, e.g. the bytes read or the entities parsed.
+
+        Args:
+            name (str): The name of the counter.
+            value (int): The amount to add to the counter.
+        """
+
+        pass
+
+
+class AggregateSink(Sink):
+    """
+    Aggregates measurements in memory: the calls and total, minimum and maximum wall time
+    of every stage, and the total of every counter.
+    """
+
+    def __init__(self) -> None:
+        self.stages: dict[str, dict[str, float]] = {}
+        self.counts: dict[str, int] = {}
+
+    def record_stage(self, name: str, seconds: float) -> None:
+        stage = self.stages.get(name)
+        if stage is None:
+            self.stages[name] = {"calls": 1, "seconds": seconds, "min": seconds, "max": seconds}
+            return
+        stage["calls"] += 1
+        stage["seconds"] += seconds
+        if seconds < stage["min"]:
+            stage["min"] = seconds
+        if seconds > stage["max"]:
+            stage["max"] = seconds
+
+    def record_count(self, name: str, value: int) -> None:
+        self.counts[name] = self.counts.get(name, 0) + value
+
+    def summary(self) -> dict[str, Any]:
+        """
+        Returns the aggregated measurements.
+
+        Returns:
+            dict[str, Any]: The stages, keyed by name, and the counters.
+        """
+
+        return {"stages": {name: dict(stage) for name, stage in self.stages.items()},
+                "counts": dict(self.counts)}
+
+    def reset(self) -> None:
+        """
+        Discard all measurements.
+        """
+
+        self.stages.clear()
+        self.counts.clear()
+
+
+class CallbackSink(Sink):
+    """
+    Passes every measurement to a callback as an event dictionary, either
+    `{"type": "stage", "name": ..., "seconds": ...}` or `{"type": "count", "name": ..., "value": ...}`.
+
+    Args:
+        callback (Callable[[dict[str, Any]], None]): Called with every event.
+    """
+
+    def __init__(self, callback: Callable[[dict[str, Any]], None]) -> None:
+        self.callback = callback
+
+    def record_stage(self, name: str, seconds: float) -> None:
+        self.callback({"type": "stage", "name": name, "seconds": seconds})
+
+    def record_count(self, name: str, value: int) -> None:
+        self.callback({"type": "count", "name": name, "value": value})
+
+
+class JSONLogSink(CallbackSink):
+    """
+    Writes every measurement as a line of JSON, with the events of `CallbackSink`.
+
+    Args:
+        log_file (TextIO): The open file to write to. The sink does not close it.
+    """
+
+    def __init__(self, log_file: TextIO) -> None:
+        super().__init__(self._write)
+        self.log_file = log_file
+
+    def _write(self, event: dict[str, Any]) -> None:
+        self.log_file.write(json.dumps(event) + "\n")
+
+
+class _Stage:
+    """
+    Times a stage and reports it to a sink when the block exits.
+    """
+
+    __slots__ = ("sink", "name", "start")
+
+    def __init__(self, sink: Sink, name: str) -> None:
+        self.sink = sink
+        self.name = name
+
+    def __enter__(self) -> _Stage:
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> bool:
+        self.sink.record_stage(self.name, perf_counter() - self.start)
+        return False
+
+
+class _NullStage:
+    """
+    The stage returned while instrumentation is disabled, which does nothing.
+    """
+
+    __slots__ = ()
+
+    def __enter__(self) -> _NullStage:
+        return self
+
+    def __exit__(self, *exc_info) -> bool:
+        return False
+
+
+_NULL_STAGE = _NullStage()
+_sink: Sink | None = None
+
+
+def enable(sink: Sink) -> None:
+    """
+    Start sending the measurements of loaders, tokenizers and labeling to a sink.
+
+    Measurements are only recorded in the current process, not in the worker
+    processes of parallel loading or tokenization.
+
+    Args:
+        sink (Sink): The sink receiving the measurements.
+    """
+
+    global _sink
+    _sink = sink
+
+
+def disable() -> None:
+    """
+    Stop recording measurements.
+    """
+
+    global _sink
+    _sink = None
+
+
+def is_enabled() -> bool:
+    """
+    Returns whether measurements are being recorded.
+    """
+
+    return _sink is not None
+
+
+@contextmanager
+def recording(sink: Sink | None = None) -> Generator[Sink, None, None]:
+    """
+    Record measurements to a sink for the duration of a block, restoring the previous sink afterwards.
+
+    Args:
+        sink (Sink | None): The sink receiving the measurements. Defaults to a new AggregateSink.
+
+    Yields:
+        Sink: The sink.
+    """
+
+    global _sink
+    previous = _sink
+    _sink = sink if sink is not None else AggregateSink()
+    try:
+        yield _sink
+    finally:
+        _sink = previous
+
+
+def stage(name: str) -> _Stage | _NullStage:
+    """
+    Time a block as a run of a stage: `with stage("tokenize"): ...`.
+
+    While instrumentation is disabled this returns a shared no-op context manager,
+    so an instrumented block costs one global lookup and an empty `with`.
+
+    Args:
+        name (str): The name of the stage.
+    """
+
+    sink = _sink
+    if sink is None:
+        return _NULL_STAGE
+    return _Stage(sink, name)
+
+
+def count(name: str, value: int) -> None:
+    """
+    Add to a counter, if instrumentation is enabled.
+
+    Args:
+        name (str): The name of the counter.
+        value (int): The amount to add.
+    """
+
+    sink = _sink
+    if sink is not None:
+        sink.record_count(name, value)
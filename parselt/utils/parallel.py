@@ -0,0 +1,116 @@
+from __future__ import annotations
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from collections import deque
+from itertools import islice
+from typing import Any, Callable, Generator, Iterable
+
+
+def _apply_chunk(fn: Callable[[Any], Any], items: list) -> list[tuple[Any, BaseException | None]]:
+    """
+    Apply a function to every item of a chunk, capturing exceptions per item.
+    
+    Args:
+        fn (Callable): The function to apply. Must be picklable.
+        items (list): The items of the chunk.
+        
+    Returns:
+        list[tuple[Any, BaseException | None]]: A (result, error) pair for every item.
+    """
+    
+    results = []
+    for item in items:
+        try:
+            results.append((fn(item), None))
+        except Exception as error:
+            results.append((None, error))
+    return results
+
+
+def _chunks(items: Iterable, chunksize: int) -> Generator[list, None, None]:
+    """
+    Split an iterable into lists of at most `chunksize` items.
+    """
+    
+    iterator = iter(items)
+    while chunk := list(islice(iterator, chunksize)):
+        yield chunk
+
+
+def parallel_map(fn: Callable[[Any], Any], 
+                 items: Iterable, 
+                 workers: int | None = None,
+                 ordered: bool = True,
+                 chunksize: int = 1,
+                 executor: Executor | None = None) -> Generator[tuple[Any, Any, BaseException | None], None, None]:
+    """
+    Lazily map a function over items, optionally fanning out over a process pool.
+    
+    Items are submitted in chunks and only a bounded number of chunks is in flight
+    at any time, so results are produced as a stream and the input iterable is
+    consumed incrementally. Exceptions raised by `fn` are captured per item instead
+    of aborting the whole map.
+    
+    Args:
+        fn (Callable): The function to apply. Must be picklable when `workers` > 1.
+        items (Iterable): The items to map over.
+        workers (int | None): The number of worker processes. None or 1 runs serially in-process.
+        ordered (bool): Whether to yield results in input order, or as soon as they complete.
+        chunksize (int): The number of items sent to a worker at once.
+        executor (Executor | None): An existing executor to use instead of creating a process pool.
+        
+    Yields:
+        tuple[Any, Any, BaseException | None]: The item, its result, and the exception raised
+            while processing it (None on success).
+    """
+    
+    if chunksize < 1:
+        raise ValueError("chunksize must be at least 1.")
+    
+    if executor is None and (workers is None or workers <= 1):
+        for item in items:
+            try:
+                yield item, fn(item), None
+            except Exception as error:
+                yield item, None, error
+        return
+    
+    owns_executor = executor is None
+    if owns_executor:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    max_in_flight = 2 * (workers or getattr(executor, "_max_workers", 1))
+        
+    try:
+        chunks = _chunks(items, chunksize)
+        pending: deque[tuple[list, Future]] = deque()
+        
+        def submit_next() -> bool:
+            chunk = next(chunks, None)
+            if chunk is None:
+                return False
+            pending.append((chunk, executor.submit(_apply_chunk, fn, chunk)))
+            return True
+        
+        while len(pending) < max_in_flight and submit_next():
+            pass
+        
+        while pending:
+            if ordered:
+                chunk, future = pending.popleft()
+            else:
+                wait([future for _, future in pending], return_when=FIRST_COMPLETED)
+                index = next(i for i, (_, future) in enumerate(pending) if future.done())
+                chunk, future = pending[index]
+                del pending[index]
+                
+            try:
+                chunk_results = future.result()
+            except Exception as error:
+                # The worker itself failed (e.g. it crashed or the chunk could not be pickled)
+                chunk_results = [(None, error)] * len(chunk)
+                
+            submit_next()
+            for item, (result, error) in zip(chunk, chunk_results):
+                yield item, result, error
+    finally:
+        if owns_executor:
+            executor.shutdown(wait=True, cancel_futures=True)
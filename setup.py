@@ -5,7 +5,7 @@ setup(name='Parselt',
       description='A package for reading and working with .ann files',
       author='Logan Mills',
       url='github.com/millslogan/parselt',
-      packages=find_packages(),
+      packages=find_packages(exclude=['benchmarks', 'benchmarks.*']),
       py_modules=['parselt', 'parselt.core'],
       python_requires='>=3.12'
 )
@@ -0,0 +1,49 @@
+import copy
+import pickle
+import unittest
+from parselt import Entity, Relation, Token
+
+class AnnotationSlotsTest(unittest.TestCase):
+    def setUp(self):
+        self.token = Token("Obama", 7, 12, " ")
+        self.token.label = "B-Person"
+        self.entity = Entity("Barack Obama", 0, 12, "Person", 1)
+        self.other = Entity("Hawaii", 26, 32, "Location", 2)
+        self.relation = Relation(1, "Born_In", self.entity, self.other)
+
+    def test_unknown_attributes(self):
+        for annotation in (self.token, self.entity, self.relation):
+            self.assertFalse(hasattr(annotation, "__dict__"))
+            with self.assertRaises(AttributeError):
+                annotation.confidence = 1.0
+
+    def test_equality_and_hashing(self):
+        # Tokens and entities compare and hash by text and offsets only
+        self.assertEqual(self.token, Token("Obama", 7, 12, "\n"))
+        self.assertEqual(hash(self.token), hash(Token("Obama", 7, 12)))
+        self.assertNotEqual(self.token, Token("Obama", 7, 13))
+        self.assertEqual(self.entity, Entity("Barack Obama", 0, 12, "Location", 5))
+        self.assertEqual(self.entity, Token("Barack Obama", 0, 12))
+        self.assertEqual(hash(self.entity), hash(Token("Barack Obama", 0, 12)))
+        self.assertEqual(len({self.entity, Entity("Barack Obama", 0, 12, "Person", 3), self.other}), 2)
+        self.assertNotEqual(self.token, "Obama")
+
+        # Relations compare by their fields and are not hashable
+        self.assertEqual(self.relation, Relation(1, "Born_In", Entity("Barack Obama", 0, 12, "Person", 1), self.other))
+        self.assertNotEqual(self.relation, Relation(2, "Born_In", self.entity, self.other))
+        with self.assertRaises(TypeError):
+            hash(self.relation)
+
+    def test_pickle_round_trip(self):
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            token, entity, relation = pickle.loads(pickle.dumps((self.token, self.entity, self.relation), protocol))
+            self.assertEqual((token.text, token.start, token.end, token.next_char, token.label),
+                             ("Obama", 7, 12, " ", "B-Person"))
+            self.assertEqual((entity.text, entity.start, entity.end, entity.label, entity.entity_id),
+                             ("Barack Obama", 0, 12, "Person", 1))
+            self.assertEqual(relation, self.relation)
+            self.assertIs(relation.arg_1, entity)
+        self.assertEqual(copy.deepcopy(self.relation), self.relation)
+
+if __name__ == "__main__":
+    unittest.main()
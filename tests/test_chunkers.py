@@ -0,0 +1,56 @@
+import unittest
+from parselt import Document, Entity
+from parselt.chunkers import SentenceChunker, WindowChunker
+from parselt.tokenizers import WordTokenizer
+from intervaltree import Interval, IntervalTree
+
+class ChunkerTest(unittest.TestCase):
+    def setUp(self):
+        text = "Dr. Smith met Barack Obama in New York City. He flew home! The end"
+        spans = [("Dr. Smith", "Person"), ("Barack Obama", "Person"), ("New York City", "Location")]
+        intervals = []
+        for entity_id, (entity_text, label) in enumerate(spans, start=1):
+            start = text.index(entity_text)
+            end = start + len(entity_text)
+            intervals.append(Interval(start, end, Entity(entity_text, start, end, label, entity_id)))
+        self.document = Document("doc", "", text, IntervalTree(intervals), [])
+        self.document.tokenize(WordTokenizer(), use_bio_labeling=True)
+
+    def assert_covers_document(self, chunks, overlapping=False):
+        labels = [token.label for token in self.document.tokens]
+        for chunk in chunks:
+            self.assertFalse(labels[chunk.token_start].startswith("I-"), chunk)
+            if chunk.token_end < len(labels):
+                self.assertFalse(labels[chunk.token_end].startswith("I-"), chunk)
+            self.assertEqual(chunk.text, self.document.text[chunk.start:chunk.end])
+            self.assertEqual(chunk.local_offsets()[0].tolist(), [0, chunk.tokens[0].end - chunk.start])
+        if not overlapping:
+            self.assertEqual([(a.token_end, b.token_start) for a, b in zip(chunks, chunks[1:])],
+                             [(a.token_end, a.token_end) for a in chunks[:-1]])
+        self.assertEqual((chunks[0].token_start, chunks[-1].token_end), (0, len(labels)))
+
+    def test_sentences(self):
+        chunks = list(SentenceChunker().chunk(self.document))
+        self.assertEqual([chunk.text for chunk in chunks],
+                         ["Dr. Smith met Barack Obama in New York City", "He flew home", "The end"])
+        self.assertEqual([entity.text for entity in chunks[0].entities], ["Dr. Smith", "Barack Obama", "New York City"])
+        self.assert_covers_document(chunks)
+
+    def test_sentences_max_tokens(self):
+        chunks = list(SentenceChunker(max_tokens=4).chunk(self.document))
+        self.assertEqual([chunk.text for chunk in chunks[:3]], ["Dr. Smith met", "Barack Obama in", "New York City"])
+        self.assert_covers_document(chunks)
+
+    def test_windows(self):
+        chunks = list(WindowChunker(size=2).chunk(self.document))
+        self.assertEqual([chunk.text for chunk in chunks[:5]], ["Dr. Smith", "met", "Barack Obama", "in", "New York City"])
+        self.assert_covers_document(chunks)
+
+        strided = list(WindowChunker(size=4, stride=2).chunk(self.document))
+        self.assertTrue(all(len(chunk) <= 4 for chunk in strided))
+        self.assert_covers_document(strided, overlapping=True)
+        with self.assertRaises(ValueError):
+            WindowChunker(size=2, stride=3)
+
+if __name__ == "__main__":
+    unittest.main()
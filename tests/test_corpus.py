@@ -0,0 +1,61 @@
+import unittest
+from parselt import Corpus
+from parselt.loaders import BratLoader, JSONLoader
+
+class CorpusTest(unittest.TestCase):
+    def setUp(self):
+        self.corpus = Corpus.from_loader(BratLoader(), "tests/input/brat/joined")
+
+    def test_from_loader(self):
+        self.assertEqual(len(self.corpus), 2)
+        self.assertIn("sample1", self.corpus)
+        self.assertEqual(self.corpus["sample2"].get_entity_by_id(2).text, "SpaceX")
+        self.assertEqual(len(Corpus.from_loader(JSONLoader(), "tests/input/jsonl/samples.jsonl")), 2)
+
+    def test_labels_match_documents(self):
+        self.assertEqual(self.corpus.entity_labels(),
+                         set().union(*(document.entity_labels() for document in self.corpus)))
+        self.assertEqual(self.corpus.relation_labels(),
+                         set().union(*(document.relation_labels() for document in self.corpus)))
+        self.assertEqual(sum(self.corpus.entity_label_counts().values()),
+                         sum(len(document.entities) for document in self.corpus))
+
+    def test_inverted_index(self):
+        with_title = self.corpus.documents_with_entity_label("Title")
+        self.assertEqual([document.id for document in with_title], ["sample1"])
+        self.assertEqual(self.corpus.documents_with_entity_label("Missing"), [])
+
+        labels = [interval.data.label for document in self.corpus for interval in document.entities]
+        location = [label for label in labels if label == "Location"]
+        self.assertTrue(all(label is location[0] for label in location))
+
+    def test_remove_and_reindex(self):
+        sample1 = self.corpus.remove("sample1")
+        self.assertNotIn("Title", self.corpus.entity_labels())
+        self.assertEqual(self.corpus.entity_index.count("Title"), 0)
+        self.assertIsNotNone(self.corpus.entity_index.id_of("Title"))
+
+        self.corpus.add(sample1)
+        for interval in sample1.entities:
+            interval.data.label = "Renamed"
+        self.corpus.reindex("sample1")
+        self.assertEqual(self.corpus.entity_label_counts()["Renamed"], len(sample1.entities))
+        self.assertNotIn("Title", self.corpus.entity_labels())
+
+    def test_duplicate_ids(self):
+        sample1 = self.corpus["sample1"]
+        duplicate = BratLoader().load_file("tests/input/brat/joined/sample1.ann")
+        with self.assertRaises(ValueError):
+            self.corpus.add(duplicate)
+        self.assertIs(self.corpus["sample1"], sample1)
+        with self.assertRaises(ValueError):
+            Corpus([sample1, duplicate])
+
+        self.corpus.add(duplicate, replace=True)
+        self.assertIs(self.corpus["sample1"], duplicate)
+        self.assertEqual(len(self.corpus), 2)
+        self.assertEqual(sum(self.corpus.entity_label_counts().values()),
+                         sum(len(document.entities) for document in self.corpus))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+from parselt import Document, Entity
+from parselt.tokenizers import WordTokenizer
+from intervaltree import Interval
+
+class DocumentSpanTest(unittest.TestCase):
+    def setUp(self):
+        text = "Alice works at Acme in Paris."
+        spans = [("Alice", "Person"), ("Acme", "Organization"), ("Paris", "Location"), ("Acme in Paris", "Address")]
+        intervals = []
+        for entity_id, (entity_text, label) in enumerate(spans, start=1):
+            start = text.index(entity_text)
+            intervals.append(Interval(start, start + len(entity_text),
+                                      Entity(entity_text, start, start + len(entity_text), label, entity_id)))
+        # A plain list of intervals, as the JSON loader passes
+        self.document = Document("doc", "", text, intervals, [])
+
+    def test_token_queries(self):
+        for columnar in (False, True):
+            self.document.tokenize(WordTokenizer(), columnar=columnar)
+            self.assertEqual(self.document.token_index_at(0), 0)
+            self.assertEqual(self.document.token_index_at(3), 0)
+            self.assertIsNone(self.document.token_index_at(5))
+            self.assertEqual(self.document.token_index_at(15), 3)
+            self.assertEqual(self.document.token_index_at(27), 5)
+            self.assertIsNone(self.document.token_index_at(28))
+            self.assertEqual([token.text for token in self.document.tokens_in_span(8, 17)], ["works", "at", "Acme"])
+            self.assertEqual([token.text for token in self.document.tokens_in_span(8, 17, contained=True)], ["at"])
+            self.assertEqual(self.document.token_span(5, 6), (1, 1))
+
+    def test_entity_queries(self):
+        self.assertEqual([entity.text for entity in self.document.entities_in_span(16, 21)],
+                         ["Acme", "Acme in Paris"])
+        self.assertEqual([entity.text for entity in self.document.entities_in_span(0, 28, contained=True)],
+                         ["Alice", "Acme", "Acme in Paris", "Paris"])
+        self.document.tokenize(WordTokenizer())
+        self.assertEqual([entity.text for entity in self.document.entities_in_token_span(3, 6)],
+                         ["Acme", "Acme in Paris", "Paris"])
+
+if __name__ == "__main__":
+    unittest.main()
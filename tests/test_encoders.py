@@ -0,0 +1,61 @@
+import unittest
+import numpy as np
+from parselt import Corpus
+from parselt.encoders import DocumentEncoder, LabelTable, Vocabulary
+from parselt.loaders import BratLoader
+from parselt.tokenizers import WordTokenizer
+
+class DocumentEncoderTest(unittest.TestCase):
+    def setUp(self):
+        self.corpus = Corpus.from_loader(BratLoader(), "tests/input/brat/joined")
+        for document in self.corpus:
+            document.tokenize(WordTokenizer(), use_bio_labeling=True)
+        self.vocabulary = Vocabulary.build(self.corpus)
+        self.label_table = LabelTable.from_documents(self.corpus, use_bio_labeling=True)
+
+    def test_label_table(self):
+        self.assertEqual(self.label_table.labels[:3], ["O", "B-Date", "I-Date"])
+        self.assertEqual(len(self.label_table), 1 + 2 * len(self.corpus.entity_labels()))
+        with self.assertRaises(ValueError):
+            self.label_table.encode(["B-Missing"])
+
+    def test_encode(self):
+        encoder = DocumentEncoder(self.vocabulary, self.label_table)
+        batch = encoder.encode(self.corpus)
+        documents = list(self.corpus)
+        self.assertEqual(batch.input_ids.shape, (2, max(len(document.tokens) for document in documents)))
+        for row, document in enumerate(documents):
+            length = len(document.tokens)
+            self.assertEqual(batch.lengths[row], length)
+            self.assertEqual(self.vocabulary.decode(batch.input_ids[row, :length]),
+                             [token.text for token in document.tokens])
+            self.assertEqual(self.label_table.decode(batch.label_ids[row, :length]),
+                             [token.label for token in document.tokens])
+            self.assertEqual(batch.offsets[row, :length].tolist(),
+                             [[token.start, token.end] for token in document.tokens])
+            self.assertTrue((batch.input_ids[row, length:] == self.vocabulary.pad_id).all())
+            self.assertTrue((batch.label_ids[row, length:] == -100).all())
+            self.assertEqual(batch.attention_mask[row].sum(), length)
+
+    def test_columnar_matches_tokens(self):
+        encoder = DocumentEncoder(self.vocabulary, self.label_table, max_length=5)
+        expected = encoder.encode(self.corpus)
+        for document in self.corpus:
+            document.tokenize(WordTokenizer(), use_bio_labeling=True, columnar=True)
+        batch = encoder.encode(self.corpus)
+        self.assertEqual(batch.input_ids.shape, (2, 5))
+        np.testing.assert_array_equal(batch.input_ids, expected.input_ids)
+        np.testing.assert_array_equal(batch.label_ids, expected.label_ids)
+        np.testing.assert_array_equal(batch.offsets, expected.offsets)
+
+    def test_bucketed_batches(self):
+        encoder = DocumentEncoder(self.vocabulary, pad_to_multiple_of=8)
+        batches = list(encoder.batches(self.corpus, batch_size=1, shuffle=True, seed=0))
+        self.assertEqual(sorted(id for batch in batches for id in batch.document_ids), ["sample1", "sample2"])
+        self.assertTrue(all(batch.input_ids.shape[1] % 8 == 0 for batch in batches))
+        self.assertIsNone(batches[0].label_ids)
+        unknown = Vocabulary(["Barack"]).encode(["Barack", "Obama"])
+        self.assertEqual(unknown.tolist(), [2, 1])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import shutil
+import tempfile
+import unittest
+from parselt.chunkers import SentenceChunker
+from parselt.exporters import BratExporter, CoNLLExporter, JSONExporter
+from parselt.loaders import BratLoader, JSONLoader
+from parselt.tokenizers import WordTokenizer
+
+class ExporterTest(unittest.TestCase):
+    def setUp(self):
+        self.documents = sorted(BratLoader().load_directory("tests/input/brat/joined"), key=lambda document: document.id)
+        self.directory = tempfile.TemporaryDirectory()
+        self.output = self.directory.name
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def assert_same_annotations(self, documents):
+        documents = sorted(documents, key=lambda document: document.id)
+        self.assertEqual([document.id for document in documents], [document.id for document in self.documents])
+        for document, expected in zip(documents, self.documents):
+            self.assertEqual(document.text, expected.text)
+            self.assertEqual(sorted(map(repr, (interval.data for interval in document.entities))),
+                             sorted(map(repr, (interval.data for interval in expected.entities))))
+            self.assertEqual(list(map(str, document.relations)), list(map(str, expected.relations)))
+
+    def test_brat_round_trip(self):
+        written = BratExporter().export(self.documents, self.output)
+        self.assertEqual(written, 2)
+        self.assert_same_annotations(BratLoader().load_directory(self.output))
+
+    def test_export_recursively_loaded_corpus(self):
+        with tempfile.TemporaryDirectory() as corpus:
+            for split in ("train", "train/extra"):
+                shutil.copytree("tests/input/brat/joined", os.path.join(corpus, split))
+            documents = list(BratLoader().load_directory(corpus, recursive=True))
+        self.assertEqual(BratExporter().export(documents, self.output), 4)
+        self.assertTrue(os.path.exists(os.path.join(self.output, "train", "extra", "sample1.txt")))
+        self.assertEqual(sorted(document.id for document in BratLoader().load_directory(self.output, recursive=True)),
+                         ["train/extra/sample1", "train/extra/sample2", "train/sample1", "train/sample2"])
+
+    def test_json_round_trip_with_tokens(self):
+        for document in self.documents:
+            document.tokenize(WordTokenizer(), use_bio_labeling=True, columnar=document.id == "sample2")
+        JSONExporter(indent=2).export(self.documents, self.output)
+        path = os.path.join(self.output, "lines", "corpus.jsonl")
+        JSONExporter(lines=True).export(self.documents, path, workers=2)
+
+        for documents in (list(JSONLoader().load_directory(self.output)), list(JSONLoader().load_directory(os.path.dirname(path)))):
+            self.assert_same_annotations(documents)
+            for document, expected in zip(sorted(documents, key=lambda document: document.id), self.documents):
+                self.assertEqual([(token.text, token.start, token.end, token.next_char, token.label) for token in document.tokens],
+                                 [(token.text, token.start, token.end, token.next_char, token.label) for token in expected.tokens])
+
+    def test_conll(self):
+        for document in self.documents:
+            document.tokenize(WordTokenizer())
+        path = os.path.join(self.output, "corpus.conll")
+        CoNLLExporter(sentence_chunker=SentenceChunker(), include_offsets=True).export(self.documents, path)
+        with open(path, encoding="utf-8") as conll_file:
+            lines = conll_file.read().split("\n")
+        self.assertEqual(lines[:4], ["-DOCSTART- O", "", "Barack 0 6 B-Person", "Obama 7 12 I-Person"])
+        self.assertEqual(sum(1 for line in lines if line.startswith("-DOCSTART-")), 2)
+        self.assertEqual(sum(1 for line in lines if line.count(" ") == 3), sum(len(document.tokens) for document in self.documents))
+
+        # BIOES labels are converted, plain labels get prefixes
+        exporter = CoNLLExporter()
+        self.assertEqual(exporter._to_bio(["S-PER", "O", "B-LOC", "I-LOC", "E-LOC", "ORG", "ORG", "O"]),
+                         ["B-PER", "O", "B-LOC", "I-LOC", "I-LOC", "B-ORG", "I-ORG", "O"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import io
+import json
+import unittest
+from parselt.loaders import BratLoader, JSONLoader
+from parselt.tokenizers import WordTokenizer
+from parselt.utils import instrumentation
+from parselt.utils.instrumentation import AggregateSink, CallbackSink, JSONLogSink
+
+class InstrumentationTest(unittest.TestCase):
+    def tearDown(self):
+        instrumentation.disable()
+
+    def test_disabled_by_default(self):
+        self.assertFalse(instrumentation.is_enabled())
+        with instrumentation.stage("read") as stage:
+            pass
+        self.assertIs(stage, instrumentation.stage("tokenize"))
+
+    def test_aggregate_brat_load_and_tokenize(self):
+        with instrumentation.recording() as sink:
+            documents = list(BratLoader().load_directory("tests/input/brat/joined"))
+            for document in documents:
+                document.tokenize(WordTokenizer(), columnar=True)
+        self.assertFalse(instrumentation.is_enabled())
+        
+        summary = sink.summary()
+        for name in ("read", "parse_annotations", "build_index", "resolve_relations", "preprocess", "tokenize", "label"):
+            self.assertIn(name, summary["stages"])
+        self.assertEqual(summary["stages"]["label"]["calls"], len(documents))
+        self.assertEqual(summary["counts"]["entities"], sum(len(document.entities) for document in documents))
+        self.assertEqual(summary["counts"]["relations"], sum(len(document.relations) for document in documents))
+        self.assertEqual(summary["counts"]["tokens"], sum(len(document.tokens) for document in documents))
+        self.assertGreater(summary["counts"]["bytes_read"], 0)
+
+    def test_callback_and_json_log(self):
+        events = []
+        instrumentation.enable(CallbackSink(events.append))
+        JSONLoader().load_file("tests/input/json/sample1.json")
+        self.assertIn({"type": "count", "name": "entities", "value": 4}, events)
+        
+        log = io.StringIO()
+        instrumentation.enable(JSONLogSink(log))
+        WordTokenizer()("Barack Obama was born in Hawaii.")
+        lines = [json.loads(line) for line in log.getvalue().splitlines()]
+        self.assertEqual([line["name"] for line in lines], ["preprocess", "tokenize", "tokens"])
+        self.assertEqual(lines[-1]["value"], 6)
+
+if __name__ == "__main__":
+    unittest.main()
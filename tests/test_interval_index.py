@@ -0,0 +1,48 @@
+import pickle
+import random
+import unittest
+from parselt.core.interval_index import IntervalIndex
+from intervaltree import Interval, IntervalTree
+
+class IntervalIndexTest(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(7)
+        self.intervals = []
+        for i in range(300):
+            begin = rng.randrange(1000)
+            self.intervals.append(Interval(begin, begin + rng.randrange(1, 40), i))
+        self.index = IntervalIndex(self.intervals)
+        self.tree = IntervalTree(self.intervals)
+
+    def test_matches_interval_tree(self):
+        self.assertEqual(len(self.index), len(self.tree))
+        self.assertEqual(set(self.index), set(self.tree))
+        keys = [(interval.begin, interval.end) for interval in self.index]
+        self.assertEqual(keys, sorted(keys))
+        for begin in range(0, 1040, 7):
+            end = begin + 15
+            self.assertEqual(set(self.index.overlap(begin, end)), self.tree.overlap(begin, end))
+            self.assertEqual(set(self.index.envelop(begin, end)), self.tree.envelop(begin, end))
+            self.assertEqual(set(self.index.at(begin)), self.tree.at(begin))
+            self.assertEqual(self.index.overlaps(begin, end), self.tree.overlaps(begin, end))
+        self.assertIn(self.intervals[0], self.index)
+        self.assertNotIn(Interval(0, 2000, None), self.index)
+
+    def test_batch(self):
+        begins = list(range(0, 1040, 11))
+        ends = [begin + 20 for begin in begins]
+        for contained in (False, True):
+            queries, matches = self.index.overlap_batch(begins, ends, contained=contained)
+            for i, (begin, end) in enumerate(zip(begins, ends)):
+                expected = self.tree.envelop(begin, end) if contained else self.tree.overlap(begin, end)
+                self.assertEqual({self.index[j] for j in matches[queries == i]}, expected)
+
+    def test_pickle_and_errors(self):
+        copy = pickle.loads(pickle.dumps(self.index))
+        self.assertEqual(copy.overlap(100, 200), self.index.overlap(100, 200))
+        self.assertEqual(IntervalIndex().overlap(0, 10), [])
+        with self.assertRaises(ValueError):
+            IntervalIndex([Interval(5, 5, None)])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,13 @@
+import io
+import json
+import os
+import shutil
+import tempfile
 import unittest
-from parselt.loaders import BratLoader, JSONLoader
-from parselt import Document
+from unittest import mock
+from parselt.loaders import BratLoader, CoNLLLoader, JSONLoader, CorpusCache, CorpusManifest
+from parselt.tokenizers import WordTokenizer
+from parselt import Document, Entity, LazyDocument
 
 class LoaderTestCase(unittest.TestCase):
     def helper_test_load_sample1(self, document: Document, directory: str = "tests/input/brat/joined", extension: str = ".ann"):
@@ -81,6 +88,186 @@ class TestBratLoader(LoaderTestCase):
             elif document.id == "sample2":
                 self.helper_test_load_sample2(document, directory="tests/input/brat/anns")
 
+    def test_get_entity_by_id(self):
+        loader = BratLoader()
+        document = loader.load_file("tests/input/brat/joined/sample2.ann")
+        entity = document.get_entity_by_id(2)
+        self.assertIsInstance(entity, Entity)
+        self.assertEqual(entity.text, "SpaceX")
+        self.assertIsNone(document.get_entity_by_id(42))
+        self.assertIs(document.relations[0].arg_2, entity)
+
+    def test_load_directory_parallel(self):
+        loader = BratLoader()
+        documents = list(loader.load_directory("tests/input/brat/joined", workers=2, ordered=False))
+        self.assertEqual(len(documents), 2)
+        for document in documents:
+            if document.id == "sample1":
+                self.helper_test_load_sample1(document)
+            elif document.id == "sample2":
+                self.helper_test_load_sample2(document)
+
+    def test_load_directory_reports_failures(self):
+        loader = JSONLoader()
+        failures = []
+        documents = list(loader.load_directory("tests/input/brat/joined", workers=2, extensions=(),
+                                               on_error=lambda path, error: failures.append(path)))
+        self.assertEqual(len(documents), 0)
+        self.assertEqual(len(failures), 4)
+
+    def test_load_directory_lazy(self):
+        loader = BratLoader(text_dir="tests/input/brat/txts")
+        documents = list(loader.load_directory("tests/input/brat/anns", lazy=True))
+        self.assertEqual(len(documents), 2)
+        eager = loader.load_file("tests/input/brat/anns/sample1.ann")
+        for document in documents:
+            self.assertIsInstance(document, LazyDocument)
+            # Every attribute of a document is set, or loaded through a property
+            for name in vars(eager):
+                self.assertTrue(name in vars(document) or isinstance(getattr(LazyDocument, name, None), property), name)
+            self.assertFalse(document.is_text_loaded)
+            self.assertFalse(document.are_annotations_loaded)
+        
+        document = next(document for document in documents if document.id == "sample2")
+        self.assertEqual(document.entity_labels(), {"Person", "Organization", "Date"})
+        self.assertTrue(document.are_annotations_loaded)
+        self.assertFalse(document.is_text_loaded)
+        self.helper_test_load_sample2(document, directory="tests/input/brat/anns")
+        self.assertTrue(document.is_text_loaded)
+        
+        with self.assertRaises(ValueError):
+            next(loader.load_directory("tests/input/brat/anns", lazy=True, workers=2))
+
+    def test_load_directory_with_cache(self):
+        with tempfile.TemporaryDirectory() as directory:
+            corpus = os.path.join(directory, "corpus")
+            shutil.copytree("tests/input/brat/joined", corpus)
+            cache = CorpusCache(os.path.join(directory, "corpus.cache"), tokenizer=WordTokenizer(), use_bio_labeling=True)
+            loader = BratLoader()
+            
+            cold = {document.id: document for document in loader.load_directory(corpus, cache=cache)}
+            self.assertTrue(os.path.exists(cache.cache_path))
+            key = cache.make_key(loader, loader.list_files(corpus))
+            self.assertTrue(cache.is_valid(key))
+            
+            warm = {document.id: document for document in loader.load_directory(corpus, cache=cache)}
+            self.assertEqual(warm.keys(), cold.keys())
+            for document_id, document in warm.items():
+                self.assertEqual(document.text, cold[document_id].text)
+                self.assertEqual(len(document.entities), len(cold[document_id].entities))
+                self.assertEqual([str(relation) for relation in document.relations],
+                                 [str(relation) for relation in cold[document_id].relations])
+                self.assertEqual([(token.text, token.label) for token in document],
+                                 [(token.text, token.label) for token in cold[document_id]])
+            self.assertEqual(cache.get("sample2").get_entity_by_id(2).text, "SpaceX")
+            cache.close()
+            
+            with open(os.path.join(corpus, "sample1.ann"), "a", encoding="utf-8") as ann_file:
+                ann_file.write("\nT5\tPerson 13 16\twas\n")
+            self.assertFalse(cache.is_valid(cache.make_key(loader, loader.list_files(corpus))))
+            reloaded = {document.id: document for document in loader.load_directory(corpus, cache=cache)}
+            self.assertEqual(len(reloaded["sample1"].entities), 5)
+            cache.close()
+
+            # The key depends on the loader configuration
+            self.assertNotEqual(cache.make_key(loader, loader.list_files(corpus)),
+                                cache.make_key(BratLoader(text_dir=corpus), loader.list_files(corpus)))
+            
+            # The documents written are tokenized copies
+            documents = list(loader.load_directory(corpus))
+            written = list(cache.write(cache.make_key(loader, loader.list_files(corpus)), documents))
+            self.assertFalse(any(document.is_tokenized for document in documents))
+            self.assertTrue(all(document.is_tokenized for document in written))
+            cache.close()
+            
+    def test_cache_not_committed_on_failure(self):
+        with tempfile.TemporaryDirectory() as directory:
+            corpus = os.path.join(directory, "corpus")
+            shutil.copytree("tests/input/brat/joined", corpus)
+            with open(os.path.join(corpus, "broken.txt"), "w", encoding="utf-8") as text_file:
+                text_file.write("John")
+            with open(os.path.join(corpus, "broken.ann"), "w", encoding="utf-8") as ann_file:
+                ann_file.write("T1\tPerson x y\tJohn\n")
+            cache = CorpusCache(os.path.join(directory, "corpus.cache"))
+            loader = BratLoader()
+            failures = []
+            documents = list(loader.load_directory(corpus, cache=cache,
+                                                   on_error=lambda path, error: failures.append(path)))
+            self.assertEqual(failures, [os.path.join(corpus, "broken.ann")])
+            self.assertEqual(len(documents), 2)
+            self.assertFalse(os.path.exists(cache.cache_path))
+            self.assertEqual(os.listdir(directory), ["corpus"])
+
+    def test_load_directory_with_manifest(self):
+        with tempfile.TemporaryDirectory() as directory:
+            corpus = os.path.join(directory, "corpus")
+            shutil.copytree("tests/input/brat/joined", corpus)
+            manifest = CorpusManifest(os.path.join(directory, "state"), tokenizer=WordTokenizer())
+            loader = BratLoader()
+            sample1 = os.path.abspath(os.path.join(corpus, "sample1.ann"))
+            sample2 = os.path.abspath(os.path.join(corpus, "sample2.ann"))
+            
+            annotations = lambda paths: sorted(path for path in paths if path.endswith(".ann"))
+            
+            documents = {document.id: document for document in loader.load_directory(corpus, manifest=manifest)}
+            self.assertEqual(annotations(manifest.last_changes.added), [sample1, sample2])
+            self.assertEqual(documents["sample1"].tokens[0].label, "Person")
+            
+            # Touching a file without changing it reuses its documents
+            os.utime(sample1.replace(".ann", ".txt"), ns=(1, 1))
+            changes = manifest.refresh(loader, corpus)
+            self.assertFalse(changes.has_changes)
+            self.assertEqual(annotations(changes.unchanged), [sample1, sample2])
+            # The new stats are recorded, so the touched file is not hashed again
+            with mock.patch.object(CorpusManifest, "_hash_file", side_effect=AssertionError("hashed")):
+                self.assertFalse(manifest.refresh(loader, corpus).has_changes)
+            
+            with open(sample1, "a", encoding="utf-8") as ann_file:
+                ann_file.write("\nT5\tPerson 13 16\twas\n")
+            os.remove(sample2)
+            changes = manifest.refresh(loader, corpus)
+            self.assertEqual((annotations(changes.changed), annotations(changes.deleted), annotations(changes.unchanged)),
+                             ([sample1], [sample2], []))
+            
+            documents = list(CorpusManifest(manifest.state_dir, tokenizer=WordTokenizer()).documents())
+            self.assertEqual([document.id for document in documents], ["sample1"])
+            self.assertEqual(len(documents[0].entities), 5)
+            
+            # A reload that fails keeps the last documents that loaded
+            with open(sample1, "a", encoding="utf-8") as ann_file:
+                ann_file.write("T6\tPerson x y\twas\n")
+            failures = []
+            changes = manifest.refresh(loader, corpus, on_error=lambda path, error: failures.append(path))
+            self.assertEqual((changes.failed, changes.changed, failures), ([sample1], [], [sample1]))
+            documents = list(CorpusManifest(manifest.state_dir, tokenizer=WordTokenizer()).documents())
+            self.assertEqual(len(documents[0].entities), 5)
+            self.assertEqual(manifest.refresh(loader, corpus, on_error=lambda path, error: None).failed, [sample1])
+
+    def test_manifest_corrupt_state(self):
+        with tempfile.TemporaryDirectory() as directory:
+            corpus = os.path.join(directory, "corpus")
+            shutil.copytree("tests/input/brat/joined", corpus)
+            manifest = CorpusManifest(os.path.join(directory, "state"))
+            loader = BratLoader()
+            sample1 = os.path.abspath(os.path.join(corpus, "sample1.ann"))
+            sample2 = os.path.abspath(os.path.join(corpus, "sample2.ann"))
+            manifest.refresh(loader, corpus)
+            
+            # A truncated record is skipped, and its file is loaded again by the next refresh
+            record_path = os.path.join(manifest.state_dir, "documents", manifest.files[sample1]["record"])
+            with open(record_path, "r+b") as record_file:
+                record_file.truncate(10)
+            self.assertEqual([document.id for document in CorpusManifest(manifest.state_dir).documents()], ["sample2"])
+            changes = manifest.refresh(loader, corpus)
+            self.assertEqual((changes.added, changes.unchanged), ([sample1], [sample2]))
+            self.assertEqual(sorted(document.id for document in manifest.documents()), ["sample1", "sample2"])
+            
+            # A corrupt manifest is treated as absent
+            with open(manifest.manifest_path, "w", encoding="utf-8") as manifest_file:
+                manifest_file.write('{"config": ')
+            self.assertEqual(list(CorpusManifest(manifest.state_dir).documents()), [])
+            self.assertEqual(sorted(manifest.refresh(loader, corpus).added), [sample1, sample2])
+
 class JSON_Loader(LoaderTestCase):
     def test_json_load_sample1(self):
         loader = JSONLoader()
@@ -91,10 +278,157 @@ class JSON_Loader(LoaderTestCase):
         loader = JSONLoader()
         document = loader.load_file("tests/input/json/sample2.json")
         self.helper_test_load_sample2(document, directory="tests/input/json", extension=".json")
+        
+    def test_json_relations_resolved(self):
+        loader = JSONLoader()
+        document = loader.load_file("tests/input/json/sample2.json")
+        for relation in document.relations:
+            self.assertIs(relation.arg_1, document.get_entity_by_id(relation.arg_1.entity_id))
+            self.assertIs(relation.arg_2, document.get_entity_by_id(relation.arg_2.entity_id))
 
-if __name__ == "__main__":
-    unittest.main()
+    def test_json_lines_streaming(self):
+        loader = JSONLoader()
+        documents = list(loader.iter_file("tests/input/jsonl/samples.jsonl", workers=2))
+        self.assertEqual([document.id for document in documents], ["sample1", "sample2"])
+        self.assertEqual(documents[1].path, "tests/input/jsonl/samples.jsonl")
+        self.assertEqual(len(documents[1].relations), 2)
+        self.assertEqual(len(loader.load_file("tests/input/jsonl/samples.jsonl")), 2)
 
+    def test_json_array_streaming(self):
+        records = [json.load(open(f"tests/input/json/sample{n}.json", encoding="utf-8")) for n in (1, 2)]
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, "samples.json")
+            with open(file_path, "w", encoding="utf-8") as json_file:
+                json.dump(records, json_file, indent=2)
+            
+            loader = JSONLoader()
+            documents = list(loader.iter_file(file_path, read_size=7))
+            self.assertEqual([document.id for document in documents], ["sample1", "sample2"])
+            self.assertEqual(len(documents[1].relations), 2)
+            self.assertEqual(len(list(loader.iter_file("tests/input/json/sample1.json", read_size=5))), 1)
+            # Array elements are parsed in the reading process
+            self.assertEqual([document.id for document in loader.iter_file(file_path, workers=2)],
+                             ["sample1", "sample2"])
 
+    def test_json_array_large_record(self):
+        reads = []
+        class CountingFile(io.StringIO):
+            def read(self, size=-1):
+                reads.append(size)
+                return super().read(size)
 
+        records = [{"text": "x" * 100000}, [1, 2]]
+        decoded = list(JSONLoader._iter_json_records(CountingFile(json.dumps(records)), 16))
+        self.assertEqual(decoded, records)
+        # The reads grow geometrically instead of re-decoding the record after every 16 characters
+        self.assertLess(len(reads), 30)
 
+class CoNLL_Loader(unittest.TestCase):
+    def test_load_documents(self):
+        documents = list(CoNLLLoader().iter_file("tests/input/conll/sample.conll"))
+        self.assertEqual([document.id for document in documents], ["sample-1", "sample-2"])
+        self.assertEqual(documents[0].text, "EU rejects German call to boycott British lamb .\nPeter Blackburn")
+        self.assertEqual(sorted((interval.data.text, interval.data.label) for interval in documents[0].entities),
+                         [("British", "MISC"), ("EU", "ORG"), ("German", "MISC"), ("Peter Blackburn", "PER")])
+        self.assertEqual(documents[0].tokens[-1].label, "I-PER")
+        self.assertEqual(documents[0].tokens[8].next_char, "\n")
+        # IOB1 and BIOES labels
+        self.assertEqual(sorted((interval.data.text, interval.data.label) for interval in documents[1].entities),
+                         [("BRUSSELS", "LOC"), ("Los Angeles", "LOC"), ("New York", "LOC")])
+
+    def test_split_sentences(self):
+        documents = list(CoNLLLoader(split_sentences=True).iter_file("tests/input/conll/sample.conll"))
+        self.assertEqual([document.text for document in documents],
+                         ["EU rejects German call to boycott British lamb .", "Peter Blackburn",
+                          "BRUSSELS 1996-08-22 New York Los Angeles"])
+
+    def test_split_documents(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "corpus.conll")
+            with open(path, "w", encoding="utf-8") as conll_file:
+                conll_file.write("-DOCSTART- doc1\n\nEU B-ORG\nrejects O\n\nPeter B-PER\n\nLondon B-LOC\n\n"
+                                 "-DOCSTART- doc2\n\nParis B-LOC\n")
+            documents = CoNLLLoader(ids_on_docstart=True, split_sentences=True).load_file(path)
+            self.assertEqual([(document.id, document.text) for document in documents],
+                             [("doc1-1", "EU rejects"), ("doc1-2", "Peter"), ("doc1-3", "London"), ("doc2-1", "Paris")])
+            
+            documents = CoNLLLoader(ids_on_docstart=True, max_tokens_per_document=2).load_file(path)
+            self.assertEqual([(document.id, document.text) for document in documents],
+                             [("doc1", "EU rejects"), ("doc1-2", "Peter\nLondon"), ("doc2", "Paris")])
+            self.assertEqual([entity.data.text for entity in documents[1].entities], ["Peter", "London"])
+            
+            # Without "-DOCSTART-" lines, the cap bounds the size of every document
+            with open(path, "w", encoding="utf-8") as conll_file:
+                conll_file.write("".join(f"Token{i} O\nEnd O\n\n" for i in range(10)))
+            documents = list(CoNLLLoader(max_tokens_per_document=5).iter_file(path))
+            self.assertEqual([len(document.tokens) for document in documents], [6, 6, 6, 2])
+            self.assertEqual(documents[-1].id, "corpus-4")
+
+    def test_tab_separated_docstart(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "corpus.txt")
+            with open(path, "w", encoding="utf-8") as conll_file:
+                conll_file.write("-DOCSTART-\n\nEU\tB-ORG\nrejects\tO\n\n-DOCSTART-\t\n\nPeter\tB-PER\nBlackburn\tI-PER\n")
+            # ".txt" files are only accepted when opted in
+            self.assertEqual(list(CoNLLLoader(separator="\t").list_files(directory)), [])
+            with self.assertRaises(ValueError):
+                CoNLLLoader(separator="\t").load_file(path)
+            documents = CoNLLLoader(separator="\t", extensions=(".conll", ".txt")).load_file(path)
+        self.assertEqual([document.text for document in documents], ["EU rejects", "Peter Blackburn"])
+        self.assertEqual([[(interval.data.text, interval.data.label) for interval in document.entities]
+                          for document in documents], [[("EU", "ORG")], [("Peter Blackburn", "PER")]])
+
+    def test_round_trip_with_offsets(self):
+        from parselt.exporters import CoNLLExporter
+        from parselt.tokenizers import WordTokenizer
+        documents = list(BratLoader().load_directory("tests/input/brat/joined"))
+        for document in documents:
+            document.tokenize(WordTokenizer(), use_bio_labeling=True)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "corpus.conll")
+            CoNLLExporter(include_offsets=True, include_ids=True).export(documents, path)
+            loaded = list(CoNLLLoader(offset_columns=(1, 2), ids_on_docstart=True).iter_file(path))
+        for document, expected in zip(loaded, documents):
+            self.assertEqual(document.id, expected.id)
+            self.assertEqual([(token.text, token.start, token.end, token.label) for token in document.tokens],
+                             [(token.text, token.start, token.end, token.label) for token in expected.tokens])
+            # Entities are rebuilt from whole tokens
+            self.assertEqual(sorted((entity.data.start, entity.data.label) for entity in document.entities),
+                             sorted((entity.data.start, entity.data.label) for entity in expected.entities))
+
+class DirectoryScanTest(unittest.TestCase):
+    def test_recursive_filtered_sharded_scan(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for split in ("dev", "train", "train/extra"):
+                shutil.copytree("tests/input/brat/joined", os.path.join(directory, split))
+            loader = BratLoader()
+            relative = lambda paths: [os.path.relpath(path, directory).replace(os.sep, "/") for path in paths]
+            
+            self.assertEqual(list(loader.list_files(directory)), [])
+            self.assertEqual(relative(loader.list_files(directory, recursive=True)),
+                             ["dev/sample1.ann", "dev/sample2.ann", "train/sample1.ann", "train/sample2.ann",
+                              "train/extra/sample1.ann", "train/extra/sample2.ann"])
+            self.assertEqual(relative(loader.list_files(directory, recursive=True, pattern="train/*1.ann")),
+                             ["train/sample1.ann", "train/extra/sample1.ann"])
+            self.assertEqual(len(list(loader.load_directory(os.path.join(directory, "dev")))), 2)
+            
+            everything = relative(loader.list_files(directory, recursive=True, extensions=()))
+            self.assertEqual(len(everything), 12)
+            shards = [relative(loader.list_files(directory, recursive=True, extensions=(), shard_index=i, num_shards=3))
+                      for i in range(3)]
+            self.assertEqual(sorted(sum(shards, [])), sorted(everything))
+            documents = [list(loader.load_directory(directory, recursive=True, shard_index=i, num_shards=3))
+                         for i in range(3)]
+            self.assertEqual(sum(len(shard) for shard in documents), 6)
+            # Documents of subdirectories get IDs relative to the scanned directory
+            self.assertEqual(sorted(document.id for shard in documents for document in shard),
+                             ["dev/sample1", "dev/sample2", "train/extra/sample1", "train/extra/sample2",
+                              "train/sample1", "train/sample2"])
+            self.assertEqual([document.id for document in loader.load_directory(os.path.join(directory, "train"),
+                                                                                recursive=True, lazy=True)],
+                             ["sample1", "sample2", "extra/sample1", "extra/sample2"])
+            with self.assertRaises(ValueError):
+                list(loader.list_files(directory, shard_index=3, num_shards=3))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+import numpy as np
+from parselt import Document, Entity, Relation
+from parselt.core.relation_graph import candidate_pairs
+from parselt.tokenizers import WordTokenizer
+from intervaltree import Interval, IntervalTree
+
+class RelationGraphTest(unittest.TestCase):
+    def setUp(self):
+        text = "Alice works at Acme in Paris while Bob works at Initech in Berlin"
+        spans = [("Alice", "Person"), ("Acme", "Organization"), ("Paris", "Location"),
+                 ("Bob", "Person"), ("Initech", "Organization"), ("Berlin", "Location")]
+        self.entities = []
+        for entity_id, (entity_text, label) in enumerate(spans, start=1):
+            start = text.index(entity_text)
+            self.entities.append(Entity(entity_text, start, start + len(entity_text), label, entity_id))
+        e = {entity.text: entity for entity in self.entities}
+        relations = [Relation(1, "WorksAt", e["Alice"], e["Acme"]), Relation(2, "LocatedIn", e["Acme"], e["Paris"]),
+                     Relation(3, "WorksAt", e["Bob"], e["Initech"]), Relation(4, "LocatedIn", e["Initech"], e["Berlin"])]
+        self.document = Document("doc", "", text, IntervalTree(Interval(entity.start, entity.end, entity)
+                                                                for entity in self.entities), relations)
+
+    def test_adjacency(self):
+        graph = self.document.relation_graph
+        self.assertEqual([relation.id for relation in graph.outgoing(2)], [2])
+        self.assertEqual([relation.id for relation in graph.relations_of(2)], [2, 1])
+        self.assertEqual([entity.text for entity in graph.neighbors(2, direction="both")], ["Paris", "Alice"])
+        self.assertEqual([relation.id for relation in graph.with_label("WorksAt")], [1, 3])
+        self.assertEqual(graph.between(1, 2, label="LocatedIn"), [])
+        self.assertIs(self.document.relation_graph, graph)
+        
+        self.document.relations.append(Relation(5, "Knows", self.entities[0], self.entities[3]))
+        self.assertEqual(self.document.relation_graph.labels(), {"WorksAt", "LocatedIn", "Knows"})
+
+    def test_paths(self):
+        graph = self.document.relation_graph
+        self.assertEqual([[relation.id for relation in path] for path in graph.paths(1, 3)], [[1, 2]])
+        self.assertEqual(list(graph.paths(3, 1)), [])
+        self.assertEqual([[relation.id for relation in path] for path in graph.paths(3, 1, directed=False)], [[2, 1]])
+        self.assertEqual(graph.reachable(1), {2: 1, 3: 2})
+        self.assertEqual(graph.reachable(1, labels=["WorksAt"]), {2: 1})
+
+    def test_candidate_pairs(self):
+        def brute_force(max_char_distance=None, label_pairs=None):
+            pairs = set()
+            for a in self.entities:
+                for b in self.entities:
+                    distance = max(0, max(a.start, b.start) - min(a.end, b.end))
+                    if a is b or (max_char_distance is not None and distance > max_char_distance):
+                        continue
+                    if label_pairs is None or (a.label, b.label) in label_pairs:
+                        pairs.add((a.entity_id, b.entity_id))
+            return pairs
+
+        for max_char_distance in (None, 0, 10, 20):
+            for label_pairs in (None, {("Person", "Organization"), ("Organization", "Location")}):
+                pairs = self.document.candidate_pairs(max_char_distance=max_char_distance, label_pairs=label_pairs)
+                self.assertEqual({(a.entity_id, b.entity_id) for a, b in pairs}, brute_force(max_char_distance, label_pairs))
+
+        undirected = self.document.candidate_pairs(directed=False)
+        self.assertEqual(len(undirected), 15)
+        self.assertTrue(all(a.start < b.start for a, b in undirected))
+
+        self.document.tokenize(WordTokenizer())
+        pairs = self.document.candidate_pairs(max_token_distance=1, directed=False)
+        self.assertEqual({(a.text, b.text) for a, b in pairs},
+                         {("Acme", "Paris"), ("Paris", "Bob"), ("Initech", "Berlin")})
+        with self.assertRaises(ValueError):
+            candidate_pairs(self.entities, max_token_distance=1)
+        self.assertEqual(candidate_pairs(self.entities[:1]).shape, (0, 2))
+
+if __name__ == "__main__":
+    unittest.main()
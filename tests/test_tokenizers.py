@@ -1,7 +1,11 @@
+import os
+import pickle
+import tempfile
 import unittest
 from parselt.loaders import BratLoader, JSONLoader
-from parselt import Document, Entity, Relation
-from parselt.tokenizers import WordTokenizer
+from parselt import Document, Entity, OffsetToken, Relation, TokenArray
+from parselt.tokenizers import BPETokenizer, CachedTokenizer, WordPieceTokenizer, WordTokenizer, tokenize_documents
+from parselt.utils.instrumentation import recording
 from intervaltree import Interval, IntervalTree
 
 class WordTokenizerTest(unittest.TestCase):
@@ -26,4 +30,203 @@ class WordTokenizerTest(unittest.TestCase):
         self.assertEqual(self.document.tokens[0].text, "Barack")
         self.assertEqual(self.document.tokens[0].start, 0)
         self.assertEqual(self.document.tokens[0].end, 6)
-        self.assertEqual(self.document.tokens[0].label, "Person")
\ No newline at end of file
+        self.assertEqual(self.document.tokens[0].label, "Person")
+        
+    def test_tokenize_bio(self):
+        self.document.tokenize(self.tokenizer, use_bio_labeling=True)
+        labels = [token.label for token in self.document.tokens]
+        self.assertEqual(labels[:3], ["B-Person", "I-Person", "O"])
+        self.assertEqual(labels[-2:], ["B-Location", "I-Location"])
+
+    def test_tokenize_overlap_policy(self):
+        document = Document(
+            id="overlap",
+            path="",
+            text="New York City",
+            entities=IntervalTree(
+                [Interval(begin=0, end=13, data=Entity("New York City", 0, 13, label="City", entity_id=1)),
+                 Interval(begin=0, end=8, data=Entity("New York", 0, 8, label="State", entity_id=2))]),
+            relations=[]
+        )
+        document.tokenize(self.tokenizer, overlap_policy="first")
+        self.assertEqual([token.label for token in document.tokens], ["City", "City", "City"])
+        document.tokenize(self.tokenizer, overlap_policy="innermost")
+        self.assertEqual([token.label for token in document.tokens], ["State", "State", "City"])
+        with self.assertRaises(ValueError):
+            document.tokenize(self.tokenizer, overlap_policy="random")
+
+    def test_tokenize_columnar(self):
+        self.document.tokenize(self.tokenizer, use_bio_labeling=True)
+        expected = [(token.text, token.start, token.end, token.next_char, token.label) for token in self.document.tokens]
+        self.document.tokenize(self.tokenizer, use_bio_labeling=True, columnar=True)
+        self.assertIsInstance(self.document.tokens, TokenArray)
+        self.assertEqual(len(self.document.tokens), 15)
+        self.assertEqual([(token.text, token.start, token.end, token.next_char, token.label) for token in self.document],
+                         expected)
+        self.assertEqual(self.document[0].label, "B-Person")
+        self.assertEqual(self.document[-1].text, "States")
+        self.assertEqual(self.document.tokens.labels[self.document.tokens.label_ids[1]], "I-Person")
+
+    def test_tokenize_batch(self):
+        texts = [self.document.text, "Elon Musk founded SpaceX in 2002.", ""]
+        serial = self.tokenizer.tokenize_batch(texts)
+        parallel = self.tokenizer.tokenize_batch(texts, workers=2, chunksize=1)
+        self.assertEqual([len(tokens) for tokens in parallel], [15, 6, 0])
+        self.assertEqual(serial, parallel)
+
+    def test_tokenize_documents(self):
+        documents = list(BratLoader().load_directory("tests/input/brat/joined"))
+        expected = {}
+        for document in documents:
+            document.tokenize(self.tokenizer, use_bio_labeling=True)
+            expected[document.id] = [(token.text, token.label) for token in document.tokens]
+        
+        tokenized = tokenize_documents(documents, self.tokenizer, use_bio_labeling=True, workers=2)
+        self.assertEqual([document.id for document in tokenized], [document.id for document in documents])
+        for document in tokenized:
+            self.assertEqual([(token.text, token.label) for token in document.tokens], expected[document.id])
+
+    def test_preprocess_offsets(self):
+        tokenizer = WordTokenizer(lower=True, remove_punctuation=True, normalize_whitespace=True)
+        text = "  Hello,   World!  (again)"
+        preprocessed_text, offsets = tokenizer.preprocess_with_offsets(text)
+        self.assertEqual(preprocessed_text, "hello world again")
+        self.assertEqual(len(offsets), len(preprocessed_text))
+        self.assertEqual(text[offsets[6]], "W")
+        
+        tokens = tokenizer(text)
+        self.assertEqual([token.text for token in tokens], ["hello", "world", "again"])
+        self.assertEqual([text[token.start:token.end] for token in tokens], ["Hello", "World", "again"])
+
+    def test_tokenize_preprocessed_labels(self):
+        self.document.text = "  " + self.document.text.replace(" ", "   ")
+        for interval in self.document.entities:
+            entity = interval.data
+            entity.start = self.document.text.index(entity.text.replace(" ", "   "))
+            entity.end = entity.start + len(entity.text.replace(" ", "   "))
+        self.document.tokenize(WordTokenizer(lower=True, normalize_whitespace=True), use_bio_labeling=True)
+        labels = [token.label for token in self.document.tokens]
+        self.assertEqual(labels[:3], ["B-Person", "I-Person", "O"])
+        self.assertEqual(labels[-2:], ["B-Location", "I-Location"])
+        self.assertEqual(self.document.tokens[0].text, "barack")
+
+    def test_offset_tokens(self):
+        text = self.document.text
+        tokens = WordTokenizer(offset_tokens=True)(text)
+        expected = WordTokenizer()(text)
+        self.assertTrue(all(isinstance(token, OffsetToken) for token in tokens))
+        self.assertEqual(tokens, expected)
+        self.assertEqual([token.next_char for token in tokens], [token.next_char for token in expected])
+        self.assertEqual({token: None for token in expected}.keys(), {token: None for token in tokens}.keys())
+        
+        self.document.tokenize(WordTokenizer(offset_tokens=True), use_bio_labeling=True)
+        copy = pickle.loads(pickle.dumps(self.document.tokens))
+        self.assertEqual([(token.text, token.label) for token in copy],
+                         [(token.text, token.label) for token in self.document.tokens])
+        self.assertIs(copy[0].source, copy[-1].source)
+        
+        # Offset tokens are the same tokens, and preprocessing would change their text
+        tokens = WordTokenizer(offset_tokens=True)("Hello,  World")
+        self.assertEqual(tokens, WordTokenizer()("Hello,  World"))
+        self.assertEqual(tokens, WordTokenizer(offset_tokens=True).tokenize("Hello,  World"))
+        tokens[0].text = "hello"
+        self.assertEqual(tokens[0].text, "hello")
+        with self.assertRaises(ValueError):
+            WordTokenizer(lower=True, offset_tokens=True)
+
+class CachedTokenizerTest(unittest.TestCase):
+    def assert_same_tokens(self, tokens, expected):
+        self.assertEqual([(token.text, token.start, token.end, token.next_char) for token in tokens],
+                         [(token.text, token.start, token.end, token.next_char) for token in expected])
+
+    def test_cache_hits(self):
+        text = "The quick brown fox, (and so on) jumped."
+        with tempfile.TemporaryDirectory() as directory:
+            for tokenizer in (WordTokenizer(), WordTokenizer(lower=True, remove_punctuation=True)):
+                cached = CachedTokenizer(tokenizer, cache_dir=directory, max_entries=1)
+                with recording() as sink:
+                    first = cached(text)
+                    second = cached(text)
+                    array = cached.tokenize_array(text)
+                    cached("Another text")
+                    # Evicted from memory, read back from disk by a fresh tokenizer
+                    third = CachedTokenizer(tokenizer, cache_dir=directory)(text)
+                self.assertEqual(sink.counts["cache_misses"], 2)
+                self.assertEqual(sink.counts["cache_hits"], 3)
+                self.assert_same_tokens(first, tokenizer(text))
+                self.assert_same_tokens(second, first)
+                self.assert_same_tokens(third, first)
+                self.assertEqual(array.starts.tolist(), tokenizer.tokenize_array(text).starts.tolist())
+                self.assertIsNot(second[0], first[0])
+            self.assertEqual(sum(len(files) for _, _, files in os.walk(directory)), 4)
+
+    def test_array_entries_and_config(self):
+        cached = CachedTokenizer(WordTokenizer(lower=True))
+        self.assertEqual(cached.config(), WordTokenizer(lower=True).config())
+        self.assertNotEqual(cached.key("text"), CachedTokenizer(WordTokenizer()).key("text"))
+        array = cached.tokenize_array("Hello World")
+        self.assertEqual([token.text for token in array], ["Hello", "World"])
+        # An entry cached from an array does not know the lowercased token texts yet
+        self.assertEqual([token.text for token in cached("Hello World")], ["hello", "world"])
+
+    def test_corrupt_entries(self):
+        text = "The quick brown fox."
+        tokenizer = WordTokenizer()
+        with tempfile.TemporaryDirectory() as directory:
+            cached = CachedTokenizer(tokenizer, cache_dir=directory)
+            cached(text)
+            entry_path = cached._entry_path(cached.key(text))
+            with open(entry_path, "rb") as entry_file:
+                content = entry_file.read()
+            for corrupt in (content[:5], content[:-3], content[:12] + b"}" + content[13:]):
+                with open(entry_path, "wb") as entry_file:
+                    entry_file.write(corrupt)
+                with recording() as sink:
+                    tokens = CachedTokenizer(tokenizer, cache_dir=directory)(text)
+                self.assertEqual(sink.counts["cache_misses"], 1)
+                self.assert_same_tokens(tokens, tokenizer(text))
+                # The corrupt entry was overwritten
+                with open(entry_path, "rb") as entry_file:
+                    self.assertEqual(entry_file.read(), content)
+            self.assertEqual(os.listdir(os.path.dirname(entry_path)), [os.path.basename(entry_path)])
+
+class SubwordTokenizerTest(unittest.TestCase):
+    def test_wordpiece(self):
+        tokenizer = WordPieceTokenizer("tests/input/subword/vocab.txt", lower=True)
+        tokens = tokenizer("Unaffable, xyz")
+        self.assertEqual([(token.text, token.start, token.end) for token in tokens],
+                         [("un", 0, 2), ("##aff", 2, 5), ("##able", 5, 9), (",", 9, 10), ("[UNK]", 11, 14)])
+        self.assertEqual([token.next_char for token in tokens], ["", "", "", " ", ""])
+        
+        document = Document("doc", "", "Barack Obama was born in  Hawaii.",
+                            [Interval(0, 12, Entity("Barack Obama", 0, 12, "Person", 1)),
+                             Interval(26, 32, Entity("Hawaii", 26, 32, "Location", 2))], [])
+        document.tokenize(tokenizer, use_bio_labeling=True)
+        self.assertEqual([(token.text, token.start, token.label) for token in document.tokens[-4:]],
+                         [("ha", 26, "B-Location"), ("##wai", 28, "I-Location"), ("##i", 31, "I-Location"), (".", 32, "O")])
+        self.assertEqual(document.tokens[1].label, "I-Person")
+        self.assertIn("tests/input/subword/vocab.txt", tokenizer.config()["vocab"])
+        
+    def test_bpe(self):
+        tokenizer = BPETokenizer("tests/input/subword/merges.txt")
+        tokens = tokenizer("lower newest")
+        self.assertEqual([(token.text, token.start, token.end) for token in tokens],
+                         [("lower", 0, 5), ("new", 6, 9), ("est", 9, 12)])
+        batch = tokenizer.tokenize_batch(["newest lower", "lowest"])
+        self.assertEqual([[token.text for token in tokens] for tokens in batch], [["new", "est", "lower"], ["low", "est"]])
+        self.assertEqual(set(tokenizer._segmentations), {"lower", "newest", "lowest"})
+        
+        restricted = BPETokenizer("tests/input/subword/merges.txt", vocab_path="tests/input/subword/vocab.txt")
+        self.assertEqual([token.text for token in restricted("newest")], ["<unk>", "<unk>"])
+        self.assertNotEqual(restricted.config(), tokenizer.config())
+        
+    def test_batch_over_workers(self):
+        tokenizer = WordPieceTokenizer("tests/input/subword/vocab.txt", lower=True)
+        texts = ["Unaffable, xyz", "Barack Obama was born in  Hawaii.", "unaffable"] * 4
+        serial = tokenizer.tokenize_batch(texts)
+        parallel = tokenizer.tokenize_batch(texts, workers=2, chunksize=2)
+        self.assertEqual([[(token.text, token.start, token.end, token.next_char) for token in tokens] for tokens in parallel],
+                         [[(token.text, token.start, token.end, token.next_char) for token in tokens] for tokens in serial])
+        arrays = tokenizer.tokenize_batch(texts, workers=2, columnar=True)
+        self.assertEqual([array.starts.tolist() for array in arrays],
+                         [[token.start for token in tokens] for tokens in serial])